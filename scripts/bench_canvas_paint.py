@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tempo de quadro do DrawingCanvas ao desenhar sobre capturas grandes.
+
+Simula um mouse de ``--input-hz`` eventos/s numa tela de ``--display-hz``:
+
+- ``legacy``: pinta a cada evento e repinta o widget inteiro (fundo e
+  anotações completos), como antes;
+- ``per-event``: pinta a cada evento, mas repinta só o retângulo sujo;
+- ``coalesced``: junta os pontos e pinta uma vez por quadro da tela (o que o
+  timer do canvas faz), repintando só o retângulo sujo.
+
+Cada pintura é seguida de ``repaint`` síncrono; o tempo dos dois é o tempo de
+quadro. Também mostra o custo de CPU por segundo de traço.
+
+Cada caminho roda num subprocesso separado.
+
+Uso:
+    python scripts/bench_canvas_paint.py [--size 3840x2160] [--events 200] [--input-hz 1000] [--display-hz 144]
+
+Sem display real, rode com QT_QPA_PLATFORM=offscreen (padrão deste script).
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+PATHS = ("legacy", "per-event", "coalesced")
+
+
+def _parse_size(value):
+    w, h = (int(v) for v in value.lower().split("x"))
+    return w, h
+
+
+def _worker(path, size, events, input_hz, display_hz):
+    from PySide6.QtCore import QEvent, QPointF, Qt
+    from PySide6.QtGui import QMouseEvent, QPainter, QPixmap
+    from PySide6.QtWidgets import QApplication
+
+    from linsnipper.ui.drawing_canvas import DrawingCanvas
+
+    class LegacyCanvas(DrawingCanvas):
+        """Caminho antigo: repinta o widget inteiro com as duas camadas."""
+
+        def paintEvent(self, event):
+            painter = QPainter(self)
+            painter.drawPixmap(0, 0, self.base_pixmap)
+            painter.drawPixmap(0, 0, self.annotation_pixmap)
+            painter.end()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    width, height = size
+    base = QPixmap(width, height)
+    base.fill(Qt.darkGray)
+    canvas = (LegacyCanvas if path == "legacy" else DrawingCanvas)(pixmap=base)
+    canvas.resize(width, height)
+    canvas.show()
+    app.processEvents()  # janela exposta; sem isso repaint() não pinta nada
+
+    # Guarda o retângulo que o canvas pediu para repintar (None = widget inteiro)
+    pending = []
+    if path == "legacy":
+        canvas.update = lambda *args: pending.append(None)
+    else:
+        canvas.update = lambda *args: pending.append(args[0] if args else None)
+
+    def _frame():
+        start = time.perf_counter()
+        canvas._flush_stroke()
+        if pending:
+            rect = pending.pop()
+            if rect is None:
+                canvas.repaint()
+            else:
+                canvas.repaint(rect)
+            pending.clear()
+        return (time.perf_counter() - start) * 1000
+
+    def _mouse(kind, x, y):
+        pos = QPointF(x, y)
+        button = Qt.NoButton if kind == QEvent.MouseMove else Qt.LeftButton
+        return QMouseEvent(kind, pos, pos, button, Qt.LeftButton, Qt.NoModifier)
+
+    # Espiral pelo centro da captura, um ponto a cada ~4 px (mouse de alta taxa)
+    cx, cy = width / 2, height / 2
+    points = [
+        (cx + math.cos(i / 8) * (50 + i), cy + math.sin(i / 8) * (50 + i)) for i in range(events)
+    ]
+    canvas.mousePressEvent(_mouse(QEvent.MouseButtonPress, *points[0]))
+    pending.clear()
+
+    events_per_frame = 1 if path != "coalesced" else max(1, round(input_hz / display_hz))
+    timings = []
+    total_ms = 0.0
+    for i, (x, y) in enumerate(points[1:], start=1):
+        start = time.perf_counter()
+        canvas.mouseMoveEvent(_mouse(QEvent.MouseMove, x, y))
+        total_ms += (time.perf_counter() - start) * 1000
+        if i % events_per_frame == 0:
+            frame_ms = _frame()
+            timings.append(frame_ms)
+            total_ms += frame_ms
+    total_ms += _frame()
+
+    timings.sort()
+    print(json.dumps({
+        "path": path,
+        "frames": len(timings),
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[max(int(len(timings) * 0.95) - 1, 0)],
+        "max_ms": timings[-1],
+        "within_budget": sum(t <= 1000 / display_hz for t in timings) / len(timings),
+        # ms de CPU gastos por segundo de traço (1000 = um núcleo inteiro)
+        "cpu_ms_per_s": total_ms * input_hz / (len(points) - 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=_parse_size, default=(3840, 2160))
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--input-hz", type=float, default=1000)
+    parser.add_argument("--display-hz", type=float, default=144)
+    parser.add_argument("--worker", choices=PATHS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker, args.size, args.events, args.input_hz, args.display_hz)
+        return
+
+    size = "x".join(str(v) for v in args.size)
+    budget = 1000 / args.display_hz
+    print(
+        f"Captura {size}, {args.events} eventos a {args.input_hz:g} Hz, "
+        f"tela {args.display_hz:g} Hz (quadro = {budget:.2f} ms)"
+    )
+    print(f"{'caminho':<10} {'quadros':>7} {'mediana':>9} {'p95':>9} {'máx':>9} {'no prazo':>8} {'CPU/s':>9}")
+    for path in PATHS:
+        out = subprocess.run(
+            [
+                sys.executable, __file__, "--worker", path, "--size", size,
+                "--events", str(args.events),
+                "--input-hz", str(args.input_hz), "--display-hz", str(args.display_hz),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(
+            f"{path:<10} {r['frames']:>7d} {r['median_ms']:>6.2f} ms {r['p95_ms']:>6.2f} ms "
+            f"{r['max_ms']:>6.2f} ms {r['within_budget']:>8.0%} {r['cpu_ms_per_s']:>6.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
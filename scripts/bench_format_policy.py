@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark: formato automático de saída (linsnipper.core.format_policy) num
+corpus sintético de capturas de interface e de conteúdo fotográfico.
+
+Para cada imagem, codifica em PNG, JPEG e WebP e mostra tamanho e tempo de
+cada um, a classe esperada e a escolha do modo "auto". O resumo final conta
+quantas imagens foram classificadas corretamente.
+
+Uso:
+    python scripts/bench_format_policy.py [--size WxH]
+
+Sem display real, rode com QT_QPA_PLATFORM=offscreen.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _corpus(width, height):
+    import numpy as np
+    from PySide6.QtCore import QRect, Qt
+    from PySide6.QtGui import QColor, QFont, QImage, QPainter
+
+    rng = np.random.default_rng(2024)
+
+    def _blank(color):
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(QColor(color))
+        return image
+
+    def _from_array(rgb):
+        rgb = rgb.clip(0, 255).astype(np.uint8)
+        bgra = np.empty((height, width, 4), dtype=np.uint8)
+        bgra[..., 0], bgra[..., 1], bgra[..., 2], bgra[..., 3] = rgb[..., 2], rgb[..., 1], rgb[..., 0], 255
+        return QImage(bgra.tobytes(), width, height, QImage.Format_RGB32).copy()
+
+    def editor():
+        image = _blank("#1e1e1e")
+        painter = QPainter(image)
+        painter.setFont(QFont("Monospace", 10))
+        colors = [QColor(c) for c in ("#d4d4d4", "#569cd6", "#ce9178", "#6a9955", "#c586c0")]
+        for line in range(height // 16):
+            painter.setPen(colors[line % len(colors)])
+            painter.drawText(60, 14 + line * 16, "    def função_%d(self, x):  # comentário %d" % (line, line))
+        painter.end()
+        return image
+
+    def dashboard():
+        image = _blank("#f3f4f6")
+        painter = QPainter(image)
+        for i in range(12):
+            rect = QRect(20 + (i % 4) * (width // 4), 20 + (i // 4) * (height // 3), width // 4 - 40, height // 3 - 40)
+            painter.fillRect(rect, Qt.white)
+            painter.fillRect(rect.adjusted(10, rect.height() // 2, -rect.width() // 2, -10), QColor("#60a5fa"))
+            painter.setPen(Qt.black)
+            painter.drawText(rect.adjusted(10, 10, 0, 0), Qt.AlignLeft, f"Métrica {i}: {rng.integers(0, 9999)}")
+        painter.end()
+        return image
+
+    def gradient_ui():
+        # Interface com degradê suave (barra de título, fundo) — ainda "interface"
+        image = dashboard()
+        painter = QPainter(image)
+        for x in range(width):
+            painter.setPen(QColor(40, 60, 80 + x * 100 // width))
+            painter.drawLine(x, 0, x, 40)
+        painter.end()
+        return image
+
+    def landscape():
+        yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+        sky = np.stack([90 + yy / height * 80, 140 + yy / height * 60, 230 - yy / height * 40], axis=-1)
+        hills = (np.sin(xx / 90) * 40 + height * 0.6) < yy
+        ground = np.stack([60 + xx % 37, 110 + (xx * yy) % 23, 40 + yy % 19], axis=-1)
+        rgb = np.where(hills[..., None], ground, sky) + rng.normal(0, 6, (height, width, 3))
+        return _from_array(rgb)
+
+    def noise_photo():
+        base = rng.normal(128, 50, (height // 8 + 1, width // 8 + 1, 3))
+        rgb = np.kron(base, np.ones((8, 8, 1)))[:height, :width] + rng.normal(0, 10, (height, width, 3))
+        return _from_array(rgb)
+
+    def video_frame():
+        # Foto ocupando a maior parte da tela, com moldura de player
+        image = landscape()
+        painter = QPainter(image)
+        painter.fillRect(QRect(0, height - 48, width, 48), QColor("#000000"))
+        painter.fillRect(QRect(16, height - 28, width // 3, 6), QColor("#ff0000"))
+        painter.end()
+        return image
+
+    return [
+        ("editor de código", "ui", editor()),
+        ("dashboard", "ui", dashboard()),
+        ("interface c/ degradê", "ui", gradient_ui()),
+        ("paisagem", "photo", landscape()),
+        ("ruído fotográfico", "photo", noise_photo()),
+        ("quadro de vídeo", "photo", video_frame()),
+    ]
+
+
+def _encode(image, fmt, quality):
+    from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+    from PySide6.QtGui import QImageWriter
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    writer = QImageWriter(buffer, fmt.encode("ascii"))
+    writer.setQuality(quality)
+    start = time.perf_counter()
+    writer.write(image)
+    return time.perf_counter() - start, data.size()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", default="1920x1080")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    from PySide6.QtGui import QGuiApplication
+
+    from linsnipper.core.format_policy import JPEG_QUALITY, WEBP_QUALITY, analyze, choose_format
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # noqa: F841
+
+    formats = [("png", -1), ("jpeg", JPEG_QUALITY), ("webp", WEBP_QUALITY)]
+    header = " ".join(f"{fmt:>16}" for fmt, _ in formats)
+    print(f"{'imagem':22} {'cores':>6} {'entropia':>8} {header}   esperado  auto")
+
+    hits = 0
+    corpus = _corpus(width, height)
+    for name, expected, image in corpus:
+        start = time.perf_counter()
+        choice = choose_format(image, "auto")  # inclui a análise da amostra
+        decide_ms = (time.perf_counter() - start) * 1000
+        stats = analyze(image)
+        cells = []
+        for fmt, quality in formats:
+            seconds, size = _encode(image, fmt, quality)
+            cells.append(f"{size / 1024:7.0f}K {seconds * 1000:5.0f}ms")
+        predicted = "ui" if choice.format == "png" else "photo"
+        hits += predicted == expected
+        print(
+            f"{name:22} {stats.colors:6d} {stats.entropy:8.2f} {' '.join(f'{c:>16}' for c in cells)}"
+            f"   {expected:8}  {choice.format} ({decide_ms:.1f} ms)"
+        )
+
+    print(f"\nClassificação correta: {hits}/{len(corpus)}")
+
+
+if __name__ == "__main__":
+    main()
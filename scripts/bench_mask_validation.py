@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: aplicação e validação de máscara livre (modo FREEFORM) em quadros
+grandes.
+
+Compara a validação vetorizada (NumPy sobre o buffer do QImage) com o
+caminho só-Qt usado quando o NumPy não está instalado. O laço antigo em Python
+(``pixelColor`` por pixel) é medido apenas numa amostra de linhas e
+extrapolado, pois levaria minutos num quadro 8K.
+
+Uso:
+    python scripts/bench_mask_validation.py [--size WxH] [--runs N]
+
+Sem display real, rode com QT_QPA_PLATFORM=offscreen.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _median_ms(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _legacy_rows_ms(image, mask_path, rows):
+    """Laço por pixel original, limitado a ``rows`` linhas."""
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QImage, QPainter
+
+    mask_image = QImage(image.size(), QImage.Format_RGBA8888)
+    mask_image.fill(0)
+    painter = QPainter(mask_image)
+    painter.fillPath(mask_path, Qt.white)
+    painter.end()
+
+    start = time.perf_counter()
+    for y in range(rows):
+        for x in range(image.width()):
+            if mask_image.pixelColor(x, y).alpha() == 0 and image.pixelColor(x, y).alpha() != 0:
+                break
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", default="7680x4320")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--legacy-rows", type=int, default=8)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    from PySide6.QtCore import QRectF, Qt
+    from PySide6.QtGui import QGuiApplication, QImage, QPainterPath
+
+    from linsnipper.core import masking
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # noqa: F841
+
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(Qt.darkCyan)
+    path = QPainterPath()
+    path.addEllipse(QRectF(0, 0, width, height))
+
+    masked = masking.apply_mask(image, path)
+    print(f"Quadro {width}x{height} ({width * height / 1e6:.1f} Mpx), {args.runs} execuções")
+    print(f"  apply_mask:             {_median_ms(lambda: masking.apply_mask(image, path), args.runs):9.1f} ms")
+
+    if masking.np is not None:
+        ms = _median_ms(lambda: masking.validate_masked_image(masked, path), args.runs)
+        print(f"  validação (NumPy):      {ms:9.1f} ms")
+    else:
+        print("  validação (NumPy):      indisponível")
+
+    numpy_module, masking.np = masking.np, None
+    try:
+        ms = _median_ms(lambda: masking.validate_masked_image(masked, path), args.runs)
+    finally:
+        masking.np = numpy_module
+    print(f"  validação (só Qt):      {ms:9.1f} ms")
+
+    rows = max(1, min(args.legacy_rows, height))
+    per_row = _legacy_rows_ms(masked, path, rows) / rows
+    print(f"  laço por pixel (estim.): {per_row * height / 1000:8.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: codificador PNG paralelo (linsnipper.core.png_encoder) vs.
+``QPixmap.save`` em uma captura sintética de desktop triplo.
+
+A imagem mistura janelas chapadas, texto e uma área "fotográfica" (gradiente
+com ruído), como uma captura real. Uma segunda rodada usa só a parte de
+interface (sem a foto) para medir o PNG indexado (``palette=True`` em
+``encode_image``, nos dois codificadores). Cada
+arquivo gerado é decodificado de volta e comparado com o original.
+
+Uso:
+    python scripts/bench_png_encoder.py [--size WxH] [--runs N] [--levels 1,6,9]
+
+Sem display real, rode com QT_QPA_PLATFORM=offscreen.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _synthetic_desktop(width, height, photo=True):
+    import numpy as np
+    from PySide6.QtCore import QRect, Qt
+    from PySide6.QtGui import QColor, QFont, QImage, QPainter
+
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor("#2b2f3a"))
+    rng = np.random.default_rng(42)
+
+    painter = QPainter(image)
+    painter.setFont(QFont("Sans", 11))
+    # Janelas de até 900x600, sem passar do quadro pedido
+    win_w, win_h = min(900, width), min(600, height)
+    for i in range(24):
+        x, y = int(rng.integers(0, max(width - win_w, 1))), int(rng.integers(0, max(height - win_h, 1)))
+        rect = QRect(x, y, int(rng.integers(win_w * 5 // 9, win_w)), int(rng.integers(win_h // 2, win_h)))
+        painter.fillRect(rect, QColor("#f5f5f5"))
+        painter.fillRect(QRect(rect.x(), rect.y(), rect.width(), 32), QColor("#dfe3ea"))
+        painter.setPen(Qt.black)
+        for line in range(rect.height() // 20 - 2):
+            painter.drawText(rect.x() + 12, rect.y() + 56 + line * 20, f"Janela {i} · linha {line} — lorem ipsum")
+    painter.end()
+
+    if not photo:
+        return image
+
+    # Área "fotográfica": gradiente suave + ruído (~1/6 da largura)
+    photo_w = width // 6
+    yy, xx = np.mgrid[0:height, 0:photo_w]
+    photo = np.stack(
+        [(xx * 255 // photo_w), (yy * 255 // height), ((xx + yy) * 127 // (photo_w + height))], axis=-1
+    ).astype(np.int16)
+    photo += rng.integers(-12, 13, photo.shape, dtype=np.int16)
+    photo = photo.clip(0, 255).astype(np.uint8)
+
+    buf = np.frombuffer(image.bits(), dtype=np.uint8).reshape(height, image.bytesPerLine() // 4, 4)
+    x0 = width - photo_w
+    buf[:, x0:width, 2] = photo[..., 0]  # BGRA na memória (little endian)
+    buf[:, x0:width, 1] = photo[..., 1]
+    buf[:, x0:width, 0] = photo[..., 2]
+    return image
+
+
+def _median_s(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", default="11520x2160")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--levels", default="1,6,9")
+    parser.add_argument("--filters", default="up,paeth,adaptive")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    from PySide6.QtGui import QGuiApplication
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # noqa: F841
+    print(f"{os.cpu_count()} núcleos, mediana de {args.runs} execuções")
+    for label, photo in (("desktop com foto", True), ("só interface", False)):
+        image = _synthetic_desktop(width, height, photo=photo)
+        print(f"\n{label}, {width}x{height}")
+        print(f"{'codificador':30} {'tempo':>9} {'tamanho':>11}")
+        _bench_image(image, args)
+
+
+def _bench_image(image, args):
+    from PySide6.QtGui import QImage, QPixmap
+
+    from linsnipper.core.export_service import encode_image
+    from linsnipper.core.png_encoder import ParallelPngEncoder
+
+    pixmap = QPixmap.fromImage(image)
+    reference = image.convertToFormat(QImage.Format_RGB32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, "qt.png")
+        seconds, _ = _median_s(lambda: pixmap.save(target, "PNG"), args.runs)
+        print(f"{'QPixmap.save':30} {seconds * 1000:7.0f} ms {os.path.getsize(target) / 1e6:8.2f} MB")
+
+    seconds, data = _median_s(lambda: encode_image(image, "png", palette=True), args.runs)
+    decoded = QImage.fromData(data).convertToFormat(QImage.Format_RGB32)
+    status = "" if decoded == reference else "  (DIFERENTE!)"
+    print(f"{'QImageWriter +paleta':30} {seconds * 1000:7.0f} ms {len(data) / 1e6:8.2f} MB{status}")
+
+    variants = [
+        (level, filter_name, False)
+        for level in (int(v) for v in args.levels.split(","))
+        for filter_name in args.filters.split(",")
+    ]
+    variants += [(6, "up", True)]
+    for level, filter_name, palette in variants:
+        encoder = ParallelPngEncoder(level=level, filter=filter_name)
+        seconds, data = _median_s(
+            lambda: encode_image(image, "png", png_encoder=encoder, palette=palette), args.runs
+        )
+        decoded = QImage.fromData(data).convertToFormat(QImage.Format_RGB32)
+        status = "" if decoded == reference else "  (DIFERENTE!)"
+        label = f"paralelo nível {level} {filter_name}" + (" +paleta" if palette else "")
+        print(f"{label:30} {seconds * 1000:7.0f} ms {len(data) / 1e6:8.2f} MB{status}")
+        encoder.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: captura de região "fullscreen + crop" (caminho antigo) vs. captura
+apenas das telas que intersectam a seleção (QtCaptureBackend.capture_region).
+
+Cada caminho roda num subprocesso separado para que o pico de memória (RSS)
+de um não contamine o outro.
+
+Uso:
+    python scripts/bench_region_capture.py [--rect X,Y,W,H] [--runs N]
+
+Sem display real, rode com QT_QPA_PLATFORM=offscreen (ou via xvfb-run).
+"""
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+
+def _parse_rect(value):
+    x, y, w, h = (int(v) for v in value.split(","))
+    return x, y, w, h
+
+
+def _worker(path, rect, runs):
+    from PySide6.QtCore import QRect
+    from PySide6.QtGui import QGuiApplication
+
+    from linsnipper.infra.qt_capture_backend import QtCaptureBackend
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+    backend = QtCaptureBackend()
+    qrect = QRect(*rect)
+
+    def _legacy():
+        full = backend.capture_fullscreen()
+        return full.copy(qrect.intersected(full.rect()))
+
+    def _region():
+        return backend.capture_region(qrect)
+
+    fn = _legacy if path == "legacy" else _region
+    fn()  # aquecimento
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pix = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        del pix
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    virtual = backend._virtual_geometry(app.screens())
+    print(json.dumps({
+        "path": path,
+        "screens": len(app.screens()),
+        "desktop": f"{virtual.width()}x{virtual.height()}",
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "peak_rss_kb": rss_after,
+        "peak_growth_kb": rss_after - rss_before,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rect", type=_parse_rect, default=(100, 100, 400, 300))
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--worker", choices=["legacy", "region"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker, args.rect, args.runs)
+        return
+
+    rect_arg = ",".join(str(v) for v in args.rect)
+    results = []
+    for path in ("legacy", "region"):
+        out = subprocess.check_output([
+            sys.executable, __file__,
+            "--worker", path, "--rect", rect_arg, "--runs", str(args.runs),
+        ])
+        results.append(json.loads(out.decode().strip().splitlines()[-1]))
+
+    print(f"Desktop: {results[0]['desktop']} ({results[0]['screens']} tela(s)), região {rect_arg}")
+    print(f"{'caminho':<8} {'mediana ms':>11} {'min ms':>8} {'pico RSS KiB':>13} {'crescimento KiB':>16}")
+    for r in results:
+        print(
+            f"{r['path']:<8} {r['median_ms']:>11.2f} {r['min_ms']:>8.2f} "
+            f"{r['peak_rss_kb']:>13} {r['peak_growth_kb']:>16}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: custo de inicialização do caminho do atalho (``linsnipper --snip``).
+
+Mede, em subprocessos novos:
+- ``-X importtime`` de cada ponto de entrada (total e módulos mais pesados);
+- tempo de parede de ``python -m linsnipper --snip`` com um daemon falso
+  ouvindo no socket do QLocalServer (o caso comum: só enviar ``SNIP``).
+
+Compara o cliente IPC sem Qt (``linsnipper.__main__``) com o caminho antigo,
+que importava ``linsnipper.app`` (QtWidgets, UI e QtNetwork) antes de tentar o IPC.
+
+Uso:
+    python scripts/bench_startup.py [--runs N] [--top N]
+
+Sem display real, rode com QT_QPA_PLATFORM=offscreen.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ENTRY_POINTS = {
+    "cliente IPC (__main__)": "import linsnipper.__main__",
+    "antigo (app)": "import linsnipper.app",
+}
+
+
+def import_times(statement):
+    """(total_us, [(próprio_us, módulo)]): total dos imports de ``statement`` e custo próprio de cada módulo."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        modules.append((int(own), int(cumulative), name.rstrip()))
+    total = sum(cumulative for _, cumulative, name in modules if not name.startswith("  "))
+    return total, [(own, name.strip()) for own, _, name in modules]
+
+
+def _fake_daemon(path, stop):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(16)
+    server.settimeout(0.1)
+    while not stop.is_set():
+        try:
+            conn, _ = server.accept()
+        except socket.timeout:
+            continue
+        conn.recv(4096)
+        conn.close()
+    server.close()
+
+
+def snip_wall_time(runs):
+    """Tempos (ms) de ``python -m linsnipper --snip`` com um daemon falso rodando."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, TMPDIR=tmp)
+        stop = threading.Event()
+        thread = threading.Thread(target=_fake_daemon, args=(os.path.join(tmp, "linsnipper_ipc"), stop))
+        thread.start()
+        time.sleep(0.05)
+        timings = []
+        try:
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, "-m", "linsnipper", "--snip"], env=env, check=True)
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            stop.set()
+            thread.join()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = import_times("pass")[0]
+    print(f"{'ponto de entrada':<26}{'imports (ms)':>14}  mais pesados (ms próprios)")
+    for label, statement in ENTRY_POINTS.items():
+        totals = [import_times(statement) for _ in range(args.runs)]
+        best_total, own_times = min(totals, key=lambda item: item[0])
+        heaviest = sorted(own_times, reverse=True)[: args.top]
+        names = ", ".join(f"{name} {us / 1000:.1f}" for us, name in heaviest)
+        print(f"{label:<26}{(best_total - baseline) / 1000:>14.1f}  {names}")
+
+    timings = snip_wall_time(args.runs)
+    print(
+        f"\n'linsnipper --snip' com daemon: mediana {statistics.median(timings):.1f} ms, "
+        f"mínimo {min(timings):.1f} ms ({args.runs} execuções)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memória do desfazer numa sessão longa de edição.
+
+Compara o caminho antigo (uma cópia da camada de anotação inteira por
+traço, limitado a 50 passos, reproduzido aqui com um ``deque``) com
+``TileUndoStack`` (só os tiles 64x64 alterados, com orçamento em bytes,
+compressão e spill em disco).
+
+Os traços são aleatórios (semente fixa): canetas, marca-textos e borrachas
+de tamanhos variados sobre uma camada do tamanho da captura.
+
+Uso:
+    python scripts/bench_undo_memory.py [--size 1920x1080] [--strokes 300] [--budget-mb 64]
+
+Sem display real, rode com QT_QPA_PLATFORM=offscreen (padrão deste script).
+"""
+
+import argparse
+import os
+from collections import deque
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _parse_size(value):
+    w, h = (int(v) for v in value.lower().split("x"))
+    return w, h
+
+
+def _random_strokes(count, width, height, seed):
+    from PySide6.QtGui import QColor
+
+    from linsnipper.core.annotations import AnnotationDocument
+
+    rng = random.Random(seed)
+    doc = AnnotationDocument()
+    tools = [
+        ("pen", QColor(220, 20, 60), 3),
+        ("highlighter", QColor(255, 255, 0, 120), 15),
+        ("eraser", QColor(0, 0, 0), 20),
+    ]
+    strokes = []
+    for _ in range(count):
+        tool, color, pen_width = tools[rng.choices((0, 1, 2), weights=(6, 3, 1))[0]]
+        stroke = doc.begin_stroke(tool, color, pen_width)
+        x, y = rng.uniform(0, width), rng.uniform(0, height)
+        for _ in range(rng.randint(10, 120)):
+            x = min(max(x + rng.uniform(-15, 15), 0), width)
+            y = min(max(y + rng.uniform(-15, 15), 0), height)
+            stroke.add_point(x, y)
+        strokes.append(stroke)
+    return strokes
+
+
+def _layer(width, height):
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QImage
+
+    layer = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    layer.fill(Qt.transparent)
+    return layer
+
+
+def _run_snapshot(strokes, width, height):
+    from PySide6.QtGui import QPainter
+
+    from linsnipper.core.annotations import paint_stroke
+
+    layer = _layer(width, height)
+    stack = deque(maxlen=50)  # descarta o snapshot mais antigo
+    timings = []
+    for stroke in strokes:
+        start = time.perf_counter()
+        stack.append(layer.copy())
+        timings.append((time.perf_counter() - start) * 1000)
+        painter = QPainter(layer)
+        paint_stroke(painter, stroke)
+        painter.end()
+
+    memory = sum(state.sizeInBytes() for state in stack)
+    start = time.perf_counter()
+    steps = 0
+    while stack:
+        layer = stack.pop()
+        steps += 1
+    undo_ms = (time.perf_counter() - start) * 1000
+    return {
+        "record_ms": statistics.median(timings),
+        "resident_mb": memory / 2**20,
+        "spilled_mb": 0.0,
+        "undo_steps": steps,
+        "undo_all_ms": undo_ms,
+    }
+
+
+def _run_tiles(strokes, width, height, budget_mb):
+    from PySide6.QtGui import QPainter
+
+    from linsnipper.core.annotations import paint_stroke
+    from linsnipper.core.tile_undo import TileUndoStack
+
+    layer = _layer(width, height)
+    history = TileUndoStack(budget_bytes=int(budget_mb * 2**20))
+    timings = []
+    for stroke in strokes:
+        start = time.perf_counter()
+        history.begin_step()
+        for index in range(len(stroke)):
+            history.touch(layer, stroke.span_rect(index, index + 1))
+        recorded = time.perf_counter() - start
+        painter = QPainter(layer)
+        paint_stroke(painter, stroke)
+        painter.end()
+        start = time.perf_counter()
+        history.end_step(layer)
+        timings.append((recorded + time.perf_counter() - start) * 1000)
+
+    resident, spilled = history.resident_bytes, history.spilled_bytes
+    start = time.perf_counter()
+    steps = 0
+    while history.undo(layer):
+        steps += 1
+    undo_ms = (time.perf_counter() - start) * 1000
+    return {
+        "record_ms": statistics.median(timings),
+        "resident_mb": resident / 2**20,
+        "spilled_mb": spilled / 2**20,
+        "undo_steps": steps,
+        "undo_all_ms": undo_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=_parse_size, default=(1920, 1080))
+    parser.add_argument("--strokes", type=int, default=300)
+    parser.add_argument("--budget-mb", type=float, default=64)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from PySide6.QtGui import QGuiApplication
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # noqa: F841
+    width, height = args.size
+    strokes = _random_strokes(args.strokes, width, height, args.seed)
+
+    print(f"Camada {width}x{height}, {args.strokes} traços, orçamento {args.budget_mb:g} MB")
+    print(f"{'caminho':<10} {'grava/traço':>12} {'residente':>11} {'em disco':>10} {'passos':>7} {'desfaz tudo':>12}")
+    for name, result in (
+        ("snapshot", _run_snapshot(strokes, width, height)),
+        ("tiles", _run_tiles(strokes, width, height, args.budget_mb)),
+    ):
+        print(
+            f"{name:<10} {result['record_ms']:>9.2f} ms {result['resident_mb']:>8.1f} MB "
+            f"{result['spilled_mb']:>7.1f} MB {result['undo_steps']:>7d} {result['undo_all_ms']:>9.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
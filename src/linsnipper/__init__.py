@@ -1,5 +1,14 @@
 from __future__ import annotations
 
-__all__ = ["__version__"]
+__all__ = ["__version__", "capture", "capture_regions"]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    # Import tardio: ``import linsnipper`` não carrega Qt (caminho rápido do IPC)
+    if name in ("capture", "capture_regions"):
+        from . import api
+
+        return getattr(api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,32 @@
 from __future__ import annotations
 
+import sys
+
 from .cli import parse_args, mode_from_str
-from .app import run_app, run_snip_mode
+from .ipc_client import SERVER_NAME, send_command
 
 
 def main():
     args = parse_args()
 
+    if args.command == "capture":
+        # Caminho headless: não importa app/ui (QtWidgets)
+        from .headless import run_capture
+
+        sys.exit(run_capture(args))
+
+    # Daemon já rodando: só avisa e sai, sem importar nada do Qt
+    if args.snip:
+        delivered = send_command(SERVER_NAME, "snip", {"mode": args.mode, "delay": args.delay})
+    else:
+        delivered = send_command(SERVER_NAME, "editor")
+    if delivered:
+        if not args.snip:
+            print("LinSnipper já está rodando. Abrindo editor...")
+        sys.exit(0)
+
+    from .app import run_app, run_snip_mode
+
     if args.snip:
         run_snip_mode(
             initial_mode=mode_from_str(args.mode),
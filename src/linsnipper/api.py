@@ -0,0 +1,92 @@
+"""
+API Python para capturas, sem overlay nem editor::
+
+    import linsnipper
+
+    result = linsnipper.capture((0, 0, 800, 600))
+    pixels = result.to_numpy()  # (600, 800, 4) uint8, view sem cópia
+
+    # Monitoramento: várias regiões de uma única captura da tela
+    for result in linsnipper.capture_regions([(0, 0, 100, 50), (200, 300, 64, 64)]):
+        ...
+
+Cria um ``QGuiApplication`` se ainda não houver um (só QtGui). As chamadas
+devem vir da thread em que ele vive, como qualquer captura Qt.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from PySide6.QtCore import QRect
+
+from .config import AppConfig
+from .core.capture_service import CaptureService
+from .core.interfaces import BaseCaptureBackend
+from .core.models import CaptureMode, CaptureRequest, CaptureResult
+from .headless import ensure_gui_app
+from .infra.backends import create_capture_backend
+
+Region = Union[QRect, Sequence[int]]
+BackendArg = Union[None, str, BaseCaptureBackend]
+
+# Um serviço por escolha de backend: "auto" só mede os backends uma vez
+_services: Dict[str, CaptureService] = {}
+
+
+def _service(backend: BackendArg) -> CaptureService:
+    ensure_gui_app()
+    if isinstance(backend, BaseCaptureBackend):
+        return CaptureService(backend)
+    choice = backend or AppConfig.load().capture_backend
+    service = _services.get(choice)
+    if service is None:
+        service = _services[choice] = CaptureService(create_capture_backend(choice))
+    return service
+
+
+def _to_rect(region: Region) -> QRect:
+    if isinstance(region, QRect):
+        return QRect(region)
+    x, y, w, h = (int(value) for value in region)
+    if w <= 0 or h <= 0:
+        raise ValueError(f"Região sem área: {tuple(region)!r}")
+    return QRect(x, y, w, h)
+
+
+def _result(image, mode: CaptureMode, service: CaptureService) -> CaptureResult:
+    return CaptureResult(
+        pixmap=None,
+        mode=mode,
+        created_at=datetime.now(),
+        backend_name=service.backend.name,
+        image=image,
+    )
+
+
+def capture(region: Optional[Region] = None, *, delay: float = 0, backend: BackendArg = None) -> CaptureResult:
+    """
+    Captura a tela inteira (``region=None``) ou ``(x, y, w, h)`` do desktop virtual.
+
+    ``backend``: ``"auto"``, ``"qt"``, ``"xshm"``, ``"portal"``, uma instância
+    de ``BaseCaptureBackend`` ou ``None`` (usa ``AppConfig.capture_backend``).
+    O resultado não tem ``pixmap``; use ``result.image``, ``result.buffer()``
+    ou ``result.to_numpy()``.
+    """
+    service = _service(backend)
+    if region is None:
+        request = CaptureRequest(mode=CaptureMode.FULLSCREEN)
+    else:
+        request = CaptureRequest(mode=CaptureMode.RECTANGLE, region=_to_rect(region))
+    if delay > 0:
+        time.sleep(delay)
+    return _result(service.capture_image(request), request.mode, service)
+
+
+def capture_regions(regions: Iterable[Region], *, backend: BackendArg = None) -> List[CaptureResult]:
+    """Várias regiões de uma única captura da tela (um grab, um resultado por região)."""
+    service = _service(backend)
+    rects = [_to_rect(region) for region in regions]
+    return [_result(image, CaptureMode.RECTANGLE, service) for image in service.capture_regions(rects)]
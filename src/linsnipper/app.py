@@ -1,33 +1,95 @@
 from __future__ import annotations
 
 import logging
+import os
 import sys
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage
 from PySide6.QtWidgets import QApplication
 
+from . import __version__, shm_frame, tracing
 from .config import AppConfig
 from .logging_config import setup_logging
-from .infra.qt_capture_backend import QtCaptureBackend
+from .infra.backend_probe import BackendFactory, describe_layout, select_fastest_backend
+from .infra.backends import available_backends, create_capture_backend
+from .ipc_client import SERVER_NAME
+from .ipc_protocol import VERSION as IPC_VERSION
 from .core.capture_service import CaptureService
+from .core.export_service import ExportService
+from .core.format_policy import FormatChoice
 from .core.models import CaptureMode
-from .core.single_instance import SingleInstance, send_message_to_instance
+from .core.png_encoder import create_png_encoder
+from .core.single_instance import IpcRequest, SingleInstance
 from .errors import LinSnipperError
+from .headless import build_request, resolve_format
 from .ui.editor_window import EditorWindow
 from .ui.snip_overlay import SnipOverlay
 from .ui.tray import TrayIcon
 
 logger = logging.getLogger(__name__)
 
+# Nomes aceitos no IPC: os da CLI e os de CaptureMode
+_IPC_MODES = {
+    "rect": CaptureMode.RECTANGLE,
+    "rectangle": CaptureMode.RECTANGLE,
+    "freeform": CaptureMode.FREEFORM,
+    "window": CaptureMode.WINDOW,
+    "fullscreen": CaptureMode.FULLSCREEN,
+}
+
+
+class _ProbeSignals(QObject):
+    # (rodada, vencedor ou None); emitido da thread do pool, entregue na de GUI
+    finished = Signal(int, object)
+
+
+class _BackendProbeTask(QRunnable):
+    """Testa os backends para um arranjo novo de monitores fora da thread de GUI."""
+
+    def __init__(
+        self,
+        signals: _ProbeSignals,
+        generation: int,
+        factories: Dict[str, BackendFactory],
+        layout: List[str],
+    ):
+        super().__init__()
+        self._signals = signals
+        self._generation = generation
+        self._factories = factories
+        self._layout = layout
+
+    def run(self):
+        winner: Optional[str] = None
+        try:
+            winner = select_fastest_backend(self._factories, layout=self._layout)
+        except Exception:  # noqa: BLE001 - falha no teste mantém o backend atual
+            logger.exception("Falha ao testar backends para o arranjo novo de monitores")
+        self._signals.finished.emit(self._generation, winner)
+
 
 class LinSnipperController:
     """
     Central controller for the resident application.
     Manages: Tray Icon, IPC Server, Windows (Overlay/Editor).
     """
-    def __init__(self, app: QApplication, config: AppConfig):
+    def __init__(self, app: QApplication, config: AppConfig, server_name: str = SERVER_NAME):
         self.app = app
         self.config = config
         self.capture_service = self._create_capture_service()
+        self.export_service = ExportService(
+            png_encoder=create_png_encoder(config.png_encoder, config.png_compression_level, config.png_filter),
+            png_palette=config.png_palette,
+        )
+        self.export_service.finished.connect(self._on_ipc_export_finished)
+        self.export_service.failed.connect(self._on_ipc_export_failed)
+        self._ipc_exports: Dict[int, Tuple[IpcRequest, FormatChoice]] = {}
+        self._started_at = time.monotonic()
         
         # UI Components
         self.tray = None
@@ -35,13 +97,55 @@ class LinSnipperController:
         self.editor = None
         
         # IPC
-        self.ipc_server = SingleInstance()
-        self.ipc_server.message_received.connect(self._on_ipc_message)
+        self.ipc_server = SingleInstance(server_name)
+        self.ipc_server.request_received.connect(self._on_ipc_request)
+
+        # Novo arranjo de monitores -> "auto" usa o vencedor em cache desse arranjo
+        # ou testa os backends de novo numa thread do pool
+        self._probe_pool = QThreadPool()
+        self._probe_pool.setMaxThreadCount(1)
+        self._probe_signals = _ProbeSignals()
+        self._probe_signals.finished.connect(self._on_probe_finished)
+        self._probe_generation = 0
+        self.app.screenAdded.connect(self._on_screens_changed)
+        self.app.screenRemoved.connect(self._on_screens_changed)
 
     def _create_capture_service(self) -> CaptureService:
-        backend = QtCaptureBackend()
+        backend = create_capture_backend(self.config.capture_backend)
+        logger.info("Backend de captura: %s", backend.name)
         return CaptureService(backend)
 
+    def _on_screens_changed(self, _screen=None):
+        if self.config.capture_backend != "auto":
+            return
+        # Cada mudança abre uma rodada nova; resultado de rodada velha é descartado
+        self._probe_generation += 1
+        factories = available_backends()
+        layout = describe_layout()
+        winner = select_fastest_backend(factories, layout=layout, probe=False)
+        if winner is not None:
+            self._use_backend(factories, winner)
+            return
+        # Arranjo ainda não testado: o teste captura a tela algumas vezes por
+        # backend, então roda no pool; até o resultado chegar fica o backend atual.
+        logger.info("Arranjo de monitores novo; testando backends em segundo plano.")
+        self._probe_pool.start(_BackendProbeTask(self._probe_signals, self._probe_generation, factories, layout))
+
+    def _on_probe_finished(self, generation: int, winner: Optional[str]):
+        if generation != self._probe_generation or winner is None:
+            return
+        self._use_backend(available_backends(), winner)
+
+    def _use_backend(self, factories: Dict[str, BackendFactory], winner: str):
+        current = self.capture_service.backend
+        if winner == current.name or winner not in factories:
+            return
+        logger.info("Arranjo de monitores mudou; backend de captura: %s", winner)
+        # O serviço é compartilhado com overlay/editor: troca só o backend dele.
+        # As capturas rodam na thread de GUI, então nenhuma está em andamento.
+        self.capture_service.backend = factories[winner]()
+        current.close()
+
     def start(self):
         """Starts the background service (Tray + IPC)."""
         # Try to start IPC server
@@ -51,7 +155,7 @@ class LinSnipperController:
         
         # Create Tray
         self.tray = TrayIcon(self.app)
-        self.tray.request_snip.connect(lambda: self.start_snip(CaptureMode.RECT, 0))
+        self.tray.request_snip.connect(lambda: self.start_snip(CaptureMode.RECTANGLE, 0))
         self.tray.request_editor.connect(self.open_editor)
         self.tray.request_quit.connect(self.quit)
         
@@ -59,16 +163,149 @@ class LinSnipperController:
         self.app.setQuitOnLastWindowClosed(False)
         logger.info("LinSnipper Background Service iniciado.")
 
-    def _on_ipc_message(self, message: str):
-        logger.info(f"IPC Message Received: {message}")
-        cmd, *args = message.split(":")
-        
-        if cmd == "SNIP":
-            self.start_snip(CaptureMode.RECT, 0) # Default for shortuct
-        elif cmd == "EDITOR":
-            self.open_editor()
-        elif cmd == "QUIT":
-            self.quit()
+    # ------------- IPC -------------
+
+    def _on_ipc_request(self, request: IpcRequest):
+        logger.info("Pedido IPC: %s %s", request.cmd, request.args)
+        handler = {
+            "snip": self._ipc_snip,
+            "editor": self._ipc_editor,
+            "capture-to-file": self._ipc_capture_to_file,
+            "capture-raw": self._ipc_capture_raw,
+            "status": self._ipc_status,
+            "stats": self._ipc_stats,
+            "quit": self._ipc_quit,
+        }.get(request.cmd)
+        if handler is None:
+            self.ipc_server.reply(request, error=f"Comando desconhecido: {request.cmd!r}")
+            return
+        try:
+            handler(request)
+        except (LinSnipperError, TypeError, ValueError) as exc:
+            logger.warning("Pedido IPC %s falhou: %s", request.cmd, exc)
+            self.ipc_server.reply(request, error=str(exc))
+
+    def _ipc_snip(self, request: IpcRequest):
+        mode_name = str(request.args.get("mode", "rect")).lower()
+        if mode_name not in _IPC_MODES:
+            raise LinSnipperError(f"Modo de captura desconhecido: {mode_name!r}")
+        delay = int(request.args.get("delay", 0))
+        if delay < 0:
+            raise LinSnipperError("O delay não pode ser negativo.")
+        self.start_snip(_IPC_MODES[mode_name], delay)
+        self.ipc_server.reply(request, {"mode": mode_name, "delay": delay})
+
+    def _ipc_editor(self, request: IpcRequest):
+        self.open_editor()
+        self.ipc_server.reply(request)
+
+    def _ipc_capture_to_file(self, request: IpcRequest):
+        """Captura sem overlay e grava; a resposta só sai quando o arquivo existe."""
+        args = request.args
+        path = args.get("path")
+        if not path:
+            raise LinSnipperError("capture-to-file exige 'path'.")
+        capture_request = build_request(
+            args.get("mode", "fullscreen"), args.get("geometry"), int(args.get("delay", 0))
+        )
+        # Captura (delay por QTimer, processamento no pool) e gravação
+        # (ExportService) não bloqueiam a thread de GUI
+        future = self.capture_service.capture_async(capture_request)
+        future.add_done_callback(lambda fut: self._on_ipc_capture_done(request, fut))
+
+    def _on_ipc_capture_done(self, request: IpcRequest, future: Future):
+        if future.cancelled():
+            self.ipc_server.reply(request, error="Captura cancelada.")
+            return
+        exc = future.exception()
+        if exc is not None:
+            self.ipc_server.reply(request, error=str(exc))
+            return
+        image = future.result().image
+        args = request.args
+        path = str(args["path"])
+        try:
+            choice = resolve_format(image, path, args.get("format"), args.get("quality"), self.config)
+        except (LinSnipperError, TypeError, ValueError) as exc:
+            self.ipc_server.reply(request, error=str(exc))
+            return
+        job = self.export_service.save(image, Path(path), choice.format, choice.quality)
+        self._ipc_exports[job] = (request, choice)
+
+    def _on_ipc_export_finished(self, job: int, path: str):
+        entry = self._ipc_exports.pop(job, None)
+        if entry is None:
+            return
+        request, choice = entry
+        self.ipc_server.reply(request, {"path": path, "format": choice.format})
+
+    def _on_ipc_export_failed(self, job: int, message: str):
+        entry = self._ipc_exports.pop(job, None)
+        if entry is not None:
+            self.ipc_server.reply(entry[0], error=message)
+
+    def _ipc_capture_raw(self, request: IpcRequest):
+        """Captura e entrega os pixels num memfd selado (sem codificar nem gravar)."""
+        if not shm_frame.is_available():
+            raise LinSnipperError("memfd com selos indisponível nesta plataforma.")
+        args = request.args
+        capture_request = build_request(
+            args.get("mode", "fullscreen"), args.get("geometry"), int(args.get("delay", 0))
+        )
+        future = self.capture_service.capture_async(capture_request)
+        future.add_done_callback(lambda fut: self._on_ipc_raw_capture_done(request, fut))
+
+    def _on_ipc_raw_capture_done(self, request: IpcRequest, future: Future):
+        if future.cancelled():
+            self.ipc_server.reply(request, error="Captura cancelada.")
+            return
+        exc = future.exception()
+        if exc is not None:
+            self.ipc_server.reply(request, error=str(exc))
+            return
+        image = future.result().image
+        if image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32, QImage.Format_ARGB32_Premultiplied):
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        header = {
+            "width": image.width(),
+            "height": image.height(),
+            "stride": image.bytesPerLine(),
+            "format": image.format().name.removeprefix("Format_"),
+            "channels": shm_frame.CHANNEL_ORDER,
+        }
+        try:
+            with tracing.span("ipc.raw_frame", bytes=image.sizeInBytes()):
+                fd = shm_frame.sealed_memfd(image.constBits())
+                try:
+                    self.ipc_server.reply(request, header, fds=[fd])
+                finally:
+                    os.close(fd)
+        except (LinSnipperError, OSError) as exc:
+            logger.warning("Falha ao entregar quadro bruto pelo IPC: %s", exc)
+            self.ipc_server.reply(request, error=str(exc))
+
+    def _ipc_status(self, request: IpcRequest):
+        self.ipc_server.reply(
+            request,
+            {
+                "pid": os.getpid(),
+                "version": __version__,
+                "protocol": IPC_VERSION,
+                "backend": self.capture_service.backend.name,
+                "uptime_s": round(time.monotonic() - self._started_at, 3),
+                "overlay_open": bool(self.overlay and self.overlay.isVisible()),
+                "editor_open": bool(self.editor and self.editor.isVisible()),
+                "pending_exports": self.export_service.pending,
+                "tracing": tracing.is_enabled(),
+            },
+        )
+
+    def _ipc_stats(self, request: IpcRequest):
+        self.ipc_server.reply(request, {"enabled": tracing.is_enabled(), "spans": tracing.stats()})
+
+    def _ipc_quit(self, request: IpcRequest):
+        self.ipc_server.reply(request)
+        self.quit()
 
     def start_snip(self, mode: CaptureMode, delay: int):
         if self.overlay:
@@ -101,6 +338,11 @@ class LinSnipperController:
         self.editor.raise_()
 
     def quit(self):
+        # Teste de backends pendente não troca mais nada; o em curso termina antes
+        self._probe_generation += 1
+        self._probe_pool.clear()
+        self._probe_pool.waitForDone()
+        self.capture_service.backend.close()
         self.app.quit()
 
 
@@ -114,15 +356,15 @@ def _create_qapp() -> QApplication:
 
 
 def run_app_background():
-    """Main Entry Point for the Daemon/Tray mode."""
-    # 1. Check if instance running
-    if send_message_to_instance("linsnipper_ipc", "EDITOR"):
-        print("LinSnipper já está rodando. Abrindo editor...")
-        sys.exit(0)
+    """
+    Main Entry Point for the Daemon/Tray mode.
 
-    # 2. Start new instance
+    Instância única: ``__main__.main`` já tentou o daemon via IPC antes de
+    importar o Qt; aqui só sobe a instância nova.
+    """
     config = AppConfig.load()
     setup_logging(config, log_to_console=False)
+    tracing.configure(config.tracing)
     
     app = _create_qapp()
     controller = LinSnipperController(app, config)
@@ -140,23 +382,19 @@ def run_snip_mode(initial_mode: CaptureMode, delay: int, log_to_console: bool =
     OR we can make it auto-start the daemon.
     
     Decision: "linsnipper --snip" should be fast.
-    - If daemon running -> IPC Trigger
-    - If not -> One-off capture (legacy behavior)
+    - If daemon running -> IPC Trigger (feito em ``__main__.main``, sem Qt)
+    - If not -> One-off capture (legacy behavior), aqui
     """
-    
-    # 1. Try IPC
-    if send_message_to_instance("linsnipper_ipc", "SNIP"):
-        logger.info("Comando enviado para instância em background.")
-        sys.exit(0)
 
-    # 2. Fallback: Standalone Snipping (Old behavior)
+    # Fallback: Standalone Snipping (Old behavior)
     # Copied logic from old run_snip_mode, but minimized
     config = AppConfig.load()
     setup_logging(config, log_to_console=log_to_console)
+    tracing.configure(config.tracing)
     logger.info("Modo Standalone: Snip")
 
     app = _create_qapp()
-    backend = QtCaptureBackend()
+    backend = create_capture_backend(config.capture_backend)
     service = CaptureService(backend)
 
     overlay = SnipOverlay(config, service, initial_mode, delay)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import argparse
+from typing import TYPE_CHECKING, Tuple
 
-from .core.models import CaptureMode
+if TYPE_CHECKING:
+    from .core.models import CaptureMode
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -31,15 +33,82 @@ def build_arg_parser() -> argparse.ArgumentParser:
         help="Também logar no console (debug).",
     )
 
+    sub = parser.add_subparsers(dest="command")
+    capture = sub.add_parser(
+        "capture",
+        help="Captura sem interface (nenhuma janela) e grava o arquivo ou stdout.",
+    )
+    capture.add_argument(
+        "--mode",
+        choices=["fullscreen", "region"],
+        default="fullscreen",
+        help="Tela inteira (desktop virtual) ou uma região (--geometry).",
+    )
+    capture.add_argument(
+        "--geometry",
+        type=parse_geometry,
+        metavar="X,Y,W,H",
+        help="Região em coordenadas do desktop virtual (obrigatória com --mode region).",
+    )
+    capture.add_argument(
+        "--output",
+        "-o",
+        default="-",
+        help="Arquivo de saída, ou '-' para stdout (padrão).",
+    )
+    capture.add_argument(
+        "--format",
+        choices=["auto", "png", "jpeg", "webp"],
+        default=None,
+        help="Formato; padrão: pela extensão, senão AppConfig.output_format.",
+    )
+    capture.add_argument(
+        "--quality",
+        type=int,
+        default=None,
+        help="Qualidade (0-100) para JPEG/WebP.",
+    )
+    capture.add_argument(
+        "--backend",
+        choices=["auto", "qt", "xshm", "portal"],
+        default=None,
+        help="Backend de captura; padrão: AppConfig.capture_backend.",
+    )
+    capture.add_argument(
+        "--delay",
+        type=float,
+        default=0,
+        help="Espera em segundos antes de capturar.",
+    )
+    capture.add_argument(
+        "--log-console",
+        action="store_true",
+        help="Logar em stderr (stdout fica só com a imagem).",
+    )
+
     return parser
 
 
+def parse_geometry(text: str) -> Tuple[int, int, int, int]:
+    """``"X,Y,W,H"`` -> tupla de inteiros (largura e altura positivas)."""
+    try:
+        x, y, w, h = (int(part) for part in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"geometria inválida {text!r}; use X,Y,W,H") from None
+    if w <= 0 or h <= 0:
+        raise argparse.ArgumentTypeError(f"geometria sem área: {text!r}")
+    return x, y, w, h
+
+
 def parse_args(argv=None):
     parser = build_arg_parser()
     return parser.parse_args(argv)
 
 
 def mode_from_str(s: str) -> CaptureMode:
+    # Import tardio: o parser precisa carregar sem PySide6 (caminho rápido do IPC)
+    from .core.models import CaptureMode
+
     mapping = {
         "rect": CaptureMode.RECTANGLE,
         "freeform": CaptureMode.FREEFORM,
@@ -14,7 +14,15 @@ CONFIG_FILE = CONFIG_DIR / "config.json"
 
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 Theme = Literal["system", "light", "dark"]
-BackendChoice = Literal["auto", "qt"]  # futuro: "portal", etc.
+BackendChoice = Literal["auto", "qt", "xshm", "portal"]
+# "frozen": recorta a seleção do quadro de pré-visualização do overlay;
+# "live": esconde o overlay e captura a tela novamente.
+CaptureSource = Literal["frozen", "live"]
+# "parallel": PNG em faixas comprimidas em paralelo (requer NumPy); "qt": QImageWriter
+PngEngine = Literal["parallel", "qt"]
+PngFilter = Literal["none", "sub", "up", "avg", "paeth", "adaptive"]
+# "auto": PNG para interfaces, WebP/JPEG para conteúdo fotográfico
+OutputFormat = Literal["auto", "png", "jpeg", "webp"]
 
 
 @dataclass
@@ -24,6 +32,17 @@ class AppConfig:
     theme: Theme = "system"
     log_level: LogLevel = "INFO"
     capture_backend: BackendChoice = "auto"
+    capture_source: CaptureSource = "frozen"
+    # Grava spans de tempo do caminho de captura (ver linsnipper.tracing)
+    tracing: bool = False
+    png_encoder: PngEngine = "parallel"
+    png_compression_level: int = 6
+    png_filter: PngFilter = "up"
+    # PNG indexado (sem perdas) quando a captura tem até 256 cores
+    png_palette: bool = True
+    output_format: OutputFormat = "png"
+    # Suaviza os traços do editor (filtro 1€) contra o tremido do mouse/mesa
+    stroke_smoothing: bool = False
 
     @classmethod
     def default(cls) -> "AppConfig":  # type: ignore[name-defined]
@@ -35,6 +54,14 @@ class AppConfig:
             theme="system",
             log_level="INFO",
             capture_backend="auto",
+            capture_source="frozen",
+            tracing=False,
+            png_encoder="parallel",
+            png_compression_level=6,
+            png_filter="up",
+            png_palette=True,
+            output_format="png",
+            stroke_smoothing=False,
         )
 
     @classmethod
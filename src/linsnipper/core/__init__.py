@@ -1,9 +1,14 @@
 from .models import CaptureMode, CaptureRequest, CaptureResult
 from .capture_service import CaptureService
+from .export_service import ExportService
+from .frame import ScreenTile, VirtualDesktopFrame
 
 __all__ = [
     "CaptureMode",
     "CaptureRequest",
     "CaptureResult",
     "CaptureService",
+    "ExportService",
+    "ScreenTile",
+    "VirtualDesktopFrame",
 ]
@@ -0,0 +1,185 @@
+"""
+Documento vetorial das anotações do editor.
+
+Cada traço é um registro compacto: ferramenta, cor, largura e os pontos num
+``array('f')`` (x0, y0, x1, y1, ...; 8 bytes por ponto). A camada raster do
+canvas vira só um cache reconstruível a partir desta lista, então desfazer e
+refazer são operações O(1) em listas, e os traços podem ser editados ou
+serializados depois.
+"""
+
+from __future__ import annotations
+
+import json
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+
+TOOLS = ("pen", "highlighter", "eraser")
+FORMAT_VERSION = 1
+
+
+@dataclass
+class Stroke:
+    tool: str  # "pen", "highlighter" ou "eraser"
+    color: int  # QColor.rgba(): 0xAARRGGBB
+    width: float
+    points: array = field(default_factory=lambda: array("f"))
+
+    def __post_init__(self):
+        if self.tool not in TOOLS:
+            raise ValueError(f"Ferramenta desconhecida: {self.tool!r}")
+
+    def add_point(self, x: float, y: float) -> None:
+        self.points.append(x)
+        self.points.append(y)
+
+    def __len__(self) -> int:
+        return len(self.points) // 2
+
+    def point(self, index: int) -> QPointF:
+        return QPointF(self.points[2 * index], self.points[2 * index + 1])
+
+    def span_rect(self, start: int, end: Optional[int] = None) -> QRectF:
+        """
+        Área que ``paint_stroke(..., start)`` toca ao pintar os pontos
+        ``start:end`` (cada um ligado ao anterior), com meia largura da caneta
+        e margem de antialiasing.
+        """
+        end = len(self) if end is None else end
+        pts = self.points[2 * max(start - 1, 0) : 2 * end]
+        xs, ys = pts[0::2], pts[1::2]
+        margin = self.width / 2 + 2
+        return QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)).adjusted(
+            -margin, -margin, margin, margin
+        )
+
+    def bounding_rect(self) -> QRectF:
+        """Área tocada pelo traço inteiro."""
+        return self.span_rect(0) if self.points else QRectF()
+
+    def pen(self) -> QPen:
+        return QPen(QColor.fromRgba(self.color), self.width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tool": self.tool,
+            "color": f"#{self.color:08x}",
+            "width": self.width,
+            "points": [round(v, 2) for v in self.points],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Stroke":
+        return cls(
+            tool=data["tool"],
+            color=int(str(data["color"]).lstrip("#"), 16),
+            width=float(data["width"]),
+            points=array("f", data.get("points", [])),
+        )
+
+
+def paint_stroke(painter: QPainter, stroke: Stroke, start: int = 0, pen: Optional[QPen] = None) -> None:
+    """
+    Pinta ``stroke`` a partir do ponto ``start`` na camada de anotação.
+
+    O primeiro ponto vira um ponto redondo e os seguintes, uma polilinha
+    (``drawPolyline``) que começa no ponto anterior a ``start``. Ao vivo o canvas chama com
+    ``start`` = primeiro ponto ainda não pintado, uma vez por quadro, e passa
+    a mesma ``pen`` (``stroke.pen()``) durante o traço todo; o resultado
+    difere de repintar o traço inteiro só no antialiasing de algumas junções.
+    A borracha usa ``CompositionMode_Clear``: apagar a anotação revela o fundo.
+    """
+    count = len(stroke)
+    if start >= count:
+        return
+    painter.save()
+    painter.setRenderHint(QPainter.Antialiasing)
+    if stroke.tool == "eraser":
+        painter.setCompositionMode(QPainter.CompositionMode_Clear)
+    painter.setPen(pen if pen is not None else stroke.pen())
+    if start == 0:
+        painter.drawPoint(stroke.point(0))
+    if count > 1:
+        # Uma polilinha desde o último ponto já pintado: RoundJoin entre os
+        # segmentos em vez de uma capa por ponto (marca-texto não escurece).
+        pts = stroke.points
+        painter.drawPolyline(
+            QPolygonF([QPointF(pts[2 * i], pts[2 * i + 1]) for i in range(max(start - 1, 0), count)])
+        )
+    painter.restore()
+
+
+class AnnotationDocument:
+    """
+    Lista de traços com desfazer/refazer.
+
+    ``revision`` muda a cada alteração, para caches saberem se estão velhos.
+    """
+
+    def __init__(self, strokes: Iterable[Stroke] = ()):
+        self.strokes: List[Stroke] = list(strokes)
+        self._redo: List[Stroke] = []
+        self.revision = 0
+
+    # ------------- Edição -------------
+
+    def begin_stroke(self, tool: str, color: QColor, width: float) -> Stroke:
+        stroke = Stroke(tool=tool, color=color.rgba(), width=float(width))
+        self.strokes.append(stroke)
+        self._redo.clear()
+        self.revision += 1
+        return stroke
+
+    def add_point(self, stroke: Stroke, x: float, y: float) -> None:
+        stroke.add_point(x, y)
+        self.revision += 1
+
+    def can_undo(self) -> bool:
+        return bool(self.strokes)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> Optional[Stroke]:
+        if not self.strokes:
+            return None
+        stroke = self.strokes.pop()
+        self._redo.append(stroke)
+        self.revision += 1
+        return stroke
+
+    def redo(self) -> Optional[Stroke]:
+        if not self._redo:
+            return None
+        stroke = self._redo.pop()
+        self.strokes.append(stroke)
+        self.revision += 1
+        return stroke
+
+    def clear(self) -> None:
+        self.strokes.clear()
+        self._redo.clear()
+        self.revision += 1
+
+    # ------------- Serialização -------------
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"version": FORMAT_VERSION, "strokes": [s.to_dict() for s in self.strokes]},
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "AnnotationDocument":
+        data = json.loads(text)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Versão de anotações não suportada: {data.get('version')!r}")
+        return cls(Stroke.from_dict(item) for item in data.get("strokes", []))
+
+    def nbytes(self) -> int:
+        """Memória aproximada dos pontos (para comparar com snapshots raster)."""
+        return sum(s.points.itemsize * len(s.points) for s in self.strokes + self._redo)
@@ -1,21 +1,151 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Optional
+from typing import Callable, List, Optional, Sequence, Union
 
-from PySide6.QtCore import QEventLoop, QRect, QTimer
+from PySide6.QtCore import QEventLoop, QObject, QPoint, QRect, QRunnable, QThreadPool, QTimer, Signal, Slot
+from PySide6.QtGui import QImage, QPixmap
 
+from .. import tracing
+from .frame import VirtualDesktopFrame
+from .masking import apply_mask, validate_masked_image
 from .models import CaptureRequest, CaptureResult, CaptureMode
 from .interfaces import BaseCaptureBackend
 from ..errors import CaptureError
 
 logger = logging.getLogger(__name__)
 
+# O que sai da thread de GUI: um quadro por tela ou uma imagem já capturada
+GrabbedSource = Union[VirtualDesktopFrame, QImage]
+
+
+class _ResultDispatcher(QObject):
+    """
+    Vive na thread de GUI: recebe o ``QImage`` processado no worker e resolve a
+    future lá, onde é seguro criar o ``QPixmap`` e rodar callbacks de UI.
+    """
+
+    processed = Signal(object, object, object)  # (future, finalizador, QImage | Exception)
+
+    def __init__(self):
+        super().__init__()
+        self.processed.connect(self._resolve)
+
+    @Slot(object, object, object)
+    def _resolve(self, future: Future, finish, outcome):
+        if isinstance(outcome, Exception):
+            future.set_exception(outcome)
+            return
+        try:
+            future.set_result(finish(outcome))
+        except Exception as exc:  # pragma: no cover - proteção extra
+            future.set_exception(CaptureError(f"Erro inesperado na captura: {exc}"))
+
+
+class _ProcessTask(QRunnable):
+    def __init__(self, job: Callable[[], QImage], on_done: Callable[[object], None]):
+        super().__init__()
+        self._job = job
+        self._on_done = on_done
+
+    def run(self):
+        try:
+            outcome = self._job()
+        except CaptureError as exc:
+            outcome = exc
+        except Exception as exc:  # pragma: no cover - proteção extra
+            logger.exception("Erro inesperado ao processar captura.")
+            outcome = CaptureError(f"Erro inesperado na captura: {exc}")
+        self._on_done(outcome)
+
 
 class CaptureService:
-    def __init__(self, backend: BaseCaptureBackend):
+    """
+    Orquestra capturas: o backend captura na thread de GUI (única parte que
+    precisa dela) e composição, recorte e máscara rodam num ``QThreadPool``.
+
+    A API principal é ``capture_async``, que devolve uma
+    ``concurrent.futures.Future`` (aguardável em asyncio via
+    ``asyncio.wrap_future``). ``perform_capture`` é mantida para chamadas
+    síncronas e baseadas em callbacks.
+    """
+
+    def __init__(self, backend: BaseCaptureBackend, thread_pool: Optional[QThreadPool] = None):
         self.backend = backend
+        self._pool = thread_pool or QThreadPool.globalInstance()
+        self._dispatcher = _ResultDispatcher()
+
+    # ------------- API assíncrona -------------
+
+    def capture_async(
+        self,
+        request: CaptureRequest,
+        selection_rect: Optional[QRect] = None,
+        *,
+        frame: Optional[VirtualDesktopFrame] = None,
+        before_capture=None,
+    ) -> "Future[CaptureResult]":
+        """
+        Agenda a captura e retorna imediatamente uma ``Future[CaptureResult]``.
+
+        - Após ``request.delay_seconds`` (via ``QTimer``), ``before_capture`` e a
+          captura do backend rodam na thread de GUI.
+        - O processamento pesado roda no pool de threads.
+        - A future é resolvida na thread de GUI; callbacks de
+          ``add_done_callback`` podem mexer em widgets.
+
+        Com ``frame`` (modo congelado), nada é capturado: a seleção é recortada
+        do quadro no worker.
+
+        Erros chegam como ``CaptureError`` na future. Cancelar a future antes
+        do fim do delay cancela a captura. Não bloqueie a thread de GUI em
+        ``future.result()``: ela é quem resolve a future.
+        """
+        logger.debug("Agendando captura: %s", request)
+        future: Future = Future()
+
+        if frame is not None:
+            self._start(future, lambda: self._crop_frame(frame, request, selection_rect), request, frozen=True)
+            return future
+
+        def _grab_on_gui_thread():
+            if not future.set_running_or_notify_cancel():
+                logger.debug("Captura cancelada antes de disparar.")
+                return
+            try:
+                if before_capture is not None:
+                    with tracing.span("capture.before"):
+                        before_capture()
+                source = self._grab(request, selection_rect)
+            except CaptureError as exc:
+                logger.exception("Falha na captura (erro conhecido).")
+                future.set_exception(exc)
+                return
+            except Exception as exc:  # pragma: no cover - proteção extra
+                logger.exception("Erro inesperado ao capturar.")
+                future.set_exception(CaptureError(f"Erro inesperado na captura: {exc}"))
+                return
+            self._submit(future, lambda: self._process(source, request, selection_rect), request)
+
+        QTimer.singleShot(self._delay_ms(request), _grab_on_gui_thread)
+        return future
+
+    def _start(self, future: Future, job, request: CaptureRequest, *, frozen: bool = False):
+        if future.set_running_or_notify_cancel():
+            self._submit(future, job, request, frozen=frozen)
+
+    def _submit(self, future: Future, job, request: CaptureRequest, *, frozen: bool = False):
+        backend_name = f"{self.backend.name}:frozen" if frozen else self.backend.name
+
+        def _finish(image: QImage) -> CaptureResult:
+            return self._make_result(image, request.mode, backend_name)
+
+        task = _ProcessTask(job, lambda outcome: self._dispatcher.processed.emit(future, _finish, outcome))
+        self._pool.start(task)
+
+    # ------------- API compatível (síncrona / callbacks) -------------
 
     def perform_capture(
         self,
@@ -30,61 +160,39 @@ class CaptureService:
         selection_rect: normalmente vem do overlay (retângulo selecionado).
         Em modo FULLSCREEN, é ignorado.
 
-        Para integrações com UI, use ``on_finished``/``on_error`` para executar de
-        forma assíncrona (a captura real será disparada por um ``QTimer`` após o
-        delay configurado em ``request``).
+        Com ``on_finished``/``on_error``, delega para ``capture_async`` e os
+        callbacks rodam na thread de GUI. Sem callbacks, bloqueia até o
+        resultado (prefira ``capture_async`` em código novo).
         """
         logger.debug("Iniciando captura: %s", request)
 
-        def _run_capture():
-            try:
-                return self._execute_capture(request, selection_rect, before_capture)
-            except CaptureError as exc:
-                logger.exception("Falha na captura (erro conhecido).")
-                raise
-            except Exception as exc:  # pragma: no cover - proteção extra
-                logger.exception("Erro inesperado ao capturar.")
-                raise CaptureError(f"Erro inesperado na captura: {exc}") from exc
-
-        def _capture_and_handle():
-            try:
-                result = _run_capture()
-            except CaptureError as exc:
-                if on_error:
+        if on_finished or on_error:
+            future = self.capture_async(request, selection_rect, before_capture=before_capture)
+
+            def _dispatch(fut: Future):
+                if fut.cancelled():
+                    return
+                exc = fut.exception()
+                if exc is None:
+                    if on_finished:
+                        on_finished(fut.result())
+                elif on_error:
                     on_error(exc)
                 else:
-                    raise
-                return
-            if on_finished:
-                on_finished(result)
-            return result
+                    logger.error("Falha na captura sem tratador: %s", exc)
 
-        delay_ms = max(0, int(request.delay_seconds * 1000))
-
-        if on_finished or on_error:
-            QTimer.singleShot(delay_ms, _capture_and_handle)
+            future.add_done_callback(_dispatch)
             return None
 
-        if delay_ms:
+        if self._delay_ms(request):
+            future = self.capture_async(request, selection_rect, before_capture=before_capture)
             loop = QEventLoop()
-            outcome: dict[str, CaptureResult | Exception] = {}
-
-            def _sync_capture():
-                try:
-                    outcome["result"] = _run_capture()
-                except Exception as exc:  # capture_error já normalizado
-                    outcome["error"] = exc
-                finally:
-                    loop.quit()
+            future.add_done_callback(lambda _f: loop.quit())
+            if not future.done():
+                loop.exec()
+            return future.result()
 
-            QTimer.singleShot(delay_ms, _sync_capture)
-            loop.exec()
-
-            if "error" in outcome:
-                raise outcome["error"]
-            return outcome.get("result")
-
-        return _run_capture()
+        return self._execute_capture(request, selection_rect, before_capture)
 
     def _execute_capture(
         self,
@@ -92,74 +200,163 @@ class CaptureService:
         selection_rect: Optional[QRect],
         before_capture,
     ) -> CaptureResult:
-        if before_capture is not None:
-            before_capture()
+        """Pipeline completo na thread atual (caminho síncrono)."""
+        image = self.capture_image(request, selection_rect, before_capture=before_capture)
+        return self._make_result(image, request.mode, self.backend.name)
+
+    def capture_image(
+        self,
+        request: CaptureRequest,
+        selection_rect: Optional[QRect] = None,
+        *,
+        before_capture=None,
+    ) -> QImage:
+        """
+        Captura síncrona que para no QImage processado, sem criar QPixmap.
+
+        Pensado para o modo headless (``linsnipper capture``), que só codifica
+        a imagem. ``request.delay_seconds`` é ignorado: quem chama decide se
+        espera antes.
+        """
+        try:
+            with tracing.span("capture.execute", mode=request.mode.name):
+                if before_capture is not None:
+                    with tracing.span("capture.before"):
+                        before_capture()
+                return self._process(self._grab(request, selection_rect), request, selection_rect)
+        except CaptureError:
+            logger.exception("Falha na captura (erro conhecido).")
+            raise
+        except Exception as exc:  # pragma: no cover - proteção extra
+            logger.exception("Erro inesperado ao capturar.")
+            raise CaptureError(f"Erro inesperado na captura: {exc}") from exc
+
+    def capture_regions(self, regions: Sequence[QRect]) -> List[QImage]:
+        """
+        Várias regiões a partir de uma única captura da tela.
+
+        Um ``capture_frame`` e N recortes (cada um lê só os tiles que toca),
+        em vez de N capturas. Regiões fora da tela levantam ``CaptureError``.
+        """
+        requests = [CaptureRequest(mode=CaptureMode.RECTANGLE, region=QRect(rect)) for rect in regions]
+        with tracing.span("capture.batch", regions=len(requests)):
+            frame = self._grab(CaptureRequest(mode=CaptureMode.FULLSCREEN), None)
+            return [self._crop_frame(frame, request, None) for request in requests]
+
+    def capture_from_frame(
+        self,
+        request: CaptureRequest,
+        frame: VirtualDesktopFrame,
+        selection_rect: Optional[QRect] = None,
+    ) -> CaptureResult:
+        """
+        Modo "congelado": recorta a seleção de um quadro já capturado (ex.: a
+        pré-visualização do overlay) em vez de capturar a tela de novo.
+
+        O resultado mostra exatamente o que o usuário via ao acionar o atalho.
+        Só os tiles que intersectam a seleção são lidos.
+        ``request.delay_seconds`` é ignorado; quem chama deve usar o modo
+        "live" quando houver delay. Versão assíncrona: ``capture_async(frame=...)``.
+        """
+        logger.debug("Captura a partir de quadro congelado: %s", request)
+        image = self._crop_frame(frame, request, selection_rect)
+        return self._make_result(image, request.mode, f"{self.backend.name}:frozen")
+
+    # ------------- Etapas do pipeline -------------
+
+    @staticmethod
+    def _delay_ms(request: CaptureRequest) -> int:
+        return max(0, int(request.delay_seconds * 1000))
 
+    def _grab(self, request: CaptureRequest, selection_rect: Optional[QRect]) -> GrabbedSource:
+        """Única etapa que precisa da thread de GUI: a captura no backend."""
+        with tracing.span("capture.grab", backend=self.backend.name, mode=request.mode.name):
+            return self._grab_source(request, selection_rect)
+
+    def _grab_source(self, request: CaptureRequest, selection_rect: Optional[QRect]) -> GrabbedSource:
         mode = request.mode
 
         if mode == CaptureMode.FULLSCREEN:
-            pix = self.backend.capture_fullscreen()
-        elif mode in (CaptureMode.RECTANGLE, CaptureMode.FREEFORM):
+            return self.backend.capture_frame()
+        if mode in (CaptureMode.RECTANGLE, CaptureMode.FREEFORM):
             rect = request.region or selection_rect
             if rect is None:
                 raise CaptureError("Nenhuma região fornecida para captura de área.")
-            pix = self.backend.capture_region(rect)
-        elif mode == CaptureMode.WINDOW:
+            return self.backend.capture_region(rect).toImage()
+        if mode == CaptureMode.WINDOW:
             try:
-                pix = self.backend.capture_window(request.window_id)
+                return self.backend.capture_window(request.window_id).toImage()
             except NotImplementedError as exc:
                 raise CaptureError(f"Erro de suporte: {exc}") from exc
+        raise CaptureError(f"Modo de captura desconhecido: {mode}")
+
+    def _process(
+        self,
+        source: GrabbedSource,
+        request: CaptureRequest,
+        selection_rect: Optional[QRect] = None,
+    ) -> QImage:
+        """Composição pós-captura; seguro fora da thread de GUI."""
+        with tracing.span("capture.process", mode=request.mode.name):
+            if isinstance(source, VirtualDesktopFrame):
+                image = source.flatten()
+            else:
+                image = source
+            if image.isNull():
+                raise CaptureError("Captura vazia retornada pelo backend.")
+            return self._mask_freeform(image, request, selection_rect)
+
+    @staticmethod
+    def _mask_freeform(image: QImage, request: CaptureRequest, selection_rect: Optional[QRect]) -> QImage:
+        """No modo FREEFORM, deixa transparente tudo fora do traçado."""
+        if request.mode != CaptureMode.FREEFORM or request.mask_path is None:
+            return image
+
+        rect = request.region or selection_rect
+        if rect is None:
+            rect = request.mask_path.boundingRect().toAlignedRect()
+        # O recorte é limitado ao desktop virtual, que começa em (0, 0)
+        origin = QPoint(max(rect.x(), 0), max(rect.y(), 0))
+
+        masked = apply_mask(image, request.mask_path, origin)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Verificação de regressão: custa uma segunda passada na imagem,
+            # então só roda com log de depuração (o resultado vai para o log)
+            validate_masked_image(masked, request.mask_path, origin)
+        return masked
+
+    @staticmethod
+    @tracing.traced("capture.crop_frozen")
+    def _crop_frame(
+        frame: VirtualDesktopFrame,
+        request: CaptureRequest,
+        selection_rect: Optional[QRect],
+    ) -> QImage:
+        if frame.isNull():
+            raise CaptureError("Quadro congelado indisponível para captura.")
 
+        mode = request.mode
+        if mode == CaptureMode.FULLSCREEN:
+            return frame.flatten()
+        if mode in (CaptureMode.RECTANGLE, CaptureMode.FREEFORM):
+            rect = request.region or selection_rect
+            if rect is None:
+                raise CaptureError("Nenhuma região fornecida para captura de área.")
+            image = frame.crop(rect)
+            if image.isNull():
+                logger.warning("Retângulo de captura não intersecta com a tela.")
+                raise CaptureError("Área selecionada está fora da tela.")
+            return CaptureService._mask_freeform(image, request, rect)
+        raise CaptureError(f"Modo {mode.name} não suporta captura congelada.")
+
+    @staticmethod
+    @tracing.traced("capture.to_pixmap")
+    def _make_result(image: QImage, mode: CaptureMode, backend_name: str) -> CaptureResult:
+        # QPixmap só pode ser criado na thread de GUI
         return CaptureResult(
-            pixmap=pix,
+            pixmap=QPixmap.fromImage(image),
             mode=mode,
             created_at=datetime.now(),
-            backend_name=self.backend.name,
+            backend_name=backend_name,
+            image=image,
         )
-
-    def _apply_mask(self, pixmap: QPixmap, mask_path: QPainterPath) -> QPixmap:
-        """Aplica uma máscara vetorial ao pixmap, preservando transparência."""
-
-        result = QPixmap(pixmap.size())
-        result.fill(Qt.transparent)
-
-        painter = QPainter(result)
-        painter.setClipPath(mask_path)
-        painter.drawPixmap(0, 0, pixmap)
-        painter.end()
-
-        return result
-
-    def _validate_masked_capture(self, pixmap: QPixmap, mask_path: QPainterPath) -> bool:
-        """
-        Confirma que pixels fora do traçado permanecem transparentes.
-
-        Essa verificação é leve e visa detectar regressões ao aplicar máscaras
-        não-retangulares na captura.
-        """
-
-        mask_image = QImage(pixmap.size(), QImage.Format_RGBA8888)
-        mask_image.fill(0)
-
-        painter = QPainter(mask_image)
-        painter.fillPath(mask_path, Qt.white)
-        painter.end()
-
-        image = pixmap.toImage().convertToFormat(QImage.Format_RGBA8888)
-        width = image.width()
-        height = image.height()
-
-        for y in range(height):
-            for x in range(width):
-                mask_alpha = mask_image.pixelColor(x, y).alpha()
-                pixel_alpha = image.pixelColor(x, y).alpha()
-                if mask_alpha == 0 and pixel_alpha != 0:
-                    logger.warning(
-                        "Pixels fora da máscara não ficaram transparentes (x=%s, y=%s).",
-                        x,
-                        y,
-                    )
-                    return False
-
-        logger.debug("Validação de máscara concluída com sucesso.")
-        return True
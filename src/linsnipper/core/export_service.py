@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageWriter, QPixmap
+
+from .. import tracing
+from ..errors import ExportError
+from .png_encoder import ParallelPngEncoder, choose_palette, indexed_image
+
+logger = logging.getLogger(__name__)
+
+# Progresso reportado ao fim da codificação; o resto é a gravação em disco
+_ENCODED_PERCENT = 70
+_WRITE_CHUNK = 1 << 20
+
+
+def _umask() -> int:
+    # Em Linux sai de /proc: trocar com os.umask afeta as outras threads do pool
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    # Na troca, a máscara provisória é a mais restritiva
+    mask = os.umask(0o077)
+    os.umask(mask)
+    return mask
+
+
+def _target_mode(path: Path) -> int:
+    """Permissões do arquivo substituído, ou as de um arquivo novo (``0o666 & ~umask``)."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_umask()
+
+
+def write_atomic(path: Path, data: bytes, on_progress=None) -> None:
+    """
+    Grava ``data`` num arquivo temporário ao lado de ``path`` e o renomeia.
+
+    Quem lê ``path`` nunca vê um arquivo pela metade: ou a versão anterior, ou
+    a nova completa. ``on_progress(escritos, total)`` é chamado a cada bloco.
+    Ao sobrescrever, mantém as permissões do arquivo anterior.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".part", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            view = memoryview(data)
+            for offset in range(0, len(view), _WRITE_CHUNK):
+                f.write(view[offset : offset + _WRITE_CHUNK])
+                if on_progress is not None:
+                    on_progress(min(offset + _WRITE_CHUNK, len(view)), len(view))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, _target_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def encode_image(
+    image: QImage,
+    fmt: str,
+    quality: int = -1,
+    png_encoder: Optional[ParallelPngEncoder] = None,
+    palette: bool = False,
+) -> bytes:
+    """
+    Codifica ``image`` em memória (seguro fora da thread de GUI).
+
+    PNGs usam ``png_encoder`` quando dado (paralelo); o resto vai pelo Qt.
+    Com ``palette``, PNGs de até 256 cores saem indexados em qualquer dos
+    dois: a paleta vai para o codificador paralelo, ou a imagem é convertida
+    para ``Format_Indexed8`` antes do ``QImageWriter``.
+    """
+    if fmt == "png" and png_encoder is not None:
+        if palette:
+            return png_encoder.encode(image, choose_palette(image))
+        return png_encoder.encode(image)
+    if fmt == "png" and palette:
+        image = indexed_image(image) or image
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    writer = QImageWriter(buffer, fmt.encode("ascii"))
+    writer.setQuality(quality)
+    if not writer.write(image):
+        raise ExportError(f"Falha ao codificar imagem ({fmt}): {writer.errorString()}")
+    buffer.close()
+    return data.data()
+
+
+class _ExportTask(QRunnable):
+    def __init__(self, service: "ExportService", job_id: int, image: QImage, path: Path, fmt: str, quality: int):
+        super().__init__()
+        self._service = service
+        self._job_id = job_id
+        self._image = image
+        self._path = path
+        self._fmt = fmt
+        self._quality = quality
+
+    def run(self):
+        service, job_id = self._service, self._job_id
+        ok = False
+        error = "Salvamento interrompido."
+        try:
+            with tracing.span("export.save", format=self._fmt):
+                with tracing.span("export.encode", format=self._fmt):
+                    data = encode_image(
+                        self._image, self._fmt, self._quality, service.png_encoder, service.png_palette
+                    )
+                service.progress.emit(job_id, _ENCODED_PERCENT)
+
+                def _on_write(written, total):
+                    percent = _ENCODED_PERCENT + (100 - _ENCODED_PERCENT) * written // max(total, 1)
+                    service.progress.emit(job_id, percent)
+
+                with tracing.span("export.write", bytes=len(data)):
+                    write_atomic(self._path, data, _on_write)
+            ok = True
+        except ExportError as exc:
+            logger.error("Falha ao salvar imagem em %s: %s", self._path, exc)
+            error = str(exc)
+        except OSError as exc:
+            logger.error("Falha ao gravar imagem em %s: %s", self._path, exc)
+            error = f"Falha ao gravar {self._path}: {exc}"
+        except Exception as exc:
+            # Erro do codificador (NumPy, memória...): a tarefa nunca pode sumir sem resposta
+            logger.exception("Erro inesperado ao salvar imagem em %s", self._path)
+            error = f"Erro inesperado ao salvar {self._path}: {exc}"
+        finally:
+            # Sempre um sinal final: é ele que tira a tarefa de ``pending`` (na thread de GUI)
+            if ok:
+                logger.info("Imagem salva em %s", self._path)
+                service.finished.emit(job_id, str(self._path))
+            else:
+                service.failed.emit(job_id, error)
+
+
+class ExportService(QObject):
+    """
+    Codifica e grava imagens num pool de threads, sem travar a thread de GUI.
+
+    ``save()`` retorna um id de tarefa na hora; o andamento chega pelos sinais
+    ``progress(id, percent)``, ``finished(id, path)`` e ``failed(id, message)``,
+    entregues na thread do objeto que os recebe. Vários salvamentos podem
+    rodar ao mesmo tempo; cada arquivo é gravado de forma atômica (arquivo
+    temporário + ``os.replace``).
+    """
+
+    progress = Signal(int, int)
+    finished = Signal(int, str)
+    failed = Signal(int, str)
+
+    def __init__(
+        self,
+        parent: Optional[QObject] = None,
+        max_workers: Optional[int] = None,
+        png_encoder: Optional[ParallelPngEncoder] = None,
+        png_palette: bool = False,
+    ):
+        super().__init__(parent)
+        self.png_encoder = png_encoder
+        self.png_palette = png_palette
+        self._pool = QThreadPool(self)
+        if max_workers is not None:
+            self._pool.setMaxThreadCount(max_workers)
+        self._ids = itertools.count(1)
+        # Só a thread do serviço (GUI) mexe aqui: os sinais dos workers chegam enfileirados
+        self._pending: set = set()
+        self.finished.connect(self._on_job_done)
+        self.failed.connect(self._on_job_done)
+
+    @property
+    def pending(self) -> int:
+        """Quantos salvamentos ainda não terminaram."""
+        return len(self._pending)
+
+    def save(
+        self,
+        image: Union[QImage, QPixmap],
+        path: Union[str, Path],
+        fmt: Optional[str] = None,
+        quality: int = -1,
+    ) -> int:
+        """
+        Agenda a gravação de ``image`` em ``path`` e retorna o id da tarefa.
+
+        ``QPixmap`` é convertido para ``QImage`` aqui (precisa da thread de GUI);
+        o formato vem da extensão de ``path`` quando ``fmt`` não é dado.
+        """
+        path = Path(path)
+        if isinstance(image, QPixmap):
+            image = image.toImage()
+        if image.isNull():
+            raise ExportError("Imagem vazia; nada para salvar.")
+
+        fmt = (fmt or path.suffix.lstrip(".") or "png").lower()
+        if fmt == "jpg":
+            fmt = "jpeg"
+
+        job_id = next(self._ids)
+        self._pending.add(job_id)
+        self.progress.emit(job_id, 0)
+        # O QImage é compartilhado implicitamente: o worker só lê
+        self._pool.start(_ExportTask(self, job_id, image, path, fmt, quality))
+        return job_id
+
+    def _on_job_done(self, job_id: int, _detail: str) -> None:
+        self._pending.discard(job_id)
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """Bloqueia até todos os salvamentos terminarem (ex.: ao fechar a janela)."""
+        return self._pool.waitForDone(msecs)
@@ -0,0 +1,154 @@
+"""
+Escolha automática do formato de saída conforme o conteúdo da captura.
+
+Uma amostra reduzida (vizinho mais próximo, então as cores são exatas) dá duas
+medidas baratas:
+- número de cores distintas;
+- entropia da luminância.
+
+Interfaces têm poucas cores e entropia baixa: PNG, sem perdas (e indexado
+quando couber em 256 cores). Conteúdo fotográfico vai para WebP, ou JPEG
+quando o WebP passaria do orçamento de tempo de codificação ou não estiver
+disponível.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QImageWriter
+
+from ..config import OutputFormat
+
+try:  # NumPy é opcional (extra "fast")
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIDE = 256
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+# Acima disso na amostra, não é "interface chapada"
+_UI_MAX_COLORS = 2048
+_UI_MAX_ENTROPY = 6.0
+# Vazão conservadora do WebP do Qt (megapixels/s) e orçamento de codificação
+_WEBP_MPIX_PER_S = 6.0
+ENCODE_BUDGET_S = 2.0
+
+_EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+_SUFFIX_FORMATS = {"png": "png", "jpg": "jpeg", "jpeg": "jpeg", "webp": "webp"}
+
+
+@dataclass(frozen=True)
+class ContentStats:
+    colors: int
+    entropy: float
+    has_alpha: bool
+
+    @property
+    def is_ui(self) -> bool:
+        return self.colors <= _UI_MAX_COLORS and self.entropy <= _UI_MAX_ENTROPY
+
+
+@dataclass(frozen=True)
+class FormatChoice:
+    format: str  # nome para QImageWriter: "png", "jpeg" ou "webp"
+    quality: int  # -1 = padrão do codificador
+    reason: str
+
+    @property
+    def extension(self) -> str:
+        return _EXTENSIONS[self.format]
+
+
+def _sample(image: QImage) -> QImage:
+    small = image
+    if image.width() > SAMPLE_SIDE or image.height() > SAMPLE_SIDE:
+        small = image.scaled(SAMPLE_SIDE, SAMPLE_SIDE, Qt.KeepAspectRatio, Qt.FastTransformation)
+    return small.convertToFormat(QImage.Format_ARGB32)
+
+
+def analyze(image: QImage) -> ContentStats:
+    """Cores distintas e entropia da luminância (bits) numa amostra de ~256x256."""
+    small = _sample(image)
+    w, h = small.width(), small.height()
+
+    if np is not None:
+        buf = np.frombuffer(small.constBits(), dtype=np.uint32, count=small.sizeInBytes() // 4)
+        pixels = buf.reshape(h, small.bytesPerLine() // 4)[:, :w].ravel()
+        colors = int(np.unique(pixels).size)
+        r, g, b = (pixels >> 16) & 0xFF, (pixels >> 8) & 0xFF, pixels & 0xFF
+        luma = (r * 77 + g * 150 + b * 29) >> 8
+        counts = np.bincount(luma, minlength=256)
+        p = counts[counts > 0] / luma.size
+        entropy = float(-(p * np.log2(p)).sum())
+    else:
+        words = memoryview(small.constBits()).cast("I")
+        stride = small.bytesPerLine() // 4
+        pixels = [words[y * stride + x] for y in range(h) for x in range(w)]
+        colors = len(set(pixels))
+        hist = Counter(
+            (((c >> 16) & 0xFF) * 77 + ((c >> 8) & 0xFF) * 150 + (c & 0xFF) * 29) >> 8 for c in pixels
+        )
+        total = len(pixels)
+        entropy = -sum(n / total * math.log2(n / total) for n in hist.values())
+
+    return ContentStats(colors=colors, entropy=entropy, has_alpha=image.hasAlphaChannel())
+
+
+def format_from_suffix(path: Union[str, Path]) -> Optional[str]:
+    """Formato implícito na extensão do arquivo (``None`` se desconhecida)."""
+    return _SUFFIX_FORMATS.get(Path(path).suffix.lower().lstrip("."))
+
+
+def webp_available() -> bool:
+    """Indica se o Qt instalado tem o plugin de escrita WebP."""
+    return b"webp" in {bytes(fmt.data()) for fmt in QImageWriter.supportedImageFormats()}
+
+
+def choose_format(image: QImage, policy: OutputFormat = "auto", stats: Optional[ContentStats] = None) -> FormatChoice:
+    """
+    Formato e qualidade para salvar ``image`` segundo ``policy``.
+
+    Com ``policy`` explícito, só completa a qualidade padrão. Com ``"auto"``,
+    escolhe pelo conteúdo e registra a decisão no log.
+    """
+    if policy == "png":
+        return FormatChoice("png", -1, "configurado")
+    if policy == "jpeg":
+        return FormatChoice("jpeg", JPEG_QUALITY, "configurado")
+    if policy == "webp":
+        return FormatChoice("webp", WEBP_QUALITY, "configurado")
+
+    stats = stats or analyze(image)
+    megapixels = image.width() * image.height() / 1e6
+    webp_ok = webp_available()
+
+    if stats.is_ui:
+        choice = FormatChoice("png", -1, "interface")
+    elif webp_ok and megapixels / _WEBP_MPIX_PER_S <= ENCODE_BUDGET_S:
+        choice = FormatChoice("webp", WEBP_QUALITY, "foto")
+    elif stats.has_alpha:
+        # JPEG perderia a transparência
+        choice = FormatChoice("png", -1, "foto com transparência")
+    else:
+        choice = FormatChoice("jpeg", JPEG_QUALITY, "foto grande" if webp_ok else "foto, sem WebP")
+
+    logger.info(
+        "Formato automático: %s (%s; %d cores, entropia %.2f bits, %.1f Mpx).",
+        choice.format,
+        choice.reason,
+        stats.colors,
+        stats.entropy,
+        megapixels,
+    )
+    return choice
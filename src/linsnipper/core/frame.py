@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from PySide6.QtCore import QPoint, QRect, QRectF, QSize, Qt
+from PySide6.QtGui import QImage, QPainter
+
+
+@dataclass
+class ScreenTile:
+    """Captura de uma única tela, em pixels físicos."""
+
+    name: str
+    geometry: QRect  # coordenadas globais, em pixels lógicos
+    device_pixel_ratio: float
+    image: QImage
+
+    def source_rect(self, global_rect: QRect) -> QRectF:
+        """Converte um retângulo global (lógico) para pixels físicos do tile."""
+        local = global_rect.translated(-self.geometry.topLeft())
+        dpr = self.device_pixel_ratio
+        return QRectF(local.x() * dpr, local.y() * dpr, local.width() * dpr, local.height() * dpr)
+
+
+class VirtualDesktopFrame:
+    """
+    Quadro do desktop virtual guardado como um tile por tela.
+
+    Evita o pixmap monolítico do tamanho da união das telas: com monitores de
+    tamanhos diferentes ou desalinhados, boa parte dessa área é só preenchimento
+    preto. Recortes e pintura tocam apenas os tiles necessários; a imagem
+    "achatada" só é montada sob demanda (e fica em cache).
+
+    Coordenadas públicas (``crop``, ``tile_at``, ``tiles_in``) são relativas ao
+    canto superior esquerdo do desktop virtual, a mesma convenção de
+    ``BaseCaptureBackend.capture_fullscreen``/``capture_region``.
+
+    Por usar ``QImage``, o quadro pode ser lido e recortado fora da thread de GUI.
+    """
+
+    def __init__(self, tiles: Iterable[ScreenTile]):
+        self.tiles: List[ScreenTile] = [t for t in tiles if not t.image.isNull()]
+
+        geometry = QRect()
+        for tile in self.tiles:
+            geometry = geometry.united(tile.geometry)
+        self.geometry = geometry  # coordenadas globais
+
+        self._flattened: Optional[QImage] = None
+
+    @classmethod
+    def from_image(cls, image: QImage, name: str = "frame") -> "VirtualDesktopFrame":
+        """Embrulha uma imagem já composta como um quadro de tile único."""
+        return cls([ScreenTile(name, QRect(QPoint(0, 0), image.size()), 1.0, image)])
+
+    # ------------- Geometria -------------
+
+    def isNull(self) -> bool:
+        return not self.tiles
+
+    def size(self) -> QSize:
+        return self.geometry.size()
+
+    def rect(self) -> QRect:
+        return QRect(QPoint(0, 0), self.geometry.size())
+
+    def _to_global(self, rect: QRect) -> QRect:
+        return rect.translated(self.geometry.topLeft())
+
+    def tile_at(self, point: QPoint) -> Optional[ScreenTile]:
+        """Tile que contém o ponto, ou ``None`` se cair num buraco entre telas."""
+        global_point = point + self.geometry.topLeft()
+        for tile in self.tiles:
+            if tile.geometry.contains(global_point):
+                return tile
+        return None
+
+    def tiles_in(self, rect: QRect) -> List[ScreenTile]:
+        """Tiles que intersectam ``rect``."""
+        global_rect = self._to_global(rect)
+        return [t for t in self.tiles if t.geometry.intersects(global_rect)]
+
+    # ------------- Pixels -------------
+
+    def crop(self, rect: QRect) -> QImage:
+        """
+        Recorta ``rect`` (limitado ao quadro) em pixels lógicos, lendo apenas
+        os tiles que o intersectam. Retorna ``QImage()`` se não houver interseção.
+        """
+        bounded = rect.intersected(self.rect())
+        if bounded.isEmpty():
+            return QImage()
+
+        global_rect = self._to_global(bounded)
+        tiles = self.tiles_in(bounded)
+
+        # Caminho rápido: uma tela só, sem escala -> cópia direta do buffer
+        if (
+            len(tiles) == 1
+            and tiles[0].device_pixel_ratio == 1.0
+            and tiles[0].geometry.contains(global_rect)
+        ):
+            tile = tiles[0]
+            return tile.image.copy(global_rect.translated(-tile.geometry.topLeft()))
+
+        result = QImage(bounded.size(), QImage.Format_RGB32)
+        result.fill(Qt.black)  # Buracos entre telas
+        painter = QPainter(result)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        for tile in tiles:
+            part = global_rect.intersected(tile.geometry)
+            target = QRectF(part.translated(-global_rect.topLeft()))
+            painter.drawImage(target, tile.image, tile.source_rect(part))
+        painter.end()
+        return result
+
+    def flatten(self) -> QImage:
+        """Compõe todos os tiles numa única imagem (montada uma vez, sob demanda)."""
+        if self._flattened is None:
+            if self.isNull():
+                return QImage()
+            self._flattened = self.crop(self.rect())
+        return self._flattened
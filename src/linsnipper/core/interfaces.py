@@ -6,6 +6,8 @@ from typing import Optional
 from PySide6.QtCore import QRect
 from PySide6.QtGui import QPixmap
 
+from .frame import VirtualDesktopFrame
+
 
 class BaseCaptureBackend(ABC):
     """Interface para backends de captura de tela."""
@@ -16,10 +18,26 @@ class BaseCaptureBackend(ABC):
     def capture_fullscreen(self) -> QPixmap:
         """Captura todos os monitores disponíveis."""
 
+    def capture_frame(self) -> VirtualDesktopFrame:
+        """
+        Captura todos os monitores como um quadro com um tile por tela.
+
+        A implementação padrão embrulha ``capture_fullscreen`` num tile único;
+        backends que capturam tela a tela devem sobrescrever.
+        """
+        return VirtualDesktopFrame.from_image(self.capture_fullscreen().toImage(), self.name)
+
     @abstractmethod
     def capture_region(self, rect: QRect) -> QPixmap:
-        """Recorta região de uma captura (normalmente a partir de um fullscreen)."""
+        """Captura uma região em coordenadas relativas ao desktop virtual."""
 
     @abstractmethod
     def capture_window(self, window_id: Optional[int] = None) -> QPixmap:
         """Captura uma janela específica, se suportado."""
+
+    def close(self) -> None:
+        """
+        Libera conexões e buffers do backend. Padrão: nada a liberar.
+
+        O backend continua utilizável: a próxima captura reabre o que precisar.
+        """
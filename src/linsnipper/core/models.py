@@ -6,7 +6,7 @@ from typing import Optional
 from datetime import datetime
 
 from PySide6.QtCore import QRect
-from PySide6.QtGui import QPainterPath, QPixmap
+from PySide6.QtGui import QImage, QPainterPath, QPixmap
 
 
 class CaptureMode(Enum):
@@ -27,7 +27,27 @@ class CaptureRequest:
 
 @dataclass
 class CaptureResult:
-    pixmap: QPixmap
+    # ``None`` nos caminhos sem interface (API/headless), que só usam ``image``
+    pixmap: Optional[QPixmap]
     mode: CaptureMode
     created_at: datetime
     backend_name: str
+    # Mesmos pixels de ``pixmap``, utilizáveis fora da thread de GUI
+    image: Optional[QImage] = None
+
+    def _pixels_image(self) -> QImage:
+        if self.image is None:
+            self.image = self.pixmap.toImage()
+        return self.image
+
+    def buffer(self) -> memoryview:
+        """Bytes da imagem (linhas de ``bytesPerLine``), sem cópia; mantém a imagem viva."""
+        from .pixels import image_buffer
+
+        return image_buffer(self._pixels_image())
+
+    def to_numpy(self):
+        """View NumPy ``(altura, largura, 4)`` uint8 (BGRA no x86), sem cópia."""
+        from .pixels import image_array
+
+        return image_array(self._pixels_image())
@@ -0,0 +1,60 @@
+"""
+Acesso sem cópia aos pixels de um ``QImage`` (buffer protocol / NumPy).
+
+``QImage.constBits()`` devolve um ``memoryview`` que não segura o ``QImage``:
+se a imagem for coletada, a view aponta para memória liberada. Aqui a view é
+montada sobre um objeto ctypes que guarda uma referência à imagem, então
+``memoryview`` e arrays NumPy derivados a mantêm viva enquanto existirem.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import functools
+
+from PySide6.QtGui import QImage
+
+try:  # NumPy é opcional (extra "fast")
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+# Formatos com 4 bytes por pixel (inteiros 0xAARRGGBB: BGRA na memória no x86)
+_RGBA32_FORMATS = (QImage.Format_RGB32, QImage.Format_ARGB32, QImage.Format_ARGB32_Premultiplied)
+
+
+@functools.lru_cache(maxsize=64)
+def _holder_type(size: int) -> type:
+    # Subclasse para poder pendurar a referência ao QImage na instância
+    return type("ImagePixels", (ctypes.c_ubyte * size,), {})
+
+
+def image_buffer(image: QImage) -> memoryview:
+    """
+    ``memoryview`` somente leitura de todos os bytes de ``image``
+    (``height`` linhas de ``bytesPerLine``), sem cópia.
+
+    Usa ``QImage.bits()`` para obter o endereço: se os dados estiverem
+    compartilhados com outra cópia do ``QImage``, o Qt os separa antes (a view
+    então é da cópia exclusiva deste objeto, nunca de um vizinho).
+    """
+    if image.isNull():
+        raise ValueError("Imagem nula não tem pixels.")
+    size = image.sizeInBytes()
+    address = ctypes.addressof(ctypes.c_char.from_buffer(image.bits()))
+    holder = _holder_type(size).from_address(address)
+    holder.image = image
+    return memoryview(holder).toreadonly()
+
+
+def image_array(image: QImage) -> "np.ndarray":
+    """
+    View NumPy ``(height, width, 4)`` uint8 somente leitura sobre ``image``,
+    sem cópia. Imagens de 32 bits por pixel apenas (o padrão das capturas).
+    """
+    if np is None:
+        raise RuntimeError("NumPy não está instalado (extra 'fast').")
+    if image.format() not in _RGBA32_FORMATS:
+        raise ValueError(f"Formato sem 4 bytes por pixel: {image.format().name}")
+    rows = np.frombuffer(image_buffer(image), dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    return rows[:, : image.width() * 4].reshape(image.height(), image.width(), 4)
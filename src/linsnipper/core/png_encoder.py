@@ -0,0 +1,499 @@
+"""
+Codificador PNG paralelo para capturas muito grandes.
+
+A imagem é filtrada e comprimida em faixas de linhas, em paralelo, no estilo
+do pigz. Cada faixa vira um trecho de deflate "cru" com Z_SYNC_FLUSH no fim
+(Z_FINISH na última). A faixa usa os últimos 32 KiB da anterior como
+dicionário, então quase não perde compressão. Os trechos concatenados formam
+um único fluxo zlib válido; o adler32 é combinado a partir dos valores de cada
+faixa.
+
+Capturas de interface costumam ter poucas cores. ``choose_palette`` acha a
+paleta exata de imagens com até 256 cores, que viram PNG indexado (PLTE/tRNS):
+sem perdas e bem menores. Acima disso, o PNG continua truecolor. A decisão
+fica no log. ``indexed_image`` faz o mesmo para o codificador do Qt (também
+sem NumPy); quem decide usar paleta é ``export_service.encode_image``.
+
+Precisa de NumPy (extra opcional ``fast``); sem ele, ``is_available()`` é
+falso e quem chama deve usar o codificador do Qt.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+
+from .. import tracing
+from ..config import PngFilter
+
+try:  # NumPy é opcional (extra "fast")
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+logger = logging.getLogger(__name__)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_FILTER_TYPES = {"none": 0, "sub": 1, "up": 2, "avg": 3, "paeth": 4}
+_WINDOW = 32 * 1024
+_BAND_BYTES = 512 * 1024
+_ADLER_BASE = 65521
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+def chunk(kind: bytes, data: bytes) -> bytes:
+    """Monta um chunk PNG (tamanho, tipo, dados, CRC)."""
+    crc = zlib.crc32(data, zlib.crc32(kind))
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+
+def adler32_combine(adler1: int, adler2: int, len2: int) -> int:
+    """adler32(a + b) a partir de adler32(a), adler32(b) e len(b) (como no zlib)."""
+    rem = len2 % _ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = (rem * sum1) % _ADLER_BASE
+    sum1 += (adler2 & 0xFFFF) + _ADLER_BASE - 1
+    sum2 += (adler1 >> 16) + (adler2 >> 16) + _ADLER_BASE - rem
+    sum1 %= _ADLER_BASE
+    sum2 %= _ADLER_BASE
+    return (sum2 << 16) | sum1
+
+
+def _zlib_header(level: int) -> bytes:
+    flevel = 0 if level <= 1 else 1 if level <= 5 else 2 if level == 6 else 3
+    cmf = 0x78  # deflate, janela de 32 KiB
+    flg = flevel << 6
+    flg += 31 - ((cmf << 8) + flg) % 31
+    return bytes((cmf, flg))
+
+
+# ------------- Filtros (vetorizados por faixa) -------------
+
+
+def _filter_band(rows: "np.ndarray", prev: "np.ndarray", bpp: int, kind: str) -> "np.ndarray":
+    """
+    Aplica o filtro PNG ``kind`` a ``rows`` (altura x bytes por linha).
+
+    ``prev`` é a linha acima da primeira da faixa (zeros no topo da imagem).
+    Os filtros usam os bytes originais dos vizinhos, então todas as linhas são
+    filtradas de uma vez. Retorna as linhas com o byte do tipo de filtro na
+    frente.
+    """
+    raw = rows.astype(np.int16)
+    up = np.empty_like(raw)
+    up[0] = prev
+    up[1:] = raw[:-1]
+    left = np.zeros_like(raw)
+    left[:, bpp:] = raw[:, :-bpp]
+
+    if kind == "adaptive":
+        names = list(_FILTER_TYPES)
+        candidates = np.stack([_apply_filter(name, raw, left, up, bpp) for name in names])
+        # Heurística do libpng: menor soma dos resíduos vistos como bytes com sinal
+        residuals = candidates.astype(np.uint8).view(np.int8)
+        costs = np.abs(residuals, dtype=np.int16).sum(axis=2, dtype=np.int64)
+        best = costs.argmin(axis=0)
+        filtered = candidates[best, np.arange(raw.shape[0])]
+        types = best.astype(np.uint8)
+    else:
+        filtered = _apply_filter(kind, raw, left, up, bpp)
+        types = np.full(raw.shape[0], _FILTER_TYPES[kind], dtype=np.uint8)
+
+    out = np.empty((raw.shape[0], raw.shape[1] + 1), dtype=np.uint8)
+    out[:, 0] = types
+    out[:, 1:] = filtered  # int16 -> uint8 trunca: módulo 256, como o PNG pede
+    return out
+
+
+def _apply_filter(kind: str, raw, left, up, bpp: int):
+    if kind == "none":
+        return raw
+    if kind == "sub":
+        return raw - left
+    if kind == "up":
+        return raw - up
+    if kind == "avg":
+        return raw - ((left + up) >> 1)
+
+    # Paeth: entre esquerda, cima e diagonal, o mais próximo de esq + cima - diag
+    diag = np.zeros_like(raw)
+    diag[:, bpp:] = up[:, :-bpp]
+    p = left + up - diag
+    pa = np.abs(p - left)
+    pb = np.abs(p - up)
+    pc = np.abs(p - diag)
+    pred = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, diag))
+    return raw - pred
+
+
+# ------------- Paleta (PNG indexado) -------------
+
+MAX_PALETTE = 256
+_TRANSPARENT_KEY = 1 << 24  # todos os pixels com alfa 0 viram uma única entrada
+_EMPTY_SLOT = 0xFFFFFFFF  # nenhuma chave (RGB ou transparente) chega a esse valor
+_HASH_MULTIPLIERS = (0x9E3779B1, 0x85EBCA6B, 0xC2B2AE35, 0x27D4EB2F, 0x165667B1, 0xD3A2646D)
+_HASH_BITS = (16, 18, 20)
+_PALETTE_SAMPLES = 256 * 256
+_PALETTE_BAND_ROWS = 256
+
+
+@dataclass
+class Palette:
+    """Paleta RGBA (``colors``, N x 4) e índices por pixel (altura x largura)."""
+
+    colors: "np.ndarray"
+    indices: "np.ndarray"
+
+    @property
+    def bit_depth(self) -> int:
+        n = len(self.colors)
+        return 1 if n <= 2 else 2 if n <= 4 else 4 if n <= 16 else 8
+
+
+def _palette_keys(pixels: "np.ndarray", has_alpha: bool) -> "np.ndarray":
+    # ARGB32 não pré-multiplicado: 0xAARRGGBB; só alfa 0 ou 255 chegam aqui
+    keys = pixels & 0xFFFFFF
+    if has_alpha:
+        keys[(pixels >> 24) == 0] = _TRANSPARENT_KEY
+    return keys
+
+
+@dataclass
+class _KeyTable:
+    """
+    Hash perfeito das chaves da paleta: ``(chave * multiplicador) >> deslocamento``
+    indexa ``slot_keys``/``slot_index`` sem colisões entre as chaves conhecidas.
+
+    Com até 257 chaves, 2^16 posições quase sempre bastam (256 KiB, cabe no
+    cache), contra os 32 MiB de uma tabela indexada pelo RGB inteiro.
+    """
+
+    multiplier: "np.uint32"
+    shift: "np.uint32"
+    slot_keys: "np.ndarray"
+    slot_index: "np.ndarray"
+
+    @classmethod
+    def build(cls, keys: "np.ndarray") -> Optional["_KeyTable"]:
+        """Tabela para ``keys`` (índice = posição em ``keys``); ``None`` se nenhum hash servir."""
+        for bits in _HASH_BITS:
+            shift = np.uint32(32 - bits)
+            for multiplier in _HASH_MULTIPLIERS:
+                multiplier = np.uint32(multiplier)
+                slots = (keys * multiplier) >> shift
+                if len(np.unique(slots)) < len(keys):
+                    continue
+                slot_keys = np.full(1 << bits, _EMPTY_SLOT, dtype=np.uint32)
+                slot_index = np.zeros(1 << bits, dtype=np.uint8)
+                slot_keys[slots] = keys
+                slot_index[slots] = np.arange(len(keys))
+                return cls(multiplier, shift, slot_keys, slot_index)
+        logger.debug("Paleta descartada: sem hash sem colisões para %d cores.", len(keys))
+        return None
+
+    def lookup(self, band: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """Índices de ``band`` e máscara das chaves que não estão na tabela."""
+        slots = (band * self.multiplier) >> self.shift
+        return self.slot_index[slots], self.slot_keys[slots] != band
+
+
+def find_palette(image: QImage, max_colors: int = MAX_PALETTE) -> Optional[Palette]:
+    """
+    Paleta exata de ``image`` ou ``None`` se ela tiver mais de ``max_colors`` cores.
+
+    Primeiro conta as cores de uma amostra (saída rápida para fotos). Depois
+    mapeia cada faixa de linhas por um hash pequeno das cores já conhecidas,
+    parando assim que passar de ``max_colors``. Pixels totalmente transparentes contam como uma cor só; alfa parcial
+    (bordas suavizadas) não cabe nessa representação e devolve ``None``.
+    """
+    argb = image
+    if image.format() not in (QImage.Format_RGB32, QImage.Format_ARGB32):
+        argb = image.convertToFormat(QImage.Format_ARGB32)  # RGB32 já tem alfa 0xFF
+    buf = np.frombuffer(argb.constBits(), dtype=np.uint32, count=argb.sizeInBytes() // 4)
+    pixels = buf.reshape(argb.height(), argb.bytesPerLine() // 4)[:, : argb.width()]
+    height, width = pixels.shape
+
+    has_alpha = image.hasAlphaChannel()
+    if has_alpha:
+        alpha = pixels >> 24
+        if ((alpha != 0) & (alpha != 255)).any():
+            logger.debug("Paleta descartada: imagem com alfa parcial.")
+            return None
+
+    stride = max(1, int((height * width / _PALETTE_SAMPLES) ** 0.5))
+    keys = np.unique(_palette_keys(pixels[::stride, ::stride], has_alpha))
+    if len(keys) > max_colors:
+        return None
+
+    table = _KeyTable.build(keys)
+    if table is None:
+        return None
+    indices = np.empty((height, width), dtype=np.uint8)
+
+    for start in range(0, height, _PALETTE_BAND_ROWS):
+        band = _palette_keys(pixels[start : start + _PALETTE_BAND_ROWS], has_alpha)
+        found, missing = table.lookup(band)
+        if missing.any():
+            extra = np.unique(band[missing])
+            if len(keys) + len(extra) > max_colors:
+                return None
+            keys = np.concatenate([keys, extra])
+            table = _KeyTable.build(keys)
+            if table is None:
+                return None
+            found, _ = table.lookup(band)
+        indices[start : start + _PALETTE_BAND_ROWS] = found
+
+    colors = np.empty((len(keys), 4), dtype=np.uint8)
+    colors[:, 0] = (keys >> 16) & 0xFF
+    colors[:, 1] = (keys >> 8) & 0xFF
+    colors[:, 2] = keys & 0xFF
+    colors[:, 3] = 255
+    transparent = keys == _TRANSPARENT_KEY
+    colors[transparent] = 0
+    return Palette(colors, indices)
+
+
+def choose_palette(image: QImage) -> Optional[Palette]:
+    """``find_palette`` com trace e a decisão (indexado ou truecolor) no log."""
+    with tracing.span("png.palette"):
+        palette = find_palette(image)
+    if palette is None:
+        logger.info("PNG truecolor: mais de %d cores (ou alfa parcial).", MAX_PALETTE)
+    else:
+        logger.info("PNG indexado: %d cores, %d bits por pixel.", len(palette.colors), palette.bit_depth)
+    return palette
+
+
+def indexed_image(image: QImage) -> Optional[QImage]:
+    """
+    Cópia ``Format_Indexed8`` exata de ``image`` para o ``QImageWriter``, ou
+    ``None`` se ela não couber em 256 cores.
+
+    Com NumPy, converte pela tabela de cores de ``find_palette``. Sem ele, o
+    Qt monta a paleta e a conversão de volta confere se nenhum pixel mudou;
+    o Qt só monta paleta exata de imagem opaca, então alfa real fica truecolor.
+    """
+    if np is not None:
+        palette = choose_palette(image)
+        if palette is None:
+            return None
+        c = palette.colors.astype(np.uint32)
+        table = ((c[:, 3] << 24) | (c[:, 0] << 16) | (c[:, 1] << 8) | c[:, 2]).tolist()
+        return image.convertToFormat(QImage.Format_Indexed8, table)
+
+    with tracing.span("png.palette"):
+        source = image.convertToFormat(QImage.Format_RGB32)
+        indexed = source.convertToFormat(QImage.Format_Indexed8, Qt.ThresholdDither | Qt.AvoidDither)
+        exact = indexed.convertToFormat(image.format()) == image
+    if not exact:
+        logger.info("PNG truecolor: mais de %d cores (ou alfa parcial).", MAX_PALETTE)
+        return None
+    logger.info("PNG indexado: %d cores.", indexed.colorCount())
+    return indexed
+
+
+def _pack_indices(indices: "np.ndarray", bit_depth: int) -> "np.ndarray":
+    """Empacota índices em ``bit_depth`` bits por pixel (bit mais alto primeiro)."""
+    if bit_depth == 8:
+        return indices
+    per_byte = 8 // bit_depth
+    height, width = indices.shape
+    padded = np.zeros((height, -(-width // per_byte) * per_byte), dtype=np.uint8)
+    padded[:, :width] = indices
+    groups = padded.reshape(height, -1, per_byte)
+    packed = np.zeros(groups.shape[:2], dtype=np.uint8)
+    for k in range(per_byte):
+        packed |= groups[:, :, k] << (8 - bit_depth * (k + 1))
+    return packed
+
+
+def _palette_chunks(colors: "np.ndarray") -> List[bytes]:
+    chunks = [chunk(b"PLTE", colors[:, :3].tobytes())]
+    alpha = colors[:, 3]
+    translucent = np.flatnonzero(alpha != 255)
+    if translucent.size:
+        chunks.append(chunk(b"tRNS", alpha[: translucent[-1] + 1].tobytes()))
+    return chunks
+
+
+# ------------- Codificador -------------
+
+
+@dataclass
+class _Band:
+    data: bytes
+    adler: int
+    length: int
+
+
+class ParallelPngEncoder:
+    """
+    Codifica ``QImage`` em PNG usando vários núcleos.
+
+    ``level`` é o nível do zlib (0-9) e ``filter`` a estratégia de filtro.
+    ``"adaptive"`` escolhe o melhor filtro por linha, como o libpng; o padrão
+    ``"up"`` fica a ~1% do tamanho dele com metade do tempo em capturas de
+    desktop (ver ``scripts/bench_png_encoder.py``). ``workers=None`` usa todos
+    os núcleos. ``encode(image, palette)`` grava PNG indexado com a paleta de
+    ``choose_palette``.
+    """
+
+    def __init__(
+        self,
+        level: int = 6,
+        filter: PngFilter = "up",
+        workers: Optional[int] = None,
+    ):
+        if np is None:
+            raise RuntimeError("ParallelPngEncoder requer NumPy (pip install linsnipper[fast]).")
+        if not 0 <= level <= 9:
+            raise ValueError(f"Nível de compressão inválido: {level}")
+        if filter != "adaptive" and filter not in _FILTER_TYPES:
+            raise ValueError(f"Filtro PNG desconhecido: {filter}")
+        self.level = level
+        self.filter = filter
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="linsnipper-png")
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    @staticmethod
+    def _pixels(image: QImage) -> Tuple["np.ndarray", int, int, QImage]:
+        """
+        Linhas da imagem em RGB (tipo 2) ou RGBA (tipo 6), sem padding.
+
+        A matriz aponta para o buffer do ``QImage`` convertido, que também é
+        devolvido: quem chama deve mantê-lo vivo enquanto usa a matriz.
+        """
+        if image.hasAlphaChannel():
+            image = image.convertToFormat(QImage.Format_RGBA8888)
+            bpp, color_type = 4, 6
+        else:
+            image = image.convertToFormat(QImage.Format_RGB888)
+            bpp, color_type = 3, 2
+        buf = np.frombuffer(image.constBits(), dtype=np.uint8, count=image.sizeInBytes())
+        rows = buf.reshape(image.height(), image.bytesPerLine())[:, : image.width() * bpp]
+        return rows, bpp, color_type, image
+
+    def _band_rows(self, height: int, row_bytes: int) -> int:
+        by_size = max(1, _BAND_BYTES // max(row_bytes, 1))
+        by_workers = -(-height // (self.workers * 4))  # ao menos ~4 faixas por núcleo
+        return max(1, min(by_size, by_workers))
+
+    @staticmethod
+    def _filtered(rows, start: int, stop: int, bpp: int, kind: str) -> bytes:
+        """Linhas ``start:stop`` filtradas (a linha ``start - 1`` é o "cima")."""
+        prev = rows[start - 1] if start else np.zeros(rows.shape[1], dtype=np.uint8)
+        return _filter_band(rows[start:stop], prev, bpp, kind).tobytes()
+
+    def _compress_band(self, rows, start: int, stop: int, bpp: int, kind: str) -> _Band:
+        filtered = self._filtered(rows, start, stop, bpp, kind)
+        last = stop >= rows.shape[0]
+
+        if start:
+            # Dicionário: últimos 32 KiB filtrados antes da faixa, como no pigz
+            tail = max(0, start - -(-_WINDOW // (rows.shape[1] + 1)))
+            dictionary = self._filtered(rows, tail, start, bpp, kind)[-_WINDOW:]
+            comp = zlib.compressobj(self.level, zlib.DEFLATED, -15, 9, zlib.Z_DEFAULT_STRATEGY, dictionary)
+        else:
+            comp = zlib.compressobj(self.level, zlib.DEFLATED, -15, 9)
+        data = comp.compress(filtered) + comp.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+        return _Band(data, zlib.adler32(filtered), len(filtered))
+
+    def encode(self, image: QImage, palette: Optional[Palette] = None) -> bytes:
+        """
+        Codifica ``image`` num PNG completo: indexado com ``palette`` (de
+        ``choose_palette``), senão RGB ou RGBA de 8 bits.
+        """
+        if image.isNull():
+            raise ValueError("Imagem vazia.")
+
+        with tracing.span("png.encode", level=self.level, filter=self.filter) as span:
+            if palette is not None:
+                # Filtros não ajudam em índices de paleta (recomendação da spec)
+                rows, bpp, kind = _pack_indices(palette.indices, palette.bit_depth), 1, "none"
+                header = (palette.bit_depth, 3)
+                extra = _palette_chunks(palette.colors)
+            else:
+                rows, bpp, color_type, _converted = self._pixels(image)
+                kind = self.filter
+                header = (8, color_type)
+                extra = []
+            span.set(indexed=palette is not None)
+
+            ihdr = struct.pack(">IIBBBBB", image.width(), image.height(), *header, 0, 0, 0)
+            parts = [PNG_SIGNATURE, chunk(b"IHDR", ihdr), *extra]
+            parts.extend(self._idat_chunks(rows, bpp, kind))
+            parts.append(chunk(b"IEND", b""))
+
+        return b"".join(parts)
+
+    def _idat_chunks(self, rows, bpp: int, kind: str) -> List[bytes]:
+        """Um IDAT por faixa (comprimidas em paralelo) + um IDAT com o adler32."""
+        height, row_bytes = rows.shape
+        step = self._band_rows(height, row_bytes)
+        futures = [
+            self._pool().submit(self._compress_band, rows, start, min(start + step, height), bpp, kind)
+            for start in range(0, height, step)
+        ]
+        bands: List[_Band] = [f.result() for f in futures]
+
+        adler = 1
+        for band in bands:
+            adler = adler32_combine(adler, band.adler, band.length)
+
+        logger.debug(
+            "PNG paralelo: %d faixas de %d linhas, nível %d, filtro %s.",
+            len(bands),
+            step,
+            self.level,
+            kind,
+        )
+        chunks = [chunk(b"IDAT", _zlib_header(self.level) + bands[0].data)]
+        chunks.extend(chunk(b"IDAT", band.data) for band in bands[1:])
+        chunks.append(chunk(b"IDAT", struct.pack(">I", adler)))
+        return chunks
+
+
+def create_png_encoder(
+    engine: str = "parallel",
+    level: int = 6,
+    filter: PngFilter = "up",
+) -> Optional[ParallelPngEncoder]:
+    """
+    Codificador conforme a configuração; ``None`` significa "use o do Qt".
+
+    ``engine="parallel"`` sem NumPy instalado cai para o Qt, com aviso no log.
+    A paleta (``AppConfig.png_palette``) vale para os dois e é passada a
+    ``encode_image``.
+    """
+    if engine != "parallel":
+        return None
+    if np is None:
+        logger.warning("NumPy indisponível; PNG será codificado pelo Qt (single-core).")
+        return None
+    try:
+        return ParallelPngEncoder(level=level, filter=filter)
+    except ValueError as exc:
+        logger.warning("Configuração de PNG inválida (%s); usando padrões.", exc)
+        return ParallelPngEncoder()
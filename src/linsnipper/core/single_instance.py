@@ -1,19 +1,119 @@
-import sys
+import itertools
+import logging
+import os
+import socket as pysocket
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
 from PySide6.QtNetwork import QLocalServer, QLocalSocket
-from PySide6.QtCore import QObject, Signal, QIODevice
+from PySide6.QtCore import QObject, QSocketNotifier, Signal
+
+from ..errors import IpcError
+from ..ipc_client import SERVER_NAME, send_message
+from ..ipc_protocol import FrameDecoder, Message, encode_reply, parse_legacy, parse_request
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingSend:
+    """Resposta na fila de uma conexão; ``fds`` são cópias (``os.dup``) nossas."""
+
+    data: bytes
+    fds: List[int] = field(default_factory=list)
+    sent: int = 0
+
+    def close_fds(self) -> None:
+        while self.fds:
+            os.close(self.fds.pop())
+
+
+class _FdOutbox:
+    """
+    Fila de respostas com descritores de uma conexão.
+
+    Escreve no fd nativo (cópia por ``os.dup``, não bloqueante como o do Qt) e,
+    se o buffer do kernel encher, espera por um ``QSocketNotifier`` de escrita
+    em vez de bloquear a thread de GUI.
+    """
+
+    def __init__(self, descriptor: int):
+        self.queue: Deque[_PendingSend] = deque()
+        self.native = pysocket.socket(pysocket.AF_UNIX, pysocket.SOCK_STREAM, fileno=os.dup(descriptor))
+        self.notifier = QSocketNotifier(self.native.fileno(), QSocketNotifier.Write)
+        self.notifier.setEnabled(False)
+
+    def send_pending(self) -> bool:
+        """Manda o que o kernel aceitar; ``True`` quando a fila esvazia."""
+        while self.queue:
+            item = self.queue[0]
+            view = memoryview(item.data)[item.sent:]
+            # SCM_RIGHTS vai só com o primeiro pedaço; o resto é fluxo normal
+            ancdata = []
+            if item.sent == 0 and item.fds:
+                ancdata = [(pysocket.SOL_SOCKET, pysocket.SCM_RIGHTS, array("i", item.fds))]
+            try:
+                item.sent += self.native.sendmsg([view], ancdata)
+            except BlockingIOError:
+                self.notifier.setEnabled(True)
+                return False
+            if item.sent < len(item.data):
+                continue
+            item.close_fds()
+            self.queue.popleft()
+        self.notifier.setEnabled(False)
+        return True
+
+    def close(self) -> None:
+        self.notifier.setEnabled(False)
+        self.notifier.deleteLater()
+        while self.queue:
+            self.queue.popleft().close_fds()
+        self.native.close()
+
+
+@dataclass
+class IpcRequest:
+    """Pedido recebido pelo servidor; responda com ``SingleInstance.reply``."""
+
+    message: Message
+    connection: int
+
+    @property
+    def cmd(self) -> str:
+        return self.message.cmd
+
+    @property
+    def args(self) -> Dict[str, Any]:
+        return self.message.args
+
+    @property
+    def wants_reply(self) -> bool:
+        return self.message.id is not None
+
 
 class SingleInstance(QObject):
     """
     Manages single instance behavior.
     - server_name: Unique identifier for the local socket.
+
+    Fala o protocolo de ``linsnipper.ipc_protocol`` (quadros com tamanho,
+    vários pedidos por conexão) e aceita o texto puro antigo. Tudo roda na
+    thread de GUI, mas só por eventos (``readyRead``, ``bytesWritten``):
+    nenhuma leitura ou escrita bloqueia. Cada pedido vira ``request_received(IpcRequest)``.
     """
-    message_received = Signal(str)
+    request_received = Signal(object)
 
-    def __init__(self, server_name="linsnipper_ipc"):
+    def __init__(self, server_name=SERVER_NAME):
         super().__init__()
         self.server_name = server_name
         self.server = QLocalServer(self)
         self.server.newConnection.connect(self._handle_new_connection)
+        self._ids = itertools.count(1)
+        self._connections: Dict[int, Tuple[QLocalSocket, FrameDecoder]] = {}
+        self._outboxes: Dict[int, _FdOutbox] = {}
 
     def start(self):
         """
@@ -27,27 +127,145 @@ class SingleInstance(QObject):
             return False
         return True
 
+    def reply(
+        self,
+        request: IpcRequest,
+        result: Any = None,
+        error: Optional[str] = None,
+        fds: Sequence[int] = (),
+    ) -> None:
+        """
+        Responde ``request`` (se ele tem ``id`` e a conexão ainda existe).
+
+        ``fds`` vão para o cliente via ``SCM_RIGHTS`` junto da resposta; quem
+        chama continua dono deles (pode fechá-los logo depois). Não bloqueia:
+        se o cliente demora a ler, a resposta espera na fila da conexão.
+        """
+        if not request.wants_reply:
+            return
+        entry = self._connections.get(request.connection)
+        if entry is None:
+            logger.debug("Conexão IPC %d fechou antes da resposta a %r.", request.connection, request.cmd)
+            return
+        socket = entry[0]
+        data = encode_reply(request.message.id, result, error, fds=len(fds))
+        if request.connection not in self._outboxes and (error is not None or not fds):
+            socket.write(data)
+            socket.flush()
+            return
+        # Com descritores (ou atrás de uma resposta que os leva) a ordem do fluxo
+        # passa pela fila da conexão, sem esperar o cliente na thread de GUI
+        item = _PendingSend(data)
+        if error is None:
+            try:
+                for fd in fds:
+                    item.fds.append(os.dup(fd))
+            except OSError:
+                item.close_fds()
+                raise
+        outbox = self._outboxes.get(request.connection)
+        if outbox is None:
+            outbox = self._outboxes[request.connection] = _FdOutbox(socket.socketDescriptor())
+            outbox.notifier.setProperty("ipc_connection", request.connection)
+            outbox.notifier.activated.connect(self._on_outbox_writable)
+        outbox.queue.append(item)
+        self._flush_outbox(request.connection)
+
+    def _flush_outbox(self, connection: int) -> None:
+        entry = self._connections.get(connection)
+        outbox = self._outboxes.get(connection)
+        if entry is None or outbox is None:
+            return
+        socket = entry[0]
+        # O QLocalSocket não sabe mandar descritores: o fd nativo só é usado
+        # depois que o buffer do Qt esvazia (``bytesWritten`` chama de novo)
+        socket.flush()
+        if socket.bytesToWrite():
+            return
+        try:
+            done = outbox.send_pending()
+        except OSError as exc:
+            logger.warning("Falha ao enviar resposta com descritores pela conexão IPC %d: %s", connection, exc)
+            done = True
+            socket.disconnectFromServer()
+        if done and connection in self._outboxes:
+            self._outboxes.pop(connection).close()
+
     def _handle_new_connection(self):
-        socket = self.server.nextPendingConnection()
-        socket.readyRead.connect(lambda: self._read_socket(socket))
-        socket.disconnected.connect(socket.deleteLater)
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            connection = next(self._ids)
+            socket.setProperty("ipc_connection", connection)
+            self._connections[connection] = (socket, FrameDecoder())
+            # Slots sem lambda: um closure segurando o wrapper do socket
+            # sobrevivia ao deleteLater e derrubava o processo
+            socket.readyRead.connect(self._on_ready_read)
+            socket.bytesWritten.connect(self._on_bytes_written)
+            socket.disconnected.connect(self._on_disconnected)
+
+    def _connection_of(self, socket) -> int:
+        return socket.property("ipc_connection")
+
+    def _on_ready_read(self):
+        socket = self.sender()
+        self._read_socket(socket, self._connection_of(socket))
+
+    def _on_outbox_writable(self):
+        self._flush_outbox(self._connection_of(self.sender()))
+
+    def _on_bytes_written(self, _count: int):
+        connection = self._connection_of(self.sender())
+        if connection in self._outboxes:
+            self._flush_outbox(connection)
+
+    def _read_socket(self, socket, connection: int):
+        _, decoder = self._connections[connection]
+        try:
+            payloads = decoder.feed(socket.readAll().data())
+        except IpcError as exc:
+            logger.warning("Conexão IPC %d encerrada: %s", connection, exc)
+            socket.write(encode_reply(0, error=str(exc)))
+            socket.disconnectFromServer()
+            return
+
+        for payload in payloads:
+            try:
+                message = parse_request(payload)
+            except IpcError as exc:
+                request_id = payload.get("id")
+                if isinstance(request_id, int):
+                    socket.write(encode_reply(request_id, error=str(exc)))
+                continue
+            self.request_received.emit(IpcRequest(message, connection))
+
+    def _on_disconnected(self):
+        socket = self.sender()
+        connection = self._connection_of(socket)
+        if connection in self._connections and socket.bytesAvailable():
+            self._read_socket(socket, connection)
+        entry = self._connections.pop(connection, None)
+        outbox = self._outboxes.pop(connection, None)
+        if outbox is not None:
+            outbox.close()
+        socket.deleteLater()
+        if entry is None:
+            return
+        text = entry[1].finish()
+        if text is None:
+            return
+        message = parse_legacy(text)
+        if message is None:
+            logger.warning("Mensagem IPC antiga desconhecida: %r", text)
+            return
+        self.request_received.emit(IpcRequest(message, connection))
 
-    def _read_socket(self, socket):
-        # Read available data
-        data = socket.readAll().data().decode('utf-8')
-        self.message_received.emit(data)
 
 def send_message_to_instance(server_name, message):
     """
     Tries to connect to an existing instance and send a message.
     Returns True if successful (meaning an instance is running), False otherwise.
+
+    Implementado em ``linsnipper.ipc_client`` (sem Qt), para que o caminho do
+    atalho possa usá-lo antes de importar qualquer módulo do PySide6.
     """
-    socket = QLocalSocket()
-    socket.connectToServer(server_name)
-    if socket.waitForConnected(1000):
-        socket.write(message.encode('utf-8'))
-        socket.flush()
-        socket.waitForBytesWritten(1000)
-        socket.disconnectFromServer()
-        return True
-    return False
+    return send_message(server_name, message)
@@ -0,0 +1,64 @@
+"""
+Suavização de traços: filtro "1€" (one-euro, Casiez et al., CHI 2012).
+
+Passa-baixa com corte adaptativo: em movimento lento corta forte (some o
+tremido da mão/sensor); em movimento rápido o corte sobe e o traço não fica
+para trás. Só biblioteca padrão.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional, Tuple
+
+
+def _alpha(cutoff: float, dt: float) -> float:
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class _Axis:
+    def __init__(self):
+        self.value: Optional[float] = None
+        self.derivative = 0.0
+
+    def filter(self, x: float, dt: float, min_cutoff: float, beta: float, d_cutoff: float) -> float:
+        if self.value is None:
+            self.value = x
+            return x
+        a_d = _alpha(d_cutoff, dt)
+        self.derivative = a_d * (x - self.value) / dt + (1 - a_d) * self.derivative
+        cutoff = min_cutoff + beta * abs(self.derivative)
+        a = _alpha(cutoff, dt)
+        self.value = a * x + (1 - a) * self.value
+        return self.value
+
+
+class OneEuroFilter:
+    """
+    Filtro 1€ para pontos 2D com carimbo de tempo em segundos.
+
+    ``min_cutoff`` (Hz) controla o tremido em baixa velocidade; ``beta``, o
+    atraso em alta velocidade (pixels/s). Os padrões foram ajustados para
+    coordenadas em pixels de mouse e mesa digitalizadora.
+    """
+
+    def __init__(self, min_cutoff: float = 1.5, beta: float = 0.01, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self) -> None:
+        self._x = _Axis()
+        self._y = _Axis()
+        self._last_t: Optional[float] = None
+
+    def __call__(self, t: float, x: float, y: float) -> Tuple[float, float]:
+        # Eventos com o mesmo carimbo (ou fora de ordem) não podem zerar dt
+        dt = 1e-3 if self._last_t is None or t <= self._last_t else t - self._last_t
+        self._last_t = t if self._last_t is None else max(t, self._last_t)
+        return (
+            self._x.filter(x, dt, self.min_cutoff, self.beta, self.d_cutoff),
+            self._y.filter(y, dt, self.min_cutoff, self.beta, self.d_cutoff),
+        )
@@ -0,0 +1,250 @@
+"""
+Desfazer por deltas de tiles para camadas raster.
+
+Em vez de copiar a camada inteira a cada traço (33 MB numa captura 4K), cada
+passo guarda só os tiles de 64x64 que o traço realmente alterou. O conteúdo
+"antes" de um tile é lido na primeira vez que o traço o toca (``touch``); ao
+fechar o passo (``end_step``), tiles que terminaram iguais são descartados.
+
+Desfazer troca os bytes do passo com o conteúdo atual da camada, então o mesmo
+delta serve para refazer (uma cópia por passo, não duas).
+
+Memória: o limite é em bytes (``budget_bytes``), não em número de passos.
+Os ``hot_steps`` passos mais recentes ficam crus (desfazer imediato); os mais
+antigos são comprimidos com zlib; se ainda assim o total residente passar do
+orçamento, os mais antigos vão para um arquivo temporário. Nenhum passo é
+perdido: o arquivo só é descartado em ``clear()``.
+"""
+
+from __future__ import annotations
+
+import tempfile
+import zlib
+from dataclasses import dataclass
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from PySide6.QtCore import QRect, QRectF
+from PySide6.QtGui import QImage, QPainter, QPixmap
+
+TILE_SIZE = 64
+DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+DEFAULT_HOT_STEPS = 8
+_COMPRESSION_LEVEL = 1  # deltas de anotação são quase todos transparentes
+
+Layer = Union[QImage, QPixmap]
+_Rect = Tuple[int, int, int, int]
+
+
+@dataclass
+class _Delta:
+    """Tiles de um passo: ``rects`` na ordem em que os bytes estão em ``blob``."""
+
+    rects: List[_Rect]
+    blob: Optional[bytes]
+    key: Any = None  # dono do passo (ex.: o traço), conferido ao desfazer/refazer
+    compressed: bool = False
+    spill: Optional[Tuple[int, int]] = None  # (offset, tamanho) no arquivo temporário
+
+    @property
+    def resident(self) -> int:
+        return len(self.blob) if self.blob is not None else 0
+
+
+def _read_tile(layer: Layer, rect: _Rect) -> bytes:
+    tile = layer.copy(QRect(*rect))
+    if isinstance(tile, QPixmap):
+        tile = tile.toImage()
+    if tile.format() != QImage.Format_ARGB32_Premultiplied:
+        tile = tile.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    return bytes(tile.constBits())
+
+
+class TileUndoStack:
+    """
+    Histórico de passos de edição sobre uma camada raster (``QImage`` ou ``QPixmap``).
+
+    Uso por traço::
+
+        history.begin_step()
+        history.touch(layer, rect)   # antes de pintar em ``rect``
+        ...
+        history.end_step(layer)
+
+    ``undo(layer)``/``redo(layer)`` aplicam o passo na camada e devolvem
+    ``False`` se não havia o que desfazer/refazer. Com ``key`` (o mesmo dado a
+    ``end_step``), só aplicam o passo daquele dono: um delta nunca é aplicado
+    no lugar de outro.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = DEFAULT_BUDGET_BYTES,
+        hot_steps: int = DEFAULT_HOT_STEPS,
+        tile_size: int = TILE_SIZE,
+    ):
+        self.budget_bytes = budget_bytes
+        self.hot_steps = hot_steps
+        self.tile_size = tile_size
+        self._undo: List[_Delta] = []
+        self._redo: List[_Delta] = []
+        self._pending: Optional[Dict[Tuple[int, int], Tuple[_Rect, bytes]]] = None
+        self._spill_file: Optional[IO[bytes]] = None
+        self._spill_end = 0
+
+    # ------------- Gravação -------------
+
+    def begin_step(self) -> None:
+        self._pending = {}
+
+    def touch(self, layer: Layer, rect: Union[QRect, QRectF]) -> None:
+        """Guarda o conteúdo atual dos tiles de ``rect`` ainda não vistos neste passo."""
+        if self._pending is None:
+            return
+        for key, tile_rect in self._tiles(layer, rect):
+            if key not in self._pending:
+                self._pending[key] = (tile_rect, _read_tile(layer, tile_rect))
+
+    def end_step(self, layer: Layer, key: Any = None) -> int:
+        """
+        Fecha o passo e devolve quantos tiles mudaram.
+
+        Um passo sem mudanças também é empilhado, para o histórico andar junto
+        com quem o usa (ex.: um traço de borracha sobre área vazia).
+        """
+        pending, self._pending = self._pending or {}, None
+        rects: List[_Rect] = []
+        chunks: List[bytes] = []
+        for tile_rect, before in pending.values():
+            if _read_tile(layer, tile_rect) != before:
+                rects.append(tile_rect)
+                chunks.append(before)
+        self._undo.append(_Delta(rects, b"".join(chunks), key))
+        # O espaço de passos descartados no arquivo temporário só volta em ``clear()``
+        self._redo.clear()
+        self._enforce_budget()
+        return len(rects)
+
+    @property
+    def recording(self) -> bool:
+        return self._pending is not None
+
+    # ------------- Desfazer/refazer -------------
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self, layer: Layer, key: Any = None) -> bool:
+        if not self._undo or self.recording or (key is not None and self._undo[-1].key is not key):
+            return False
+        self._redo.append(self._swap(layer, self._undo.pop()))
+        self._enforce_budget()
+        return True
+
+    def redo(self, layer: Layer, key: Any = None) -> bool:
+        if not self._redo or self.recording or (key is not None and self._redo[-1].key is not key):
+            return False
+        self._undo.append(self._swap(layer, self._redo.pop()))
+        self._enforce_budget()
+        return True
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._pending = None
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        self._spill_end = 0
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    # ------------- Memória -------------
+
+    @property
+    def resident_bytes(self) -> int:
+        """Bytes dos deltas em memória (crus ou comprimidos)."""
+        return sum(delta.resident for delta in self._undo + self._redo)
+
+    @property
+    def spilled_bytes(self) -> int:
+        """Bytes gravados no arquivo temporário (inclui passos já descartados)."""
+        return self._spill_end
+
+    def _enforce_budget(self) -> None:
+        # Passos antigos: comprimidos; os ``hot_steps`` mais recentes ficam crus
+        for delta in self._undo[: max(len(self._undo) - self.hot_steps, 0)]:
+            self._compress(delta)
+        for delta in self._redo[: max(len(self._redo) - self.hot_steps, 0)]:
+            self._compress(delta)
+
+        total = self.resident_bytes
+        if total <= self.budget_bytes:
+            return
+        # Mais antigos primeiro: base da pilha de desfazer, depois a de refazer
+        for delta in self._undo + self._redo:
+            if delta.blob is None:
+                continue
+            before = delta.resident
+            self._spill(delta)
+            total -= before
+            if total <= self.budget_bytes:
+                break
+
+    def _compress(self, delta: _Delta) -> None:
+        if delta.blob is not None and not delta.compressed:
+            delta.blob = zlib.compress(delta.blob, _COMPRESSION_LEVEL)
+            delta.compressed = True
+
+    def _spill(self, delta: _Delta) -> None:
+        self._compress(delta)
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix="linsnipper-undo-")
+        self._spill_file.seek(self._spill_end)
+        self._spill_file.write(delta.blob)
+        delta.spill = (self._spill_end, len(delta.blob))
+        self._spill_end += len(delta.blob)
+        delta.blob = None
+
+    def _load(self, delta: _Delta) -> bytes:
+        if delta.blob is None:
+            offset, size = delta.spill
+            self._spill_file.seek(offset)
+            data = self._spill_file.read(size)
+        else:
+            data = delta.blob
+        return zlib.decompress(data) if delta.compressed else data
+
+    # ------------- Tiles -------------
+
+    def _tiles(self, layer: Layer, rect: Union[QRect, QRectF]) -> Iterator[Tuple[Tuple[int, int], _Rect]]:
+        if isinstance(rect, QRectF):
+            rect = rect.toAlignedRect()
+        rect = rect.intersected(QRect(0, 0, layer.width(), layer.height()))
+        if rect.isEmpty():
+            return
+        size = self.tile_size
+        for ty in range(rect.top() // size, rect.bottom() // size + 1):
+            for tx in range(rect.left() // size, rect.right() // size + 1):
+                x, y = tx * size, ty * size
+                w = min(size, layer.width() - x)
+                h = min(size, layer.height() - y)
+                yield (tx, ty), (x, y, w, h)
+
+    def _swap(self, layer: Layer, delta: _Delta) -> _Delta:
+        """Aplica ``delta`` na camada e devolve o delta inverso (conteúdo substituído)."""
+        data = self._load(delta)
+        current = [_read_tile(layer, rect) for rect in delta.rects]
+        painter = QPainter(layer)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        offset = 0
+        for x, y, w, h in delta.rects:
+            size = w * h * 4
+            tile = QImage(data[offset : offset + size], w, h, w * 4, QImage.Format_ARGB32_Premultiplied)
+            painter.drawImage(x, y, tile)
+            offset += size
+        painter.end()
+        return _Delta(delta.rects, b"".join(current), delta.key)
@@ -8,3 +8,11 @@ class CaptureError(LinSnipperError):
 
 class ConfigError(LinSnipperError):
     """Problema ao carregar/salvar configuração."""
+
+
+class ExportError(LinSnipperError):
+    """Falha ao codificar ou gravar uma imagem."""
+
+
+class IpcError(LinSnipperError):
+    """Mensagem IPC malformada ou comunicação com a instância falhou."""
@@ -0,0 +1,138 @@
+"""
+Captura sem interface: ``linsnipper capture``.
+
+Só ``QGuiApplication`` (QtGui), sem QtWidgets, overlay ou editor: captura com
+o ``CaptureService``, codifica e grava no arquivo ou em stdout. Pensado para
+scripts que tiram muitas capturas seguidas.
+
+Exemplos::
+
+    linsnipper capture --mode fullscreen -o tela.png
+    linsnipper capture --mode region --geometry 0,0,800,600 -o - > regiao.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import BinaryIO, Optional, Sequence
+
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QGuiApplication, QImage
+
+from . import tracing
+from .config import AppConfig
+from .core.capture_service import CaptureService
+from .core.export_service import encode_image, write_atomic
+from .core.format_policy import FormatChoice, choose_format, format_from_suffix
+from .core.models import CaptureMode, CaptureRequest
+from .core.png_encoder import create_png_encoder
+from .errors import LinSnipperError
+from .infra.backends import create_capture_backend
+from .logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+STDOUT = "-"
+
+
+def ensure_gui_app() -> QGuiApplication:
+    """QGuiApplication existente ou uma nova (sem QtWidgets)."""
+    app = QGuiApplication.instance()
+    if app is None:
+        app = QGuiApplication(sys.argv[:1])
+        app.setApplicationName("LinSnipper")
+        app.setOrganizationName("LinSnipperProject")
+    return app
+
+
+def build_request(mode: str, geometry: Optional[Sequence[int]] = None, delay: int = 0) -> CaptureRequest:
+    """``"fullscreen"`` ou ``"region"`` + ``(x, y, w, h)`` -> ``CaptureRequest``."""
+    if mode == "region":
+        if geometry is None:
+            raise LinSnipperError("Captura de região exige a geometria (--geometry X,Y,W,H).")
+        try:
+            x, y, w, h = (int(value) for value in geometry)
+        except (TypeError, ValueError):
+            raise LinSnipperError(f"Geometria inválida: {geometry!r}") from None
+        if w <= 0 or h <= 0:
+            raise LinSnipperError(f"Geometria sem área: {geometry!r}")
+        return CaptureRequest(mode=CaptureMode.RECTANGLE, delay_seconds=delay, region=QRect(x, y, w, h))
+    if mode != "fullscreen":
+        raise LinSnipperError(f"Modo de captura headless desconhecido: {mode!r}")
+    return CaptureRequest(mode=CaptureMode.FULLSCREEN, delay_seconds=delay)
+
+
+def resolve_format(
+    image: QImage,
+    output: str,
+    fmt: Optional[str],
+    quality: Optional[int],
+    config: AppConfig,
+) -> FormatChoice:
+    """``--format`` > extensão do arquivo > ``AppConfig.output_format``."""
+    policy = fmt or (format_from_suffix(output) if output != STDOUT else None) or config.output_format
+    choice = choose_format(image, policy)
+    if quality is not None:
+        choice = FormatChoice(choice.format, quality, choice.reason)
+    return choice
+
+
+def capture_to(
+    service: CaptureService,
+    request: CaptureRequest,
+    output: str,
+    config: AppConfig,
+    fmt: Optional[str] = None,
+    quality: Optional[int] = None,
+    stdout: Optional[BinaryIO] = None,
+) -> FormatChoice:
+    """Captura, codifica e grava em ``output`` (``"-"`` = stdout)."""
+    image = service.capture_image(request)
+    choice = resolve_format(image, output, fmt, quality, config)
+    png_encoder = create_png_encoder(config.png_encoder, config.png_compression_level, config.png_filter)
+    try:
+        data = encode_image(image, choice.format, choice.quality, png_encoder, config.png_palette)
+    finally:
+        if png_encoder is not None:
+            png_encoder.shutdown()
+
+    with tracing.span("headless.write", bytes=len(data), stdout=output == STDOUT):
+        if output == STDOUT:
+            stream = stdout or sys.stdout.buffer
+            stream.write(data)
+            stream.flush()
+        else:
+            write_atomic(Path(output), data)
+    logger.info(
+        "Captura headless: %dx%d, %s, %d bytes -> %s",
+        image.width(),
+        image.height(),
+        choice.format,
+        len(data),
+        output,
+    )
+    return choice
+
+
+def run_capture(args: argparse.Namespace) -> int:
+    """Entrada de ``linsnipper capture``; devolve o código de saída."""
+    config = AppConfig.load()
+    setup_logging(config, log_to_console=args.log_console)
+    tracing.configure(config.tracing)
+
+    ensure_gui_app()
+    try:
+        request = build_request(args.mode, args.geometry)
+        backend = create_capture_backend(args.backend or config.capture_backend)
+        if args.delay > 0:
+            time.sleep(args.delay)
+        capture_to(CaptureService(backend), request, args.output, config, args.format, args.quality)
+    except (LinSnipperError, OSError) as exc:
+        logger.error("Captura headless falhou: %s", exc)
+        print(f"linsnipper capture: {exc}", file=sys.stderr)
+        return 1
+    return 0
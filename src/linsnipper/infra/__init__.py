@@ -1,3 +1,20 @@
+from .backends import create_capture_backend
 from .qt_capture_backend import QtCaptureBackend
+from .xshm_capture_backend import XShmCaptureBackend
 
-__all__ = ["QtCaptureBackend"]
+__all__ = [
+    "PortalCaptureBackend",
+    "QtCaptureBackend",
+    "XShmCaptureBackend",
+    "create_capture_backend",
+]
+
+
+def __getattr__(name):
+    # Import tardio: o backend do portal puxa o QtDBus, que a captura headless
+    # no X11 não precisa
+    if name == "PortalCaptureBackend":
+        from .portal_capture_backend import PortalCaptureBackend
+
+        return PortalCaptureBackend
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication, QImage
+
+from ..config import CONFIG_DIR
+from ..core.interfaces import BaseCaptureBackend
+from .platform import detect_session_type
+
+logger = logging.getLogger(__name__)
+
+PROBE_CACHE_FILE = CONFIG_DIR / "backend_probe.json"
+
+BackendFactory = Callable[[], BaseCaptureBackend]
+
+
+@dataclass
+class ProbeResult:
+    backend: str
+    ok: bool
+    latency_ms: float = 0.0
+    throughput_mpix_s: float = 0.0
+    black_frame: bool = False
+    error: str = ""
+
+    @property
+    def usable(self) -> bool:
+        return self.ok and not self.black_frame
+
+
+def describe_layout() -> List[str]:
+    """Descrição estável das telas (nome, geometria, escala) para a chave do cache."""
+    layout = []
+    for screen in QGuiApplication.screens():
+        g = screen.geometry()
+        layout.append(
+            f"{screen.name()}@{g.x()},{g.y()},{g.width()}x{g.height()}*{screen.devicePixelRatio():g}"
+        )
+    return sorted(layout)
+
+
+def layout_key(layout: Optional[List[str]] = None) -> str:
+    """Chave do cache: tipo de sessão + hash do arranjo de monitores."""
+    layout = describe_layout() if layout is None else layout
+    digest = hashlib.sha1("|".join(layout).encode("utf-8")).hexdigest()[:12]
+    return f"{detect_session_type().value}:{digest}"
+
+
+def is_black_frame(image: QImage, samples: int = 32) -> bool:
+    """Detecta capturas totalmente pretas (sintoma típico de backend sem permissão)."""
+    if image.isNull():
+        return True
+    small = image.scaled(samples, samples, Qt.IgnoreAspectRatio, Qt.FastTransformation)
+    small = small.convertToFormat(QImage.Format_RGB32)
+    for y in range(small.height()):
+        for x in range(small.width()):
+            if small.pixel(x, y) & 0xFFFFFF:
+                return False
+    return True
+
+
+def probe_backend(name: str, factory: BackendFactory, runs: int = 3) -> ProbeResult:
+    """Mede latência/vazão de ``capture_frame`` e verifica se o quadro é válido."""
+    backend = None
+    try:
+        backend = factory()
+        frame = backend.capture_frame()  # aquecimento (conexões, segmentos, permissões)
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            frame = backend.capture_frame()
+            timings.append(time.perf_counter() - start)
+    except Exception as exc:  # qualquer falha desqualifica o backend
+        logger.info("Backend %s falhou no teste: %s", name, exc)
+        return ProbeResult(name, ok=False, error=str(exc))
+    finally:
+        # Instância só do teste: não pode segurar display/segmento do vencedor
+        if backend is not None:
+            backend.close()
+
+    latency = statistics.median(timings)
+    pixels = sum(t.image.width() * t.image.height() for t in frame.tiles)
+    result = ProbeResult(
+        name,
+        ok=not frame.isNull(),
+        latency_ms=latency * 1000,
+        throughput_mpix_s=(pixels / 1e6) / latency if latency > 0 else 0.0,
+        black_frame=is_black_frame(frame.flatten()),
+    )
+    logger.info(
+        "Backend %s: %.1f ms, %.0f Mpx/s%s",
+        name,
+        result.latency_ms,
+        result.throughput_mpix_s,
+        " (quadro preto)" if result.black_frame else "",
+    )
+    return result
+
+
+def _load_cache(cache_file: Path) -> dict:
+    try:
+        with cache_file.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logger.warning("Cache de backends inválido em %s: %s", cache_file, exc)
+        return {}
+
+
+def _save_cache(cache_file: Path, data: dict) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with cache_file.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    except OSError as exc:
+        logger.warning("Falha ao salvar cache de backends em %s: %s", cache_file, exc)
+
+
+def select_fastest_backend(
+    factories: Mapping[str, BackendFactory],
+    *,
+    cache_file: Path = PROBE_CACHE_FILE,
+    layout: Optional[List[str]] = None,
+    runs: int = 3,
+    probe: bool = True,
+) -> Optional[str]:
+    """
+    Escolhe o backend de maior vazão (Mpx/s) que produz capturas válidas.
+
+    Vazão, e não só latência: um backend que entrega a tela em resolução
+    lógica (menos pixels) não ganha só por copiar menos.
+
+    O vencedor fica em cache por sessão + arranjo de monitores; uma nova rodada
+    de testes só acontece quando o arranjo muda (ou o vencedor some). Com
+    ``probe=False`` só consulta o cache. Retorna ``None`` se nenhum backend
+    passar (ou, sem ``probe``, se o arranjo ainda não foi testado).
+    """
+    layout = describe_layout() if layout is None else layout
+    key = layout_key(layout)
+    cache = _load_cache(cache_file)
+
+    cached = cache.get(key, {}).get("backend")
+    if cached in factories:
+        logger.debug("Backend em cache para %s: %s", key, cached)
+        return cached
+    if not probe:
+        return None
+
+    logger.info("Testando backends de captura para o arranjo %s...", key)
+    results: Dict[str, ProbeResult] = {
+        name: probe_backend(name, factory, runs) for name, factory in factories.items()
+    }
+    usable = [r for r in results.values() if r.usable]
+    if not usable:
+        logger.warning("Nenhum backend produziu captura válida.")
+        return None
+
+    winner = max(usable, key=lambda r: r.throughput_mpix_s)
+    cache[key] = {
+        "backend": winner.backend,
+        "layout": layout,
+        "probed_at": datetime.now().isoformat(timespec="seconds"),
+        "results": [asdict(r) for r in results.values()],
+    }
+    _save_cache(cache_file, cache)
+    logger.info("Backend escolhido: %s", winner.backend)
+    return winner.backend
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Dict
+
+from ..core.interfaces import BaseCaptureBackend
+from .backend_probe import PROBE_CACHE_FILE, BackendFactory, select_fastest_backend
+from .platform import SessionType, detect_session_type
+from .qt_capture_backend import QtCaptureBackend
+from .xshm_capture_backend import XShmCaptureBackend
+
+logger = logging.getLogger(__name__)
+
+
+def available_backends() -> Dict[str, BackendFactory]:
+    """Backends utilizáveis nesta sessão (Qt sempre está presente)."""
+    factories: Dict[str, BackendFactory] = {}
+    session = detect_session_type()
+    # XWayland também tem MIT-SHM, mas só enxerga as janelas X: nada de XShm no Wayland
+    if session == SessionType.X11 and XShmCaptureBackend.is_available():
+        factories["xshm"] = XShmCaptureBackend
+    if session == SessionType.WAYLAND:
+        from .portal_capture_backend import PortalCaptureBackend  # QtDBus só no Wayland
+
+        if PortalCaptureBackend.is_available():
+            factories["portal"] = PortalCaptureBackend
+    factories["qt"] = QtCaptureBackend
+    return factories
+
+
+def create_capture_backend(
+    choice: str = "auto",
+    *,
+    probe_cache: Path = PROBE_CACHE_FILE,
+) -> BaseCaptureBackend:
+    """
+    Instancia o backend de captura conforme ``AppConfig.capture_backend``.
+
+    - ``"qt"``: ``QScreen.grabWindow`` (funciona em qualquer plataforma Qt).
+    - ``"xshm"``: MIT-SHM no X11; cai para Qt se indisponível.
+    - ``"portal"``: xdg-desktop-portal via D-Bus; cai para Qt se indisponível.
+    - ``"auto"``: testa todos os backends disponíveis na primeira execução e
+      usa o mais rápido que produz capturas válidas (resultado em cache por
+      sessão e arranjo de monitores).
+    """
+    if choice == "qt":
+        return QtCaptureBackend()
+
+    if choice == "xshm":
+        if XShmCaptureBackend.is_available():
+            return XShmCaptureBackend()
+        logger.warning("Backend XShm indisponível; usando backend Qt.")
+        return QtCaptureBackend()
+
+    if choice == "portal":
+        from .portal_capture_backend import PortalCaptureBackend
+
+        if PortalCaptureBackend.is_available():
+            return PortalCaptureBackend()
+        logger.warning("Portal de captura indisponível; usando backend Qt.")
+        return QtCaptureBackend()
+
+    if choice != "auto":
+        logger.warning("Backend de captura desconhecido %r; usando 'auto'.", choice)
+
+    factories = available_backends()
+    if len(factories) == 1:
+        return QtCaptureBackend()
+
+    winner = select_fastest_backend(factories, cache_file=probe_cache)
+    if winner is None:
+        return QtCaptureBackend()
+    return factories[winner]()
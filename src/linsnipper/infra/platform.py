@@ -21,3 +21,23 @@ def detect_session_type() -> SessionType:
 
 def is_wayland() -> bool:
     return detect_session_type() == SessionType.WAYLAND
+
+
+# Plataformas Qt em que QScreen.grabWindow pode ser chamado fora da thread de GUI
+# (xcb conversa com o servidor por uma conexão thread-safe e suporta pixmaps em threads).
+_THREADED_GRAB_PLATFORMS = {"xcb", "offscreen"}
+
+
+def supports_threaded_grab() -> bool:
+    """
+    Indica se as capturas por tela podem rodar em paralelo em threads de trabalho.
+
+    ``LINSNIPPER_PARALLEL_GRAB=0|1`` força o comportamento.
+    """
+    override = os.environ.get("LINSNIPPER_PARALLEL_GRAB")
+    if override is not None:
+        return override.strip().lower() in ("1", "true", "yes")
+
+    from PySide6.QtGui import QGuiApplication
+
+    return QGuiApplication.platformName() in _THREADED_GRAB_PLATFORMS
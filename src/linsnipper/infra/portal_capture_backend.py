@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote, urlparse
+
+from PySide6.QtCore import QEventLoop, QObject, QRect, QTimer, Slot
+from PySide6.QtDBus import QDBusConnection, QDBusMessage, QDBusPendingCallWatcher
+from PySide6.QtGui import QGuiApplication, QImage, QPixmap
+
+from ..core.frame import ScreenTile, VirtualDesktopFrame
+from ..core.interfaces import BaseCaptureBackend
+from ..errors import CaptureError
+
+logger = logging.getLogger(__name__)
+
+PORTAL_SERVICE = "org.freedesktop.portal.Desktop"
+PORTAL_PATH = "/org/freedesktop/portal/desktop"
+SCREENSHOT_IFACE = "org.freedesktop.portal.Screenshot"
+REQUEST_IFACE = "org.freedesktop.portal.Request"
+
+# Códigos de resposta de org.freedesktop.portal.Request.Response
+_RESPONSE_SUCCESS = 0
+_RESPONSE_CANCELLED = 1
+
+
+class _PendingResponse(QObject):
+    """Recebe o sinal ``Response`` de um objeto Request do portal."""
+
+    def __init__(self, loop: QEventLoop):
+        super().__init__()
+        self._loop = loop
+        self.code: Optional[int] = None
+        self.results: dict = {}
+
+    @Slot("uint", "QVariantMap")
+    def on_response(self, code, results):
+        self.code = int(code)
+        self.results = dict(results)
+        self._loop.quit()
+
+
+class PortalCaptureBackend(BaseCaptureBackend):
+    """
+    Backend via xdg-desktop-portal (``org.freedesktop.portal.Screenshot``),
+    o caminho suportado no Wayland, onde ``grabWindow(0)`` costuma falhar.
+
+    A captura é pedida sem interação; a permissão concedida fica no
+    permission store do próprio portal. O arquivo devolvido é mapeado em
+    memória e decodificado uma única vez.
+
+    O portal devolve o desktop inteiro em pixels físicos, enquanto recortes
+    chegam em pixels lógicos: o quadro usa como escala a razão entre a
+    largura da imagem e a do desktop virtual.
+    """
+
+    name = "portal"
+
+    def __init__(
+        self,
+        bus: Optional[QDBusConnection] = None,
+        timeout_ms: int = 15000,
+        delete_result: bool = True,
+    ):
+        self._bus = bus
+        self._timeout_ms = timeout_ms
+        self._delete_result = delete_result
+
+    @property
+    def bus(self) -> QDBusConnection:
+        if self._bus is None:
+            self._bus = QDBusConnection.sessionBus()
+        return self._bus
+
+    @classmethod
+    def is_available(cls, bus: Optional[QDBusConnection] = None) -> bool:
+        bus = bus or QDBusConnection.sessionBus()
+        if not bus.isConnected():
+            return False
+        reply = bus.interface().isServiceRegistered(PORTAL_SERVICE)
+        return reply.isValid() and bool(reply.value())
+
+    # ------------- Chamada ao portal -------------
+
+    def _request_path(self, handle_token: str) -> str:
+        # Caminho previsível do objeto Request (spec do portal): permite assinar
+        # o sinal Response antes da chamada, sem corrida.
+        sender = self.bus.baseService().lstrip(":").replace(".", "_")
+        return f"{PORTAL_PATH}/request/{sender}/{handle_token}"
+
+    def _screenshot_uri(self) -> str:
+        bus = self.bus
+        if not bus.isConnected():
+            raise CaptureError("Sem conexão com o barramento D-Bus de sessão.")
+
+        handle_token = f"linsnipper_{uuid.uuid4().hex}"
+        options = {"handle_token": handle_token, "interactive": False, "modal": False}
+
+        loop = QEventLoop()
+        pending = _PendingResponse(loop)
+        path = self._request_path(handle_token)
+        slot = "1on_response(uint,QVariantMap)"
+        if not bus.connect("", path, REQUEST_IFACE, "Response", pending, slot):
+            raise CaptureError("Falha ao assinar o sinal Response do portal.")
+
+        try:
+            msg = QDBusMessage.createMethodCall(PORTAL_SERVICE, PORTAL_PATH, SCREENSHOT_IFACE, "Screenshot")
+            msg.setArguments(["", options])
+            call = bus.asyncCall(msg)
+            watcher = QDBusPendingCallWatcher(call)
+            watcher.finished.connect(lambda w: loop.quit() if w.isError() else None)
+
+            timer = QTimer()
+            timer.setSingleShot(True)
+            timer.timeout.connect(loop.quit)
+            timer.start(self._timeout_ms)
+            loop.exec()
+            timer.stop()
+
+            if call.isFinished() and call.isError():
+                err = call.error()
+                raise CaptureError(f"Portal recusou a captura: {err.name()}: {err.message()}")
+            if pending.code is None:
+                raise CaptureError("Tempo esgotado aguardando resposta do portal de captura.")
+        finally:
+            bus.disconnect("", path, REQUEST_IFACE, "Response", pending, slot)
+
+        if pending.code == _RESPONSE_CANCELLED:
+            raise CaptureError("Captura cancelada no portal.")
+        if pending.code != _RESPONSE_SUCCESS:
+            raise CaptureError(f"Portal de captura falhou (código {pending.code}).")
+
+        uri = pending.results.get("uri")
+        if not uri:
+            raise CaptureError("Resposta do portal sem URI da captura.")
+        return str(uri)
+
+    @staticmethod
+    def _decode_mapped(path: Path) -> QImage:
+        """Decodifica o arquivo direto das páginas mapeadas (uma única decodificação)."""
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                image = QImage.fromData(view)
+            except (TypeError, ValueError):
+                # Algumas versões do PySide não aceitam memoryview aqui
+                image = QImage.fromData(mapped[:])
+            finally:
+                view.release()
+        return image
+
+    def _grab_image(self) -> QImage:
+        uri = self._screenshot_uri()
+        parsed = urlparse(uri)
+        if parsed.scheme != "file":
+            raise CaptureError(f"URI de captura não suportada: {uri}")
+        path = Path(unquote(parsed.path))
+
+        try:
+            image = self._decode_mapped(path)
+        except (OSError, ValueError) as exc:
+            # ValueError: arquivo vazio (mmap de tamanho 0) ou cabeçalho inválido
+            raise CaptureError(f"Falha ao ler captura do portal em {path}: {exc}") from exc
+        finally:
+            if self._delete_result:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    logger.debug("Não foi possível remover %s.", path)
+
+        if image.isNull():
+            raise CaptureError(f"Arquivo de captura do portal inválido: {path}")
+        return image
+
+    # ------------- BaseCaptureBackend -------------
+
+    @staticmethod
+    def _desktop_geometry() -> QRect:
+        """União das telas em pixels lógicos (vazia sem telas)."""
+        desktop = QRect()
+        for screen in QGuiApplication.screens():
+            desktop = desktop.united(screen.geometry())
+        return desktop
+
+    def capture_frame(self) -> VirtualDesktopFrame:
+        image = self._grab_image()
+        desktop = self._desktop_geometry()
+        if desktop.isEmpty() or desktop.size() == image.size():
+            return VirtualDesktopFrame.from_image(image, self.name)
+        dpr = image.width() / desktop.width()
+        image.setDevicePixelRatio(dpr)
+        return VirtualDesktopFrame([ScreenTile(self.name, desktop, dpr, image)])
+
+    def capture_fullscreen(self) -> QPixmap:
+        return QPixmap.fromImage(self._grab_image())
+
+    def capture_region(self, rect: QRect) -> QPixmap:
+        if rect.isNull() or rect.width() <= 0 or rect.height() <= 0:
+            raise CaptureError("Retângulo de captura inválido.")
+        crop = self.capture_frame().crop(rect)
+        if crop.isNull():
+            logger.warning("Retângulo de captura não intersecta com a tela.")
+            raise CaptureError("Área selecionada está fora da tela.")
+        return QPixmap.fromImage(crop)
+
+    def capture_window(self, window_id: Optional[int] = None) -> QPixmap:
+        msg = "Captura de janela não é suportada pelo portal sem interação."
+        logger.warning(msg)
+        raise NotImplementedError(msg)
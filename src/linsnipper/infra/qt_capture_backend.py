@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import List, Optional
 
-from PySide6.QtGui import QGuiApplication, QPixmap
-from PySide6.QtCore import QRect
+from PySide6.QtGui import QGuiApplication, QPainter, QPixmap, QScreen
+from PySide6.QtCore import QPoint, QRect, Qt
 
+from ..core.frame import VirtualDesktopFrame
 from ..core.interfaces import BaseCaptureBackend
 from ..errors import CaptureError
+from .grab_engine import ScreenGrabEngine
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,9 @@ logger = logging.getLogger(__name__)
 class QtCaptureBackend(BaseCaptureBackend):
     name = "qt"
 
+    def __init__(self, engine: Optional[ScreenGrabEngine] = None):
+        self._engine = engine or ScreenGrabEngine()
+
     def _primary_screen(self):
         screen = QGuiApplication.primaryScreen()
         if screen is None:
@@ -22,66 +27,89 @@ class QtCaptureBackend(BaseCaptureBackend):
             raise CaptureError("Não foi possível detectar a tela para captura.")
         return screen
 
-    def capture_fullscreen(self) -> QPixmap:
+    def _screens(self) -> List[QScreen]:
         screens = QGuiApplication.screens()
         if not screens:
             logger.error("Nenhuma tela detectada.")
             raise CaptureError("Não foi possível detectar telas.")
+        return screens
 
-        # 1. Calcular a geometria total (união de todas as telas)
+    @staticmethod
+    def _virtual_geometry(screens: List[QScreen]) -> QRect:
+        """União das geometrias de todas as telas (coordenadas globais)."""
         total_rect = QRect()
         for screen in screens:
             total_rect = total_rect.united(screen.geometry())
 
         if total_rect.isNull():
             raise CaptureError("Geometria total das telas é inválida.")
+        return total_rect
 
-        # 2. Criar o pixmap gigante ("Canvas Virtual")
-        full_pixmap = QPixmap(total_rect.size())
-        full_pixmap.fill(Qt.black)  # Fundo padrão caso haja buracos
-
-        # 3. Pintar cada tela na posição correta
-        # Precisamos de um Painter para compor
-        from PySide6.QtGui import QPainter
-        from PySide6.QtCore import QPoint
-
-        painter = QPainter(full_pixmap)
-        
-        # O total_rect pode começar em coordenadas negativas (ex: tela secundária à esquerda)
-        # Precisamos transladar tudo para (0,0) do pixmap
-        offset_x = -total_rect.x()
-        offset_y = -total_rect.y()
-
-        for screen in screens:
-            # Captura a tela individual
-            screen_pix = screen.grabWindow(0)
-            geom = screen.geometry()
-            
-            # Posição no canvas virtual
-            target_x = geom.x() + offset_x
-            target_y = geom.y() + offset_y
-            
-            painter.drawPixmap(target_x, target_y, screen_pix)
+    def capture_frame(self) -> VirtualDesktopFrame:
+        """Captura cada tela num tile próprio, sem montar o desktop virtual."""
+        frame = self._engine.grab_frame(self._screens())
+        if frame.isNull():
+            raise CaptureError("Nenhuma tela pôde ser capturada.")
+        return frame
 
-        painter.end()
-
-        # Nota: O CapturaService/Backend pode precisar expor o offset 
-        # se quisermos mapear de volta para coordenadas globais, 
-        # mas para 'Screenshot' simples, perder a coordenada absoluta global geralmente é OK,
-        # desde que a imagem relativa esteja certa.
-        
-        return full_pixmap
+    def capture_fullscreen(self) -> QPixmap:
+        # Os tiles são compostos num único pixmap do tamanho da união das telas
+        # (buracos entre telas ficam pretos). Quem não precisa da imagem inteira
+        # deve preferir ``capture_frame``.
+        return QPixmap.fromImage(self._engine.compose(self.capture_frame()))
 
     def capture_region(self, rect: QRect) -> QPixmap:
+        """
+        Captura apenas a região pedida, sem montar o desktop virtual inteiro.
+
+        ``rect`` usa a mesma convenção de ``capture_fullscreen``: coordenadas
+        relativas ao canto superior esquerdo do desktop virtual. Só as telas que
+        intersectam a região são capturadas, e cada uma apenas no sub-retângulo
+        necessário (``grabWindow(0, x, y, w, h)``), compondo direto num pixmap
+        do tamanho da seleção.
+        """
         if rect.isNull() or rect.width() <= 0 or rect.height() <= 0:
             raise CaptureError("Retângulo de captura inválido.")
 
-        full = self.capture_fullscreen()
-        bounded = rect.intersected(full.rect())
+        screens = self._screens()
+        total_rect = self._virtual_geometry(screens)
+
+        bounded = rect.intersected(QRect(QPoint(0, 0), total_rect.size()))
         if bounded.isNull():
             logger.warning("Retângulo de captura não intersecta com a tela.")
             raise CaptureError("Área selecionada está fora da tela.")
-        return full.copy(bounded)
+
+        # Região em coordenadas globais (as mesmas de QScreen.geometry())
+        global_rect = bounded.translated(total_rect.topLeft())
+
+        result = QPixmap(bounded.size())
+        result.fill(Qt.black)  # Buracos entre telas de tamanhos diferentes
+
+        painter = QPainter(result)
+        grabbed = 0
+        for screen in screens:
+            geom = screen.geometry()
+            part = global_rect.intersected(geom)
+            if part.isEmpty():
+                continue
+
+            # grabWindow(0, ...) recebe coordenadas locais da tela
+            local = part.translated(-geom.topLeft())
+            pix = screen.grabWindow(0, local.x(), local.y(), local.width(), local.height())
+            if pix.isNull():
+                logger.warning("Captura nula na tela %s.", screen.name())
+                continue
+
+            target = QRect(part.topLeft() - global_rect.topLeft(), part.size())
+            painter.drawPixmap(target, pix)
+            grabbed += 1
+        painter.end()
+
+        if grabbed == 0:
+            raise CaptureError("Nenhuma tela pôde ser capturada na região selecionada.")
+
+        logger.debug("Região %s capturada a partir de %d tela(s).", bounded, grabbed)
+        return result
 
     def capture_window(self, window_id: Optional[int] = None) -> QPixmap:
         # Em Linux moderno (Wayland) e até X11, grabWindow(id) é instável ou proibido.
@@ -89,3 +117,6 @@ class QtCaptureBackend(BaseCaptureBackend):
         msg = "Captura de janela (Window Mode) não é suportada nativamente pelo backend Qt neste ambiente."
         logger.warning(msg)
         raise NotImplementedError(msg)
+
+    def close(self) -> None:
+        self._engine.shutdown()
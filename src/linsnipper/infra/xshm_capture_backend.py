@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+from contextlib import contextmanager
+from typing import List, Optional
+
+from PySide6.QtCore import QPoint, QRect
+from PySide6.QtGui import QGuiApplication, QImage, QPixmap
+
+from ..core.frame import ScreenTile, VirtualDesktopFrame
+from ..core.interfaces import BaseCaptureBackend
+from ..errors import CaptureError
+
+logger = logging.getLogger(__name__)
+
+# Constantes do Xlib / SysV IPC
+_ZPIXMAP = 2
+_ALL_PLANES = 0xFFFFFFFFFFFFFFFF
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class _XImage(ctypes.Structure):
+    # Apenas o prefixo da struct que precisamos ler; o resto (funções) não é tocado.
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+    ]
+
+
+class _XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("resourceid", ctypes.c_ulong),
+        ("serial", ctypes.c_ulong),
+        ("error_code", ctypes.c_ubyte),
+        ("request_code", ctypes.c_ubyte),
+        ("minor_code", ctypes.c_ubyte),
+    ]
+
+
+_XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(_XErrorEvent))
+
+
+class _XErrorTrap:
+    """
+    Instala temporariamente um handler de erros do Xlib: o padrão encerra o
+    processo em qualquer erro (ex.: XShmAttach recusado num display remoto).
+    """
+
+    last_error: Optional[int] = None
+
+    @staticmethod
+    def _handler(_display, event):
+        _XErrorTrap.last_error = event.contents.error_code
+        logger.debug("Erro X capturado: código %s.", _XErrorTrap.last_error)
+        return 0
+
+    handler = _XErrorHandler(_handler)
+
+    @classmethod
+    @contextmanager
+    def installed(cls, libs: "_Libs"):
+        cls.last_error = None
+        previous = libs.x11.XSetErrorHandler(ctypes.cast(cls.handler, ctypes.c_void_p))
+        try:
+            yield cls
+        finally:
+            libs.x11.XSetErrorHandler(previous)
+
+
+class _Libs:
+    """Bindings ctypes mínimos para libX11, libXext (MIT-SHM) e SysV shm da libc."""
+
+    def __init__(self):
+        names = {n: ctypes.util.find_library(n) for n in ("X11", "Xext", "c")}
+        missing = [n for n, path in names.items() if not path]
+        if missing:
+            raise CaptureError(f"Bibliotecas ausentes para XShm: {', '.join(missing)}")
+
+        self.x11 = x11 = ctypes.CDLL(names["X11"])
+        self.xext = xext = ctypes.CDLL(names["Xext"])
+        self.libc = libc = ctypes.CDLL(names["c"], use_errno=True)
+
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        x11.XDefaultScreen.restype = ctypes.c_int
+        x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XRootWindow.restype = ctypes.c_ulong
+        x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultVisual.restype = ctypes.c_void_p
+        x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultDepth.restype = ctypes.c_int
+        x11.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayWidth.restype = ctypes.c_int
+        x11.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayHeight.restype = ctypes.c_int
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XFree.argtypes = [ctypes.c_void_p]
+        x11.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+        x11.XSetErrorHandler.restype = ctypes.c_void_p
+
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmQueryExtension.restype = ctypes.c_int
+        xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p,  # Display*
+            ctypes.c_void_p,  # Visual*
+            ctypes.c_uint,  # depth
+            ctypes.c_int,  # format
+            ctypes.c_void_p,  # data
+            ctypes.POINTER(_XShmSegmentInfo),
+            ctypes.c_uint,
+            ctypes.c_uint,
+        ]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmAttach.restype = ctypes.c_int
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.restype = ctypes.c_int
+        xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_ulong,
+            ctypes.POINTER(_XImage),
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_ulong,
+        ]
+        xext.XShmGetImage.restype = ctypes.c_int
+
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmget.restype = ctypes.c_int
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmdt.restype = ctypes.c_int
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+        libc.shmctl.restype = ctypes.c_int
+
+
+class _ShmSegment:
+    """Segmento de memória compartilhada anexado ao servidor X, reaproveitado entre capturas."""
+
+    def __init__(self, libs: _Libs, display: int, size: int):
+        self._libs = libs
+        self._display = display
+        self.size = size
+        self.info = _XShmSegmentInfo()
+
+        libc = libs.libc
+        shmid = libc.shmget(_IPC_PRIVATE, size, _IPC_CREAT | 0o600)
+        if shmid < 0:
+            raise CaptureError(f"shmget falhou (errno {ctypes.get_errno()}).")
+
+        addr = libc.shmat(shmid, None, 0)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(shmid, _IPC_RMID, None)
+            raise CaptureError(f"shmat falhou (errno {ctypes.get_errno()}).")
+
+        self.info.shmid = shmid
+        self.info.shmaddr = addr
+        self.info.readOnly = 0
+
+        with _XErrorTrap.installed(libs) as trap:
+            ok = libs.xext.XShmAttach(display, ctypes.byref(self.info))
+            libs.x11.XSync(display, 0)
+        # Marca para remoção já: o segmento some sozinho quando todos se desanexarem,
+        # mesmo se o processo morrer sem chamar close().
+        libc.shmctl(shmid, _IPC_RMID, None)
+        if not ok or trap.last_error is not None:
+            libc.shmdt(addr)
+            raise CaptureError("XShmAttach falhou (display remoto ou MIT-SHM bloqueado?).")
+
+    def close(self):
+        self._libs.xext.XShmDetach(self._display, ctypes.byref(self.info))
+        self._libs.x11.XSync(self._display, 0)
+        self._libs.libc.shmdt(self.info.shmaddr)
+
+
+class XShmCaptureBackend(BaseCaptureBackend):
+    """
+    Backend X11 via MIT-SHM: o servidor X escreve o framebuffer direto num
+    segmento de memória compartilhada, e o ``QImage`` resultante custa uma
+    única cópia. O segmento é reaproveitado entre capturas e só cresce quando
+    uma captura maior é pedida.
+    """
+
+    name = "xshm"
+
+    def __init__(self, display_name: Optional[str] = None):
+        self._display_name = display_name
+        self._libs: Optional[_Libs] = None
+        self._display: Optional[int] = None
+        self._segment: Optional[_ShmSegment] = None
+
+    # ------------- Disponibilidade / conexão -------------
+
+    @classmethod
+    def is_available(cls, display_name: Optional[str] = None) -> bool:
+        if not (display_name or os.environ.get("DISPLAY")):
+            return False
+        backend = cls(display_name)
+        try:
+            backend._connect()
+            return True
+        except CaptureError as exc:
+            logger.debug("XShm indisponível: %s", exc)
+            return False
+        finally:
+            backend.close()
+
+    def _connect(self) -> int:
+        if self._display is not None:
+            return self._display
+
+        libs = _Libs()
+        name = self._display_name.encode() if self._display_name else None
+        display = libs.x11.XOpenDisplay(name)
+        if not display:
+            raise CaptureError("Não foi possível abrir o display X11.")
+        if not libs.xext.XShmQueryExtension(display):
+            libs.x11.XCloseDisplay(display)
+            raise CaptureError("Servidor X sem extensão MIT-SHM.")
+
+        self._libs = libs
+        self._display = display
+        return display
+
+    def close(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        if self._display is not None:
+            self._libs.x11.XCloseDisplay(self._display)
+            self._display = None
+
+    def __del__(self):  # pragma: no cover - limpeza best-effort
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    # ------------- Captura -------------
+
+    def _root_rect(self) -> QRect:
+        display = self._connect()
+        x11 = self._libs.x11
+        screen = x11.XDefaultScreen(display)
+        return QRect(0, 0, x11.XDisplayWidth(display, screen), x11.XDisplayHeight(display, screen))
+
+    def _grab(self, rect: QRect) -> QImage:
+        """Captura ``rect`` (pixels físicos do root window) com uma única cópia."""
+        display = self._connect()
+        libs = self._libs
+        screen = libs.x11.XDefaultScreen(display)
+        visual = libs.x11.XDefaultVisual(display, screen)
+        depth = libs.x11.XDefaultDepth(display, screen)
+        width, height = rect.width(), rect.height()
+
+        # Visual de 32 bpp (o único suportado): bytes_per_line = 4 * largura
+        needed = width * height * 4
+        if self._segment is None or self._segment.size < needed:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self._segment = _ShmSegment(libs, display, needed)
+            logger.debug("Segmento XShm (re)alocado: %d bytes.", needed)
+
+        # Cabeçalho XImage apontando para o segmento compartilhado (dados não são alocados aqui)
+        ximage = libs.xext.XShmCreateImage(
+            display,
+            visual,
+            depth,
+            _ZPIXMAP,
+            self._segment.info.shmaddr,
+            ctypes.byref(self._segment.info),
+            width,
+            height,
+        )
+        if not ximage:
+            raise CaptureError("XShmCreateImage falhou.")
+
+        try:
+            img = ximage.contents
+            needed = img.bytes_per_line * img.height
+            if img.bits_per_pixel != 32 or img.red_mask != 0xFF0000 or img.blue_mask != 0xFF:
+                raise CaptureError(
+                    f"Formato de visual X não suportado (bpp={img.bits_per_pixel}, depth={img.depth})."
+                )
+
+            with _XErrorTrap.installed(libs) as trap:
+                ok = libs.xext.XShmGetImage(
+                    display,
+                    libs.x11.XRootWindow(display, screen),
+                    ximage,
+                    rect.x(),
+                    rect.y(),
+                    _ALL_PLANES,
+                )
+                libs.x11.XSync(display, 0)
+            if not ok or trap.last_error is not None:
+                raise CaptureError("XShmGetImage falhou.")
+
+            buf = (ctypes.c_char * needed).from_address(self._segment.info.shmaddr)
+            # Única cópia: do segmento compartilhado para um QImage independente
+            return QImage(buf, width, height, img.bytes_per_line, QImage.Format_RGB32).copy()
+        finally:
+            # Só o cabeçalho: os dados pertencem ao segmento compartilhado
+            libs.x11.XFree(ximage)
+
+    def _screen_rects(self) -> List[tuple]:
+        """(nome, geometria lógica, dpr) das telas; o root inteiro se o Qt não estiver no X."""
+        if QGuiApplication.platformName() == "xcb":
+            return [(s.name(), s.geometry(), s.devicePixelRatio()) for s in QGuiApplication.screens()]
+        return [("root", self._root_rect(), 1.0)]
+
+    @staticmethod
+    def _physical(screen: QRect, dpr: float, rect: Optional[QRect] = None) -> QRect:
+        """
+        Pixels do root X de ``rect`` (lógico, dentro da tela ``screen``; padrão:
+        a tela inteira).
+
+        O Qt mantém em ``geometry().topLeft()`` a origem nativa da tela e só
+        escala o tamanho; por isso a origem vem da tela e apenas o deslocamento
+        dentro dela é multiplicado pelo dpr daquela tela.
+        """
+        rect = screen if rect is None else rect
+        origin = screen.topLeft()
+        return QRect(
+            origin.x() + round((rect.x() - origin.x()) * dpr),
+            origin.y() + round((rect.y() - origin.y()) * dpr),
+            round(rect.width() * dpr),
+            round(rect.height() * dpr),
+        )
+
+    def capture_frame(self) -> VirtualDesktopFrame:
+        tiles = []
+        for name, geometry, dpr in self._screen_rects():
+            image = self._grab(self._physical(geometry, dpr))
+            image.setDevicePixelRatio(dpr)
+            tiles.append(ScreenTile(name, geometry, dpr, image))
+        return VirtualDesktopFrame(tiles)
+
+    def capture_fullscreen(self) -> QPixmap:
+        return QPixmap.fromImage(self.capture_frame().flatten())
+
+    def capture_region(self, rect: QRect) -> QPixmap:
+        if rect.isNull() or rect.width() <= 0 or rect.height() <= 0:
+            raise CaptureError("Retângulo de captura inválido.")
+
+        screens = self._screen_rects()
+        desktop = QRect()
+        for _, geometry, _ in screens:
+            desktop = desktop.united(geometry)
+
+        bounded = rect.intersected(QRect(QPoint(0, 0), desktop.size()))
+        if bounded.isNull():
+            logger.warning("Retângulo de captura não intersecta com a tela.")
+            raise CaptureError("Área selecionada está fora da tela.")
+
+        global_rect = bounded.translated(desktop.topLeft())
+        dprs = {dpr for _, _, dpr in screens}
+        if dprs == {1.0}:
+            # Sem escala: uma única leitura do root para a região inteira
+            return QPixmap.fromImage(self._grab(global_rect))
+
+        frame = self.capture_frame()
+        return QPixmap.fromImage(frame.crop(bounded))
+
+    def capture_window(self, window_id: Optional[int] = None) -> QPixmap:
+        msg = "Captura de janela (Window Mode) ainda não é suportada pelo backend XShm."
+        logger.warning(msg)
+        raise NotImplementedError(msg)
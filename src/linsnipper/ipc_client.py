@@ -0,0 +1,197 @@
+"""
+Cliente IPC sem Qt para falar com a instância em background.
+
+O atalho global roda ``linsnipper --snip``; se já há um daemon, tudo o que o
+processo precisa é mandar uma mensagem e sair. Importar QtWidgets/QtNetwork só
+para isso custa centenas de ms, então este módulo usa só a biblioteca padrão e
+conecta direto no socket Unix do ``QLocalServer``.
+
+Qt só deve ser importado depois que ``send_command`` devolver ``False``.
+
+Para pedidos com resposta (scripts)::
+
+    with IpcClient() as client:
+        print(client.call("status"))
+        first = client.send("stats")  # pipelining: envia sem esperar
+        second = client.send("status")
+        print(client.receive(first), client.receive(second))
+
+        with client.capture_raw(mode="fullscreen") as frame:
+            pixels = frame.array()  # (altura, largura, 4) uint8, sem cópia
+"""
+
+from __future__ import annotations
+
+import errno
+import itertools
+import os
+import socket
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from . import tracing
+from .errors import IpcError
+from .ipc_protocol import FrameDecoder, encode_request
+from .shm_frame import RawFrame
+
+SERVER_NAME = "linsnipper_ipc"
+CONNECT_TIMEOUT_S = 1.0
+REPLY_TIMEOUT_S = 30.0
+_MAX_FDS = 4
+
+
+def socket_path(server_name: str = SERVER_NAME) -> str:
+    """
+    Caminho do socket que ``QLocalServer.listen(server_name)`` cria no Unix.
+
+    Nomes absolutos são usados como estão; os demais vão para
+    ``QDir.tempPath()`` (``$TMPDIR`` ou ``/tmp``).
+    """
+    if server_name.startswith("/"):
+        return server_name
+    temp = os.path.normpath(os.environ.get("TMPDIR") or "/tmp")
+    return os.path.join(temp, server_name)
+
+
+def _connect(server_name: str, timeout: float) -> socket.socket:
+    """
+    Socket conectado à instância.
+
+    ``OSError`` se não há ninguém ouvindo: arquivo ausente, socket órfão de um
+    daemon morto, ou plataforma sem AF_UNIX.
+    """
+    if not hasattr(socket, "AF_UNIX"):  # pragma: no cover - Windows
+        raise OSError(errno.EAFNOSUPPORT, "AF_UNIX indisponível")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path(server_name))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _deliver(server_name: str, data: bytes, label: str, timeout: float) -> bool:
+    with tracing.span("ipc.send", message=label) as span:
+        try:
+            sock = _connect(server_name, timeout)
+        except OSError as exc:
+            span.set(connected=False, errno=errno.errorcode.get(exc.errno, exc.errno))
+            return False
+        try:
+            span.set(connected=True)
+            sock.sendall(data)
+            return True
+        finally:
+            sock.close()
+
+
+def send_command(
+    server_name: str = SERVER_NAME,
+    cmd: str = "snip",
+    args: Optional[Dict[str, Any]] = None,
+    timeout: float = CONNECT_TIMEOUT_S,
+) -> bool:
+    """
+    Envia um pedido sem esperar resposta (caminho do atalho).
+
+    Devolve ``True`` se havia um servidor ouvindo (pedido entregue) e
+    ``False`` se não há instância.
+    """
+    return _deliver(server_name, encode_request(cmd, args), cmd, timeout)
+
+
+def send_message(server_name: str, message: str, timeout: float = CONNECT_TIMEOUT_S) -> bool:
+    """Como ``send_command``, mas no protocolo antigo de texto (``"SNIP"``, ``"EDITOR"``)."""
+    return _deliver(server_name, message.encode("utf-8"), message, timeout)
+
+
+class IpcClient:
+    """
+    Conexão persistente com a instância, com respostas.
+
+    ``send`` só escreve o pedido e devolve o ``id``; ``receive`` espera a
+    resposta daquele ``id`` (guardando as que chegarem antes). ``call`` faz os
+    dois. Respostas de erro viram ``IpcError``.
+    """
+
+    def __init__(
+        self,
+        server_name: str = SERVER_NAME,
+        timeout: float = REPLY_TIMEOUT_S,
+        connect_timeout: float = CONNECT_TIMEOUT_S,
+    ):
+        try:
+            sock = _connect(server_name, connect_timeout)
+        except OSError as exc:
+            raise IpcError(f"Nenhuma instância ouvindo em {socket_path(server_name)}: {exc}") from exc
+        sock.settimeout(timeout)
+        self._sock = sock
+        self._ids = itertools.count(1)
+        self._decoder = FrameDecoder()
+        self._replies: Dict[int, Dict[str, Any]] = {}
+        # Descritores (SCM_RIGHTS) recebidos e ainda não associados a uma resposta
+        self._fds: Deque[int] = deque()
+
+    def send(self, cmd: str, **args) -> int:
+        request_id = next(self._ids)
+        self._sock.sendall(encode_request(cmd, args, id=request_id))
+        return request_id
+
+    def receive(self, request_id: int) -> Any:
+        return self._receive(request_id)[0]
+
+    def _receive(self, request_id: int) -> Tuple[Any, List[int]]:
+        """Resultado e descritores recebidos com a resposta de ``request_id``."""
+        while request_id not in self._replies:
+            try:
+                data, fds, _flags, _addr = socket.recv_fds(self._sock, 65536, _MAX_FDS)
+            except socket.timeout as exc:
+                raise IpcError(f"Sem resposta da instância para o pedido {request_id}.") from exc
+            # Os descritores chegam junto do primeiro byte do quadro que os anuncia
+            self._fds.extend(fds)
+            if not data:
+                raise IpcError("A instância fechou a conexão.")
+            for reply in self._decoder.feed(data):
+                if reply.get("id") == 0 and not reply.get("ok"):
+                    raise IpcError(reply.get("error", "erro de protocolo"))
+                reply["fds"] = [self._fds.popleft() for _ in range(reply.get("fds", 0))]
+                self._replies[reply.get("id")] = reply
+
+        reply = self._replies.pop(request_id)
+        if not reply.get("ok"):
+            raise IpcError(reply.get("error", "erro desconhecido"))
+        return reply.get("result"), reply["fds"]
+
+    def capture_raw(self, **args) -> RawFrame:
+        """
+        Captura na instância e recebe os pixels brutos por memfd, sem disco.
+
+        ``args`` como em ``capture-to-file`` (``mode``, ``geometry``, ``delay``),
+        sem ``path``. ``RawFrame.array()`` é uma view NumPy sem cópia.
+        """
+        header, fds = self._receive(self.send("capture-raw", **args))
+        if len(fds) != 1:
+            for fd in fds:
+                os.close(fd)
+            raise IpcError("Resposta de capture-raw sem o memfd.")
+        return RawFrame.from_fd(fds[0], header)
+
+    def call(self, cmd: str, **args) -> Any:
+        return self.receive(self.send(cmd, **args))
+
+    def close(self) -> None:
+        while self._fds:
+            os.close(self._fds.popleft())
+        for reply in self._replies.values():
+            for fd in reply["fds"]:
+                os.close(fd)
+        self._replies.clear()
+        self._sock.close()
+
+    def __enter__(self) -> "IpcClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,150 @@
+"""
+Protocolo IPC entre o cliente (atalho/scripts) e a instância em background.
+
+Cada mensagem é um quadro::
+
+    b"LS" | versão (1 byte) | tamanho (uint32 big-endian) | JSON UTF-8
+
+Pedido: ``{"id": 7, "cmd": "snip", "args": {"mode": "rect", "delay": 3}}``.
+Resposta: ``{"id": 7, "ok": true, "result": ...}`` ou
+``{"id": 7, "ok": false, "error": "..."}``. Pedidos sem ``id`` não recebem
+resposta. Vários pedidos podem seguir na mesma conexão sem esperar as
+respostas (pipelining); cada resposta traz o ``id`` do seu pedido e pode
+chegar fora de ordem. Respostas com ``"fds": n`` carregam ``n`` descritores
+(``SCM_RIGHTS``) enviados junto dos bytes do próprio quadro. Erros de protocolo (quadro corrompido, versão
+desconhecida) recebem resposta com ``id`` 0 e a conexão é encerrada.
+
+Conexões que não começam com ``b"LS"`` são do protocolo antigo (texto puro,
+ex. ``"SNIP"`` ou ``"SNIP:freeform:3"``), lido até o cliente desconectar.
+
+Só usa a biblioteca padrão, para o cliente não precisar importar Qt.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .errors import IpcError
+
+MAGIC = b"LS"
+VERSION = 1
+HEADER = struct.Struct(">2sBI")
+MAX_FRAME = 16 * 1024 * 1024
+
+COMMANDS = ("snip", "editor", "capture-to-file", "capture-raw", "status", "stats", "quit")
+
+
+@dataclass
+class Message:
+    cmd: str
+    args: Dict[str, Any] = field(default_factory=dict)
+    id: Optional[int] = None
+
+
+def encode(payload: Dict[str, Any]) -> bytes:
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    if len(body) > MAX_FRAME:
+        raise IpcError(f"Mensagem IPC grande demais ({len(body)} bytes).")
+    return HEADER.pack(MAGIC, VERSION, len(body)) + body
+
+
+def encode_request(cmd: str, args: Optional[Dict[str, Any]] = None, id: Optional[int] = None) -> bytes:
+    payload: Dict[str, Any] = {"cmd": cmd, "args": args or {}}
+    if id is not None:
+        payload["id"] = id
+    return encode(payload)
+
+
+def encode_reply(id: int, result: Any = None, error: Optional[str] = None, fds: int = 0) -> bytes:
+    if error is not None:
+        return encode({"id": id, "ok": False, "error": error})
+    payload = {"id": id, "ok": True, "result": result}
+    if fds:
+        # Descritores seguem como SCM_RIGHTS junto dos bytes deste quadro
+        payload["fds"] = fds
+    return encode(payload)
+
+
+def parse_request(payload: Dict[str, Any]) -> Message:
+    cmd = payload.get("cmd")
+    args = payload.get("args", {})
+    request_id = payload.get("id")
+    if not isinstance(cmd, str) or not isinstance(args, dict):
+        raise IpcError("Pedido IPC sem 'cmd' ou com 'args' inválido.")
+    if request_id is not None and not isinstance(request_id, int):
+        raise IpcError("'id' do pedido IPC deve ser inteiro.")
+    return Message(cmd=cmd, args=args, id=request_id)
+
+
+def parse_legacy(text: str) -> Optional[Message]:
+    """``"SNIP[:modo[:delay]]"``, ``"EDITOR"`` ou ``"QUIT"`` -> ``Message``."""
+    cmd, *params = text.strip().split(":")
+    cmd = cmd.upper()
+    if cmd == "SNIP":
+        args: Dict[str, Any] = {}
+        if params and params[0]:
+            args["mode"] = params[0]
+        if len(params) > 1 and params[1].isdigit():
+            args["delay"] = int(params[1])
+        return Message("snip", args)
+    if cmd == "EDITOR":
+        return Message("editor")
+    if cmd == "QUIT":
+        return Message("quit")
+    return None
+
+
+class FrameDecoder:
+    """
+    Remonta quadros a partir de pedaços arbitrários do fluxo.
+
+    Escritas fragmentadas ou agrupadas pelo kernel não importam: ``feed``
+    acumula bytes e devolve só os quadros completos. Os primeiros bytes da
+    conexão decidem o modo: quadros ou texto antigo (``legacy``).
+    """
+
+    def __init__(self, max_frame: int = MAX_FRAME):
+        self.max_frame = max_frame
+        self.legacy: Optional[bool] = None
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        self._buffer += data
+        if self.legacy is None and len(self._buffer) >= len(MAGIC):
+            self.legacy = not self._buffer.startswith(MAGIC)
+        if self.legacy is not False:
+            return []
+
+        frames = []
+        while len(self._buffer) >= HEADER.size:
+            magic, version, size = HEADER.unpack_from(self._buffer)
+            if magic != MAGIC:
+                raise IpcError("Quadro IPC corrompido (assinatura inválida).")
+            if version != VERSION:
+                raise IpcError(f"Versão do protocolo IPC não suportada: {version}.")
+            if size > self.max_frame:
+                raise IpcError(f"Quadro IPC grande demais ({size} bytes).")
+            end = HEADER.size + size
+            if len(self._buffer) < end:
+                break
+            body = bytes(self._buffer[HEADER.size : end])
+            del self._buffer[:end]
+            try:
+                payload = json.loads(body.decode("utf-8"))
+            except (UnicodeDecodeError, ValueError) as exc:
+                raise IpcError(f"JSON inválido no quadro IPC: {exc}") from exc
+            if not isinstance(payload, dict):
+                raise IpcError("Quadro IPC deve conter um objeto JSON.")
+            frames.append(payload)
+        return frames
+
+    def finish(self) -> Optional[str]:
+        """Fim da conexão: devolve o texto acumulado se for do protocolo antigo."""
+        if self.legacy is False or not self._buffer:
+            return None
+        text = self._buffer.decode("utf-8", errors="replace")
+        self._buffer.clear()
+        return text
@@ -0,0 +1,120 @@
+"""
+Quadros brutos em memória compartilhada (memfd selado) para o IPC.
+
+O daemon copia os pixels capturados para um ``memfd``, sela o arquivo
+(nada mais pode escrever, crescer ou encolher) e passa o descritor ao cliente
+com ``SCM_RIGHTS``. O cliente mapeia o descritor só para leitura: sem
+codificar, decodificar ou passar pelo disco, e sem cópia do lado do cliente
+(``RawFrame.array()`` é uma view NumPy sobre o mapeamento).
+
+Só usa a biblioteca padrão (NumPy é importado sob demanda), para o cliente
+não precisar do Qt. Exige Linux (``memfd_create`` + selos).
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from .errors import IpcError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Ordem dos bytes na memória de Format_RGB32/ARGB32 (inteiros 0xAARRGGBB nativos)
+CHANNEL_ORDER = "BGRA" if sys.byteorder == "little" else "ARGB"
+
+
+def is_available() -> bool:
+    return hasattr(os, "memfd_create") and fcntl is not None and hasattr(fcntl, "F_ADD_SEALS")
+
+
+def sealed_memfd(data, name: str = "linsnipper-frame") -> int:
+    """
+    Cria um memfd com o conteúdo de ``data`` (buffer) e o sela contra escrita.
+
+    Devolve o descritor; quem chama fecha depois de enviá-lo.
+    """
+    if not is_available():
+        raise IpcError("memfd com selos indisponível nesta plataforma.")
+    fd = os.memfd_create(name, os.MFD_CLOEXEC | os.MFD_ALLOW_SEALING)
+    try:
+        view = memoryview(data).cast("B")
+        written = 0
+        while written < len(view):
+            written += os.write(fd, view[written:])
+        fcntl.fcntl(
+            fd,
+            fcntl.F_ADD_SEALS,
+            fcntl.F_SEAL_SHRINK | fcntl.F_SEAL_GROW | fcntl.F_SEAL_WRITE | fcntl.F_SEAL_SEAL,
+        )
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+@dataclass
+class RawFrame:
+    """
+    Quadro recebido do daemon: ``height`` linhas de ``stride`` bytes, 4 bytes
+    por pixel na ordem ``channels`` (``"BGRA"`` no x86).
+
+    Use como context manager ou chame ``close()``. Se ainda houver views de
+    ``array()``/``buffer`` vivas, o mapeamento só é liberado quando elas morrem.
+    """
+
+    width: int
+    height: int
+    stride: int
+    format: str
+    channels: str
+    _mmap: mmap.mmap
+
+    @classmethod
+    def from_fd(cls, fd: int, header: Dict[str, Any]) -> "RawFrame":
+        """Mapeia ``fd`` só para leitura (o descritor é fechado; o mapeamento fica)."""
+        try:
+            size = header["stride"] * header["height"]
+            if os.fstat(fd).st_size < size:
+                raise IpcError("memfd menor que o quadro anunciado.")
+            mapped = mmap.mmap(fd, size, flags=mmap.MAP_SHARED, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        return cls(
+            width=header["width"],
+            height=header["height"],
+            stride=header["stride"],
+            format=header["format"],
+            channels=header["channels"],
+            _mmap=mapped,
+        )
+
+    @property
+    def buffer(self) -> memoryview:
+        """Bytes do quadro (com o preenchimento de cada linha), sem cópia."""
+        return memoryview(self._mmap)
+
+    def array(self):
+        """View NumPy ``(height, width, 4)`` uint8 sobre o memfd, sem cópia."""
+        import numpy as np
+
+        rows = np.frombuffer(self._mmap, dtype=np.uint8).reshape(self.height, self.stride)
+        return rows[:, : self.width * 4].reshape(self.height, self.width, 4)
+
+    def close(self) -> None:
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # views exportadas ainda vivas; o GC libera o mapeamento depois
+
+    def __enter__(self) -> "RawFrame":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
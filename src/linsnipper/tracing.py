@@ -0,0 +1,242 @@
+"""
+Spans de tempo do caminho de captura (atalho → IPC → overlay → captura → editor).
+
+Uso::
+
+    from linsnipper import tracing
+
+    with tracing.span("capture.grab", backend="qt"):
+        ...
+
+Desligado por padrão: ``span()`` devolve um context manager vazio
+compartilhado, sem alocar nem medir nada. Liga com ``LINSNIPPER_TRACE=1`` ou
+``AppConfig.tracing``. Ligado, cada span vira uma linha JSON em
+``$XDG_CACHE_HOME/linsnipper/trace.jsonl`` e alimenta um histograma em memória,
+consultável com ``stats()``.
+
+Só usa a biblioteca padrão, para poder ser importado antes do Qt.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+TRACE_ENV = "LINSNIPPER_TRACE"
+TRACE_FILE = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "linsnipper" / "trace.jsonl"
+)
+
+# Limites superiores dos baldes em ms: 0.0625 ms .. ~65 s, dobrando a cada balde
+_BUCKET_BOUNDS_MS: List[float] = [0.0625 * 2**i for i in range(21)]
+
+
+class Histogram:
+    """Histograma de durações com baldes logarítmicos (percentis aproximados)."""
+
+    __slots__ = ("count", "total_ms", "min_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(_BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.min_ms = min(self.min_ms, duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.buckets[bisect.bisect_left(_BUCKET_BOUNDS_MS, duration_ms)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Limite superior do balde que contém o percentil ``q`` (0-100)."""
+        if not self.count:
+            return 0.0
+        target = max(1, round(self.count * q / 100))
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                bound = _BUCKET_BOUNDS_MS[index] if index < len(_BUCKET_BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "min_ms": self.min_ms if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": self.max_ms,
+        }
+
+
+class _Tracer:
+    def __init__(self):
+        self.enabled = os.environ.get(TRACE_ENV, "") not in ("", "0")
+        self.path: Optional[Path] = TRACE_FILE
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    def record(self, name: str, start: float, duration_ms: float, attrs: dict) -> None:
+        entry = {
+            "name": name,
+            "ts": round(start, 6),
+            "duration_ms": round(duration_ms, 3),
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+        }
+        if attrs:
+            entry["attrs"] = attrs
+        line = json.dumps(entry, default=str) + "\n"
+
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.add(duration_ms)
+            self._write(line)
+
+    def _write(self, line: str) -> None:
+        if self.path is None:
+            return
+        try:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.path.open("a", encoding="utf-8", buffering=1)
+            self._file.write(line)
+        except OSError as exc:
+            logger.warning("Falha ao gravar spans em %s: %s", self.path, exc)
+            self.path = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_tracer = _Tracer()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "_wall", "_start")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _tracer.record(self.name, self._wall, duration_ms, self.attrs)
+        return False
+
+    def set(self, **attrs) -> None:
+        """Acrescenta atributos descobertos durante o span."""
+        self.attrs.update(attrs)
+
+
+def span(name: str, **attrs):
+    """Mede o bloco ``with``; sem custo quando o tracing está desligado."""
+    if not _tracer.enabled:
+        return _NOOP
+    return _Span(name, attrs)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorador: mede cada chamada da função como o span ``name``."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def is_enabled() -> bool:
+    return _tracer.enabled
+
+
+def configure(enabled: Optional[bool] = None, path: Optional[Path] = TRACE_FILE) -> None:
+    """
+    Liga/desliga o tracing e define o arquivo JSONL (``None`` = só histograma).
+
+    ``enabled=None`` mantém o valor atual; ``LINSNIPPER_TRACE`` ligado sempre vence.
+    """
+    _tracer.close()
+    _tracer.path = path
+    if enabled is not None:
+        _tracer.enabled = bool(enabled) or os.environ.get(TRACE_ENV, "") not in ("", "0")
+
+
+def histogram(name: str) -> Optional[Histogram]:
+    return _tracer.histograms.get(name)
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """Resumo por span: contagem, média, mínimo, p50, p95 e máximo (ms)."""
+    with _tracer._lock:
+        return {name: hist.summary() for name, hist in sorted(_tracer.histograms.items())}
+
+
+def reset() -> None:
+    """Zera os histogramas em memória (o arquivo JSONL não é tocado)."""
+    with _tracer._lock:
+        _tracer.histograms.clear()
+
+
+@contextmanager
+def recording(path: Optional[Path] = None) -> Iterator[None]:
+    """Liga o tracing temporariamente (útil em testes e benchmarks)."""
+    previous = (_tracer.enabled, _tracer.path)
+    configure(True, path)
+    try:
+        yield
+    finally:
+        _tracer.close()
+        _tracer.enabled, _tracer.path = previous
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import stat
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from PySide6.QtCore import QByteArray, QCoreApplication, QMimeData, QUrl
+from PySide6.QtGui import QImage
+
+from .. import tracing
+from ..core.export_service import encode_image, write_atomic
+from ..core.format_policy import JPEG_QUALITY, WEBP_QUALITY, webp_available
+from ..core.png_encoder import ParallelPngEncoder
+from ..errors import ExportError
+
+logger = logging.getLogger(__name__)
+
+
+
+def _default_clipboard_dir() -> Path:
+    # Diretório por usuário: em /tmp compartilhado, outro usuário poderia criar
+    # o diretório antes e trocar o PNG apontado pelo text/uri-list
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / "linsnipper"
+    return Path(tempfile.gettempdir()) / f"linsnipper-{os.getuid()}"
+
+
+CLIPBOARD_DIR = _default_clipboard_dir()
+
+_IMAGE_FORMATS = {
+    "image/png": ("png", -1),
+    "image/jpeg": ("jpeg", JPEG_QUALITY),
+    "image/webp": ("webp", WEBP_QUALITY),
+}
+_QT_IMAGE = "application/x-qt-image"
+_URI_LIST = "text/uri-list"
+
+_generations = itertools.count(1)
+_exit_cleanup_dirs: set = set()
+
+
+def ensure_private_dir(directory: Path) -> Path:
+    """
+    Cria ``directory`` com modo 0700 ou confere o existente: precisa ser um
+    diretório de verdade (não link), do usuário atual e sem acesso de outros.
+    Levanta ``ExportError`` caso contrário.
+    """
+    try:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = os.lstat(directory)
+    except OSError as exc:
+        raise ExportError(f"Falha ao preparar {directory}: {exc}") from exc
+    if not stat.S_ISDIR(info.st_mode):
+        raise ExportError(f"{directory} não é um diretório.")
+    if info.st_uid != os.getuid():
+        raise ExportError(f"{directory} pertence a outro usuário (uid {info.st_uid}).")
+    if info.st_mode & 0o077:
+        raise ExportError(f"{directory} é acessível por outros usuários (modo {info.st_mode & 0o777:o}).")
+    return directory
+
+
+def purge_clipboard_files(directory: Path = CLIPBOARD_DIR) -> None:
+    """Apaga os PNGs temporários que conteúdos anteriores deixaram em ``directory``."""
+    if not directory.exists():
+        return
+    try:
+        ensure_private_dir(directory)
+    except ExportError as exc:
+        logger.warning("Limpeza da área de transferência ignorada: %s", exc)
+        return
+    for path in directory.glob("Screenshot_*.png"):
+        try:
+            path.unlink()
+        except OSError as exc:
+            logger.debug("Falha ao apagar %s: %s", path, exc)
+
+
+def _purge_on_exit(directory: Path) -> None:
+    app = QCoreApplication.instance()
+    if app is None or directory in _exit_cleanup_dirs:
+        return
+    _exit_cleanup_dirs.add(directory)
+    app.aboutToQuit.connect(lambda: purge_clipboard_files(directory))
+
+
+class LazyImageMimeData(QMimeData):
+    """
+    Conteúdo da área de transferência que só codifica sob demanda.
+
+    Oferece PNG, JPEG, WebP (se o Qt tiver o plugin), a imagem nativa do Qt
+    e um ``text/uri-list`` apontando para um PNG temporário. Copiar não
+    compõe nem codifica nada; cada formato é gerado na primeira vez que um
+    aplicativo o pede e fica em cache enquanto este conteúdo estiver na área
+    de transferência (uma "geração"; copiar de novo cria outra e apaga o PNG
+    temporário da anterior, assim como sair do aplicativo).
+
+    Falha ao gerar um formato vira valor vazio para quem pediu (e um aviso no
+    log), nunca uma exceção dentro do Qt.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[], QImage],
+        png_encoder: Optional[ParallelPngEncoder] = None,
+        directory: Path = CLIPBOARD_DIR,
+        png_palette: bool = False,
+    ):
+        super().__init__()
+        self.generation = next(_generations)
+        self._render = render
+        self._png_encoder = png_encoder
+        self._png_palette = png_palette
+        self._directory = directory
+        self._image: Optional[QImage] = None
+        self._cache: Dict[str, object] = {}
+        self._formats = [
+            *(mime for mime in _IMAGE_FORMATS if mime != "image/webp" or webp_available()),
+            _QT_IMAGE,
+            _URI_LIST,
+        ]
+        purge_clipboard_files(directory)
+        _purge_on_exit(directory)
+
+    # ------------- QMimeData -------------
+
+    def formats(self) -> List[str]:
+        return list(self._formats)
+
+    def hasFormat(self, mimetype: str) -> bool:
+        return mimetype in self._formats
+
+    def retrieveData(self, mimetype: str, preferred_type):
+        if mimetype not in self._formats:
+            return None
+        try:
+            return self._provide(mimetype)
+        except Exception:  # chamado pelo Qt: exceção aqui não chega a ninguém
+            logger.warning("Falha ao gerar %s para a área de transferência.", mimetype, exc_info=True)
+            return None
+
+    def _provide(self, mimetype: str):
+        if mimetype not in self._cache:
+            with tracing.span("clipboard.provide", mime=mimetype):
+                self._cache[mimetype] = self._produce(mimetype)
+            logger.debug("Área de transferência: %s gerado (geração %d).", mimetype, self.generation)
+        return self._cache[mimetype]
+
+    # ------------- Geração sob demanda -------------
+
+    def image(self) -> QImage:
+        """Resultado composto (calculado uma vez por geração)."""
+        if self._image is None:
+            self._image = self._render()
+        return self._image
+
+    def encoded(self, mimetype: str) -> bytes:
+        fmt, quality = _IMAGE_FORMATS[mimetype]
+        return encode_image(self.image(), fmt, quality, self._png_encoder, self._png_palette)
+
+    def _produce(self, mimetype: str):
+        if mimetype == _QT_IMAGE:
+            return self.image()
+        if mimetype == _URI_LIST:
+            # Lista de QUrl: o Qt converte para bytes quando pedem o texto cru
+            return [self._file_url()]
+        return QByteArray(self.encoded(mimetype))
+
+    def _file_url(self) -> QUrl:
+        png = self._provide("image/png")
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        path = ensure_private_dir(self._directory) / f"Screenshot_{stamp}_{self.generation}.png"
+        write_atomic(path, bytes(png.data()))
+        return QUrl.fromLocalFile(str(path))
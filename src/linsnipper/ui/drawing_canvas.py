@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from enum import Enum, auto
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
 from PySide6.QtWidgets import QWidget
-from PySide6.QtGui import QPainter, QPixmap, QPen, QColor, QMouseEvent
-from PySide6.QtCore import Qt, QPoint, Signal
+from PySide6.QtGui import QImage, QPainter, QPixmap, QPen, QColor, QMouseEvent
+from PySide6.QtCore import QRect, QRectF, Qt, QTimer, Signal
 
-from ..core.undo import UndoStack
+from ..core.annotations import AnnotationDocument, Stroke, paint_stroke
+from ..core.smoothing import OneEuroFilter
+from ..core.tile_undo import TileUndoStack
 
 
 class Tool(Enum):
@@ -17,10 +19,30 @@ class Tool(Enum):
     NONE = auto()
 
 
+_STROKE_TOOLS = {Tool.PEN: "pen", Tool.HIGHLIGHTER: "highlighter", Tool.ERASER: "eraser"}
+_FALLBACK_REFRESH_HZ = 60.0
+
+
 class DrawingCanvas(QWidget):
     """
     Canvas de desenho com suporte a camadas (Fundo + Anotações).
     Isso permite que a borracha apague apenas as anotações, preservando o fundo.
+
+    As anotações são traços vetoriais em ``document``; ``annotation_pixmap`` é
+    só o cache raster deles, pintado incrementalmente durante o traço. Cada
+    traço grava em ``_history`` os tiles que alterou no cache, e desfazer e
+    refazer só trocam esses tiles, sem repintar o documento.
+
+    A tela mostra ``_composite`` (fundo + anotações já compostos). Cada
+    mudança recompõe e agenda repintura só do retângulo afetado (segmento +
+    meia largura da caneta + margem de antialiasing); ``paintEvent`` copia
+    apenas ``event.rect()``.
+
+    Mouses e mesas de alta taxa mandam mais eventos do que a tela mostra: os
+    pontos só entram no documento durante o traço, e um timer no ritmo da
+    taxa de atualização da tela pinta o que chegou desde o último quadro
+    (um ``drawPolyline`` e um ``update(rect)`` por quadro, com a mesma caneta).
+    Com ``smoothing`` ligado, os pontos passam por um filtro 1€ antes.
     """
 
     stroke_finished = Signal()
@@ -44,12 +66,23 @@ class DrawingCanvas(QWidget):
         self.eraser_size = 20
         self.pen_width = 3
         self.highlight_width = 15
-
-        self._last_pos = QPoint()
-
-        # Undo stack armazena apenas a camada de anotação
-        self._undo_stack: UndoStack[QPixmap] = UndoStack(max_depth=50)
-        self._undo_stack.push(self.annotation_pixmap.copy())
+        self.smoothing = False
+
+        self.document = AnnotationDocument()
+        self._stroke: Optional[Stroke] = None
+        self._history = TileUndoStack()
+        self._stroke_pen = QPen()
+        self._painted = 0  # pontos do traço atual já pintados no cache
+        self._filter = OneEuroFilter()
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setTimerType(Qt.PreciseTimer)
+        self._frame_timer.timeout.connect(self._flush_stroke)
+
+        self._composite = QImage()
+        self._generation = 0
+        self._layer_keys = (0, 0)
+        self._result_pixmap: Tuple[int, Optional[QPixmap]] = (-1, None)
+        self._rebuild_composite()
 
         self.setMinimumSize(self.base_pixmap.size())
 
@@ -64,88 +97,206 @@ class DrawingCanvas(QWidget):
             self.annotation_pixmap = QPixmap(self.base_pixmap.size())
         
         self.annotation_pixmap.fill(Qt.transparent)
-        
-        self._undo_stack.clear()
-        self._undo_stack.push(self.annotation_pixmap.copy())
-        
+
+        self.document.clear()
+        self._history.clear()
+        self._stroke = None
+
+        self._rebuild_composite()
         self.setMinimumSize(self.base_pixmap.size())
         self.update()
 
     def set_tool(self, tool: Tool):
         self.current_tool = tool
 
+    @property
+    def result_generation(self) -> int:
+        """Muda sempre que o resultado (fundo + anotações) muda."""
+        self._ensure_composite()
+        return self._generation
+
+    def result_image(self) -> QImage:
+        """
+        Resultado atual (fundo + anotações) para salvar/copiar, sem compor nada.
+
+        É o próprio composite mantido pelos traços, compartilhado
+        implicitamente: custa O(1), e o canvas só copia o buffer se pintar de
+        novo enquanto alguém ainda segura o retrato.
+        """
+        self._ensure_composite()
+        return QImage(self._composite)
+
     def get_result_pixmap(self) -> QPixmap:
-        """Combina fundo e anotações para salvar/copiar."""
-        result = self.base_pixmap.copy()
-        painter = QPainter(result)
-        painter.drawPixmap(0, 0, self.annotation_pixmap)
-        painter.end()
-        return result
+        """Combina fundo e anotações para salvar/copiar (reaproveitado até a próxima mudança)."""
+        self._ensure_composite()
+        generation, pixmap = self._result_pixmap
+        if generation != self._generation or pixmap is None:
+            pixmap = QPixmap.fromImage(self._composite)
+            self._result_pixmap = (self._generation, pixmap)
+        return pixmap
+
+    def result_renderer(self) -> Callable[[], QImage]:
+        """
+        Retrato do resultado atual, para quem só precisa dele depois.
+
+        O retrato compartilha o composite (copy-on-write): novos traços não o
+        alteram (ex.: área de transferência, que só lê quando alguém cola).
+        """
+        snapshot = self.result_image()
+        return lambda: snapshot
 
     def undo(self):
-        prev = self._undo_stack.undo(self.annotation_pixmap.copy())
-        if prev is not None:
-            self.annotation_pixmap = prev
-            self.update()
+        if self._stroke is not None:
+            return
+        stroke = self.document.undo()
+        if stroke is None:
+            return
+        if self._history.undo(self.annotation_pixmap, key=stroke):
+            self._invalidate(stroke.bounding_rect())
+        else:
+            # Traço sem delta gravado (ex.: carregado de JSON): repinta tudo.
+            # Os deltas restantes descrevem um cache que deixou de existir.
+            self._history.clear()
+            self._rebuild_annotations()
 
     def redo(self):
-        nxt = self._undo_stack.redo(self.annotation_pixmap.copy())
-        if nxt is not None:
-            self.annotation_pixmap = nxt
-            self.update()
+        if self._stroke is not None:
+            return
+        stroke = self.document.redo()
+        if stroke is None:
+            return
+        if not self._history.redo(self.annotation_pixmap, key=stroke):
+            # Refazer só acrescenta um traço no topo: pinta por cima do cache
+            painter = QPainter(self.annotation_pixmap)
+            paint_stroke(painter, stroke)
+            painter.end()
+        self._invalidate(stroke.bounding_rect())
+
+    def annotations_json(self) -> str:
+        """Traços atuais serializados (ver ``AnnotationDocument.to_json``)."""
+        return self.document.to_json()
+
+    def load_annotations(self, text: str):
+        """Substitui as anotações pelos traços serializados em ``text``."""
+        self.document = AnnotationDocument.from_json(text)
+        self._history.clear()
+        self._stroke = None
+        self._rebuild_annotations()
+
+    def _rebuild_annotations(self):
+        """Repinta o cache raster a partir dos traços do documento."""
+        self.annotation_pixmap.fill(Qt.transparent)
+        painter = QPainter(self.annotation_pixmap)
+        for stroke in self.document.strokes:
+            paint_stroke(painter, stroke)
+        painter.end()
+        self._rebuild_composite()
+        self.update()
 
     # ------------- Eventos de mouse -------------
 
     def mousePressEvent(self, event: QMouseEvent):
-        if event.button() == Qt.LeftButton:
-            # Salva estado ANTES do novo traço
-            self._undo_stack.push(self.annotation_pixmap.copy())
-            self._last_pos = event.pos()
-
-    def mouseMoveEvent(self, event: QMouseEvent):
-        if not (event.buttons() & Qt.LeftButton):
+        if event.button() != Qt.LeftButton or self.current_tool not in _STROKE_TOOLS:
             return
-
-        painter = QPainter(self.annotation_pixmap)
-
         if self.current_tool == Tool.PEN:
-            pen = QPen(self.pen_color, self.pen_width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-            painter.setPen(pen)
-            painter.drawLine(self._last_pos, event.pos())
-
+            color, width = self.pen_color, self.pen_width
         elif self.current_tool == Tool.HIGHLIGHTER:
-            # Highlighter precisa de composição especial para não "lavar" a cor de baixo se passar por cima
-            # Mas na camada transparente, SourceOver padrão funciona bem, apenas somando a cor.
-            # Se quisermos efeito de marca-texto real sobre o fundo, precisaríamos de CompositionMode_Multiply 
-            # na hora de compor com o fundo, mas aqui estamos desenhando na camada de anotação.
-            pen = QPen(self.highlight_color, self.highlight_width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-            painter.setPen(pen)
-            painter.drawLine(self._last_pos, event.pos())
-
-        elif self.current_tool == Tool.ERASER:
-            # O segredo: Apagar na camada de anotação = Tornar transparente
-            painter.setCompositionMode(QPainter.CompositionMode_Clear)
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(Qt.black) # Cor não importa, pois Mode_Clear zera o pixel
-            r = self.eraser_size // 2
-            painter.drawEllipse(event.pos(), r, r)
+            color, width = self.highlight_color, self.highlight_width
+        else:
+            # Apagar na camada de anotação = tornar transparente; a cor não importa
+            color, width = QColor(Qt.black), self.eraser_size
+        self._stroke = self.document.begin_stroke(_STROKE_TOOLS[self.current_tool], color, width)
+        self._stroke_pen = self._stroke.pen()
+        self._painted = 0
+        self._filter.reset()
+        self._history.begin_step()
+        self._add_point(event)
+        self._frame_timer.start(self._frame_interval_ms())
 
-        painter.end()
-        self._last_pos = event.pos()
-        self.update()
+    def mouseMoveEvent(self, event: QMouseEvent):
+        if self._stroke is None or not (event.buttons() & Qt.LeftButton):
+            return
+        self._add_point(event)
 
     def mouseReleaseEvent(self, event: QMouseEvent):
-        if event.button() == Qt.LeftButton:
+        if event.button() == Qt.LeftButton and self._stroke is not None:
+            self._frame_timer.stop()
+            self._flush_stroke()
+            self._history.end_step(self.annotation_pixmap, key=self._stroke)
+            self._stroke = None
             self.stroke_finished.emit()
 
+    def _add_point(self, event: QMouseEvent):
+        """Guarda o ponto no traço; a pintura fica para o próximo quadro."""
+        pos = event.position()
+        x, y = pos.x(), pos.y()
+        if self.smoothing:
+            x, y = self._filter(event.timestamp() / 1000.0, x, y)
+        self.document.add_point(self._stroke, x, y)
+
+    def _flush_stroke(self):
+        """Pinta no cache os pontos que chegaram desde o último quadro."""
+        stroke = self._stroke
+        if stroke is None or self._painted >= len(stroke):
+            return
+        start, end = self._painted, len(stroke)
+        for index in range(start, end):
+            self._history.touch(self.annotation_pixmap, stroke.span_rect(index, index + 1))
+        painter = QPainter(self.annotation_pixmap)
+        paint_stroke(painter, stroke, start=start, pen=self._stroke_pen)
+        painter.end()
+        self._painted = end
+        self._invalidate(stroke.span_rect(start, end))
+
+    def _frame_interval_ms(self) -> int:
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return max(1, int(1000 / (rate if rate > 0 else _FALLBACK_REFRESH_HZ)))
+
     # ------------- Renderização -------------
 
+    def _rebuild_composite(self):
+        size = self.base_pixmap.size()
+        # Capturas opacas ficam em RGB32: o PNG salvo não ganha canal alfa
+        fmt = QImage.Format_ARGB32_Premultiplied if self.base_pixmap.hasAlphaChannel() else QImage.Format_RGB32
+        if self._composite.size() != size or self._composite.format() != fmt:
+            self._composite = QImage(size, fmt)
+        self._compose(self._composite.rect())
+
+    def _compose(self, rect: QRect):
+        """Recompõe ``rect`` do composite a partir das duas camadas."""
+        painter = QPainter(self._composite)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawPixmap(rect, self.base_pixmap, rect)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        painter.drawPixmap(rect, self.annotation_pixmap, rect)
+        painter.end()
+        self._generation += 1
+        self._layer_keys = self._current_layer_keys()
+
+    def _current_layer_keys(self) -> Tuple[int, int]:
+        # cacheKey muda sempre que o pixmap é alterado (inclusive por fora do canvas)
+        return self.base_pixmap.cacheKey(), self.annotation_pixmap.cacheKey()
+
+    def _ensure_composite(self):
+        """Recompõe tudo se alguém pintou nas camadas sem passar pelo canvas."""
+        if self._layer_keys != self._current_layer_keys():
+            self._rebuild_composite()
+
+    def _invalidate(self, rect: QRectF):
+        """Recompõe e agenda repintura só da área ``rect`` (coordenadas do canvas)."""
+        dirty = rect.toAlignedRect().intersected(self._composite.rect())
+        if dirty.isEmpty():
+            self._layer_keys = self._current_layer_keys()
+            return
+        self._compose(dirty)
+        self.update(dirty)
+
     def paintEvent(self, event):
+        self._ensure_composite()
+        rect = event.rect().intersected(self._composite.rect())
         painter = QPainter(self)
-        # 1. Desenha o fundo (screenshot)
-        painter.drawPixmap(0, 0, self.base_pixmap)
-        # 2. Desenha as anotações por cima
-        painter.drawPixmap(0, 0, self.annotation_pixmap)
+        painter.drawImage(rect, self._composite, rect)
         painter.end()
 
     def sizeHint(self):
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
+from pathlib import Path
 
 from PySide6.QtWidgets import (
     QMainWindow,
@@ -15,8 +16,14 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QKeySequence, QGuiApplication, QAction
 from PySide6.QtCore import Qt
 
+from .. import tracing
 from ..config import AppConfig
 from ..core.capture_service import CaptureService
+from ..core.export_service import ExportService
+from ..core.format_policy import FormatChoice, choose_format, format_from_suffix
+from ..core.png_encoder import create_png_encoder
+from ..errors import ExportError
+from .clipboard import LazyImageMimeData
 from .drawing_canvas import DrawingCanvas, Tool
 
 logger = logging.getLogger(__name__)
@@ -32,6 +39,7 @@ class EditorWindow(QMainWindow):
       - Copiar para área de transferência
     """
 
+    @tracing.traced("editor.init")
     def __init__(
         self,
         config: AppConfig,
@@ -48,12 +56,23 @@ class EditorWindow(QMainWindow):
 
         # Canvas central
         self.canvas = DrawingCanvas(pixmap=initial_pixmap)
+        self.canvas.smoothing = config.stroke_smoothing
         central = QWidget(self)
         layout = QHBoxLayout(central)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.canvas)
         self.setCentralWidget(central)
 
+        # Codificação/gravação em segundo plano; a edição continua livre
+        png_encoder = create_png_encoder(
+            config.png_encoder,
+            config.png_compression_level,
+            config.png_filter,
+        )
+        self.export_service = ExportService(self, png_encoder=png_encoder, png_palette=config.png_palette)
+        self.export_service.finished.connect(self._on_save_finished)
+        self.export_service.failed.connect(self._on_save_failed)
+
         self._create_toolbar()
         self.setStatusBar(QStatusBar(self))
 
@@ -114,46 +133,75 @@ class EditorWindow(QMainWindow):
         self.statusBar().showMessage(f"Ferramenta: {tool.name}", 2000)
 
     def _copy_to_clipboard(self):
-        pixmap = self.canvas.get_result_pixmap()
-        QGuiApplication.clipboard().setPixmap(pixmap)
+        # Nada é composto nem codificado aqui: só quando alguém colar
+        mime = LazyImageMimeData(
+            self.canvas.result_renderer(),
+            png_encoder=self.export_service.png_encoder,
+            png_palette=self.export_service.png_palette,
+        )
+        QGuiApplication.clipboard().setMimeData(mime)
         self.statusBar().showMessage("Copiado para a área de transferência", 2000)
 
-    def _default_filename(self) -> str:
+    def _default_filename(self, choice: FormatChoice | None = None) -> str:
         stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        return f"Screenshot_{stamp}.png"
+        extension = choice.extension if choice else "png"
+        return f"Screenshot_{stamp}.{extension}"
 
     def _save(self):
         """Salva direto na pasta padrão configurada (config.screenshots_path)."""
+        image = self.canvas.result_image()
+        choice = choose_format(image, self.config.output_format)
         target_dir = self.config.screenshots_path
-        filename = target_dir / self._default_filename()
-        pixmap = self.canvas.get_result_pixmap()
-
-        if not pixmap.save(str(filename)):
-            logger.error("Falha ao salvar imagem em %s", filename)
-            QMessageBox.warning(self, "Erro", "Falha ao salvar imagem.")
-        else:
-            logger.info("Imagem salva em %s", filename)
-            self.statusBar().showMessage(f"Salvo em {filename}", 5000)
+        self._start_save(image, target_dir / self._default_filename(choice), choice)
 
     def _save_as(self):
         """Diálogo de 'Salvar como...', permitindo mudar pasta e formato."""
-        start_path = self.config.screenshots_path / self._default_filename()
+        image = self.canvas.result_image()
+        choice = choose_format(image, self.config.output_format)
+        start_path = self.config.screenshots_path / self._default_filename(choice)
         filename, _ = QFileDialog.getSaveFileName(
             self,
             "Salvar captura",
             str(start_path),
-            "Imagens (*.png *.jpg *.jpeg)",
+            "Imagens (*.png *.jpg *.jpeg *.webp)",
         )
         if not filename:
             return
 
-        pixmap = self.canvas.get_result_pixmap()
-        if not pixmap.save(filename):
-            logger.error("Falha ao salvar imagem em %s", filename)
-            QMessageBox.warning(self, "Erro", "Falha ao salvar imagem.")
-        else:
-            logger.info("Imagem salva em %s", filename)
-            self.statusBar().showMessage(f"Salvo em {filename}", 5000)
+        # A extensão digitada pelo usuário manda; a sugestão só vale se bater
+        path = Path(filename)
+        chosen = format_from_suffix(path)
+        if chosen is not None and chosen != choice.format:
+            choice = choose_format(image, chosen)
+        elif chosen is None:
+            choice = None
+        self._start_save(image, path, choice)
+
+    def _start_save(self, image, filename: Path, choice: FormatChoice | None = None):
+        # A imagem é o composite do canvas (compartilhado); codificação e gravação vão pro pool
+        try:
+            self.export_service.save(
+                image,
+                filename,
+                fmt=choice.format if choice else None,
+                quality=choice.quality if choice else -1,
+            )
+        except ExportError as exc:
+            self._on_save_failed(0, str(exc))
+            return
+        self.statusBar().showMessage(f"Salvando {filename}…")
+
+    def _on_save_finished(self, _job_id: int, path: str):
+        self.statusBar().showMessage(f"Salvo em {path}", 5000)
+
+    def _on_save_failed(self, _job_id: int, message: str):
+        self.statusBar().clearMessage()
+        QMessageBox.warning(self, "Erro", f"Falha ao salvar imagem.\n\nDetalhes: {message}")
+
+    def closeEvent(self, event):
+        # Não perde salvamentos em andamento ao fechar a janela
+        self.export_service.wait_for_done()
+        super().closeEvent(event)
 
     def _undo(self):
         self.canvas.undo()
@@ -4,12 +4,14 @@ import logging
 from typing import List
 
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QVBoxLayout, QMessageBox
-from PySide6.QtCore import Qt, QRect, QPoint, Signal
-from PySide6.QtGui import QPainter, QColor, QPixmap, QGuiApplication, QPainterPath
+from PySide6.QtCore import Qt, QRect, QRectF, QPoint, Signal
+from PySide6.QtGui import QPainter, QColor, QGuiApplication, QPainterPath
 
+from .. import tracing
 from ..config import AppConfig
 from ..core.models import CaptureMode, CaptureRequest
 from ..core.capture_service import CaptureService
+from ..core.frame import VirtualDesktopFrame
 from ..errors import CaptureError
 
 logger = logging.getLogger(__name__)
@@ -27,6 +29,7 @@ class SnipOverlay(QWidget):
     # Emite o QPixmap final ou None se usuário cancelar/erro
     snip_finished = Signal(object)
 
+    @tracing.traced("overlay.init")
     def __init__(
         self,
         config: AppConfig,
@@ -54,7 +57,7 @@ class SnipOverlay(QWidget):
         self._end_pos = QPoint()
         self._freeform_points: List[QPoint] = []
 
-        self.full_screenshot: QPixmap = self._try_capture_preview()
+        self.preview_frame: VirtualDesktopFrame = self._try_capture_preview()
 
         self._build_ui()
 
@@ -100,17 +103,18 @@ class SnipOverlay(QWidget):
         self.snip_finished.emit(None)
         self.close()
 
-    def _try_capture_preview(self) -> QPixmap:
+    @tracing.traced("overlay.preview_grab")
+    def _try_capture_preview(self) -> VirtualDesktopFrame:
         """
-        Captura uma screenshot para servir de fundo do overlay.
-        Se falhar, retorna um pixmap vazio e avisa o usuário,
+        Captura uma screenshot (um tile por tela) para servir de fundo do overlay.
+        Se falhar, retorna um quadro vazio e avisa o usuário,
         mas ainda permite tentar a captura real depois.
         """
         try:
-            pix = self.capture_service.backend.capture_fullscreen()
-            if pix.isNull():
-                raise CaptureError("Pixmap nulo na captura de pré-visualização.")
-            return pix
+            frame = self.capture_service.backend.capture_frame()
+            if frame.isNull():
+                raise CaptureError("Quadro nulo na captura de pré-visualização.")
+            return frame
         except CaptureError as exc:
             logger.exception("Falha ao capturar pré-visualização de tela.")
             QMessageBox.warning(
@@ -120,10 +124,19 @@ class SnipOverlay(QWidget):
                 "A captura em si ainda será tentada.\n\n"
                 f"Detalhes: {exc}",
             )
-            return QPixmap()
+            return VirtualDesktopFrame([])
 
     # ------------- Captura usando o serviço -------------
 
+    def _use_frozen_frame(self, request: CaptureRequest) -> bool:
+        # Com delay o usuário quer preparar a tela (abrir menus etc.), então o
+        # quadro congelado não serve: cai para a captura ao vivo.
+        return (
+            self.config.capture_source == "frozen"
+            and request.delay_seconds == 0
+            and not self.preview_frame.isNull()
+        )
+
     def _capture_fullscreen(self):
         request = CaptureRequest(
             mode=CaptureMode.FULLSCREEN,
@@ -139,33 +152,63 @@ class SnipOverlay(QWidget):
     ):
         """
         Esconde o overlay, roda a captura via CaptureService e devolve o QPixmap.
+
+        No modo "frozen" (padrão, sem delay) a seleção é recortada da própria
+        pré-visualização, sem esconder o overlay nem capturar a tela de novo.
+        Em ambos os casos o processamento roda fora da thread de GUI e o
+        resultado chega por ``Future``.
         """
-        def _before_capture():
-            # Esconde overlay antes da captura real pra não sair no screenshot
-            self.hide()
-            QGuiApplication.processEvents()
+        if self._use_frozen_frame(request):
+            future = self.capture_service.capture_async(
+                request,
+                selection_rect,
+                frame=self.preview_frame,
+            )
+            future.add_done_callback(
+                lambda fut: self._on_frozen_capture_done(fut, request, selection_rect)
+            )
+            return
 
-        def _on_success(result):
-            self.snip_finished.emit(result.pixmap)
-            self.close()
+        self._start_live_capture(request, selection_rect)
 
-        def _on_error(exc: CaptureError):
-            logger.exception("Falha na captura: %s", exc)
+    def _on_frozen_capture_done(self, future, request: CaptureRequest, selection_rect: QRect | None):
+        exc = future.exception()
+        if exc is None:
+            self._finish_capture(future.result().pixmap)
+            return
+        logger.error("Falha na captura congelada (%s); tentando captura ao vivo.", exc)
+        self._start_live_capture(request, selection_rect)
+
+    def _start_live_capture(self, request: CaptureRequest, selection_rect: QRect | None):
+        def _before_capture():
+            # Esconde overlay antes da captura real pra não sair no screenshot
+            with tracing.span("overlay.hide"):
+                self.hide()
+                QGuiApplication.processEvents()
+
+        def _on_done(future):
+            exc = future.exception()
+            if exc is None:
+                self._finish_capture(future.result().pixmap)
+                return
+            logger.error("Falha na captura: %s", exc)
             QMessageBox.critical(
                 self,
                 "Erro de captura",
                 f"Falha ao capturar a tela.\n\nDetalhes: {exc}",
             )
-            self.snip_finished.emit(None)
-            self.close()
+            self._finish_capture(None)
 
-        self.capture_service.perform_capture(
+        future = self.capture_service.capture_async(
             request,
-            selection_rect=selection_rect,
+            selection_rect,
             before_capture=_before_capture,
-            on_finished=_on_success,
-            on_error=_on_error,
         )
+        future.add_done_callback(_on_done)
+
+    def _finish_capture(self, pixmap):
+        self.snip_finished.emit(pixmap)
+        self.close()
 
     # ------------- Eventos de mouse -------------
 
@@ -256,12 +299,29 @@ class SnipOverlay(QWidget):
 
     # ------------- Renderização -------------
 
+    def _paint_preview(self, painter: QPainter, dirty: QRect):
+        frame = self.preview_frame
+        frame_size = frame.size()
+        sx = self.width() / frame_size.width()
+        sy = self.height() / frame_size.height()
+
+        # Área suja em coordenadas do quadro (a pré-visualização é escalada para o widget)
+        dirty_in_frame = QRectF(
+            dirty.x() / sx, dirty.y() / sy, dirty.width() / sx, dirty.height() / sy
+        ).toAlignedRect()
+
+        origin = frame.geometry.topLeft()
+        for tile in frame.tiles_in(dirty_in_frame):
+            geom = tile.geometry.translated(-origin)
+            target = QRectF(geom.x() * sx, geom.y() * sy, geom.width() * sx, geom.height() * sy)
+            painter.drawImage(target, tile.image)
+
     def paintEvent(self, event):
         painter = QPainter(self)
 
-        # Fundo: screenshot, se existir
-        if not self.full_screenshot.isNull():
-            painter.drawPixmap(self.rect(), self.full_screenshot)
+        # Fundo: screenshot, se existir (apenas os tiles da área a repintar)
+        if not self.preview_frame.isNull():
+            self._paint_preview(painter, event.rect())
 
         # Escurece tudo
         painter.fillRect(self.rect(), QColor(0, 0, 0, 120))
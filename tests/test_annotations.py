@@ -0,0 +1,277 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QPointF, Qt
+from PySide6.QtGui import QColor, QMouseEvent, QPainter, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.core.annotations import AnnotationDocument, Stroke
+from linsnipper.core.smoothing import OneEuroFilter
+from linsnipper.ui.drawing_canvas import DrawingCanvas, Tool
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+def _mouse(kind, x, y, buttons=Qt.LeftButton):
+    button = Qt.LeftButton if kind != QEvent.MouseMove else Qt.NoButton
+    pos = QPointF(x, y)
+    return QMouseEvent(kind, pos, pos, button, buttons, Qt.NoModifier)
+
+
+def _drag(canvas, points):
+    (x, y), *rest = points
+    canvas.mousePressEvent(_mouse(QEvent.MouseButtonPress, x, y))
+    for x, y in rest:
+        canvas.mouseMoveEvent(_mouse(QEvent.MouseMove, x, y))
+    canvas.mouseReleaseEvent(_mouse(QEvent.MouseButtonRelease, x, y, Qt.NoButton))
+
+
+def _canvas(color=Qt.white):
+    bg = QPixmap(100, 100)
+    bg.fill(color)
+    return DrawingCanvas(pixmap=bg)
+
+
+def test_document_undo_redo_are_list_operations():
+    doc = AnnotationDocument()
+    first = doc.begin_stroke("pen", QColor(Qt.red), 3)
+    doc.add_point(first, 1, 2)
+    second = doc.begin_stroke("eraser", QColor(Qt.black), 20)
+
+    assert doc.undo() is second
+    assert doc.strokes == [first] and doc.can_redo()
+    assert doc.redo() is second
+    assert doc.undo() is second
+
+    # Novo traço descarta o que havia para refazer
+    doc.begin_stroke("highlighter", QColor(255, 255, 0, 120), 15)
+    assert not doc.can_redo()
+    assert doc.redo() is None
+
+
+def test_document_json_roundtrip():
+    doc = AnnotationDocument()
+    stroke = doc.begin_stroke("highlighter", QColor(255, 255, 0, 120), 15)
+    for x, y in [(0, 0), (10.5, 4.25), (20, 8)]:
+        doc.add_point(stroke, x, y)
+
+    loaded = AnnotationDocument.from_json(doc.to_json())
+
+    (copy,) = loaded.strokes
+    assert copy == stroke
+    assert QColor.fromRgba(copy.color) == QColor(255, 255, 0, 120)
+    assert doc.nbytes() == 6 * 4
+
+
+def test_document_rejects_unknown_version_and_tool():
+    with pytest.raises(ValueError):
+        AnnotationDocument.from_json('{"version": 99, "strokes": []}')
+    with pytest.raises(ValueError):
+        Stroke(tool="spray", color=0, width=1)
+
+
+def test_stroke_bounding_rect_includes_pen_width():
+    stroke = Stroke(tool="pen", color=0xFFFF0000, width=10)
+    stroke.add_point(20, 30)
+    stroke.add_point(40, 50)
+
+    rect = stroke.bounding_rect()
+
+    assert rect.left() <= 15 and rect.top() <= 25
+    assert rect.right() >= 45 and rect.bottom() >= 55
+
+
+def test_canvas_records_strokes_and_undo_restores_pixels(qapp):
+    canvas = _canvas()
+    canvas.set_tool(Tool.PEN)
+    _drag(canvas, [(10, 50), (50, 50), (90, 50)])
+
+    (stroke,) = canvas.document.strokes
+    assert len(stroke) == 3
+    assert canvas.get_result_pixmap().toImage().pixelColor(50, 50) == canvas.pen_color
+
+    canvas.undo()
+    assert canvas.get_result_pixmap().toImage().pixelColor(50, 50) == QColor(Qt.white)
+
+    canvas.redo()
+    assert canvas.get_result_pixmap().toImage().pixelColor(50, 50) == canvas.pen_color
+
+
+def test_canvas_eraser_stroke_is_undoable(qapp):
+    canvas = _canvas(Qt.blue)
+    canvas.pen_width = 40
+    _drag(canvas, [(0, 50), (100, 50)])
+    canvas.set_tool(Tool.ERASER)
+    _drag(canvas, [(50, 30), (50, 70)])
+
+    assert canvas.get_result_pixmap().toImage().pixelColor(50, 50) == QColor(Qt.blue)
+    canvas.undo()
+    assert canvas.get_result_pixmap().toImage().pixelColor(50, 50) == canvas.pen_color
+
+
+def test_canvas_replay_matches_live_painting(qapp):
+    canvas = _canvas()
+    _drag(canvas, [(10, 10), (40, 60), (90, 20)])
+    canvas.set_tool(Tool.HIGHLIGHTER)
+    _drag(canvas, [(5, 90), (95, 90)])
+    live = canvas.annotation_pixmap.toImage()
+
+    other = _canvas()
+    other.load_annotations(canvas.annotations_json())
+
+    replayed = other.annotation_pixmap.toImage()
+    # Só o antialiasing das junções pode diferir da pintura incremental
+    differing = sum(
+        1
+        for x in range(100)
+        for y in range(100)
+        if abs(replayed.pixelColor(x, y).alpha() - live.pixelColor(x, y).alpha()) > 8
+    )
+    assert differing < 100
+
+
+def test_set_pixmap_clears_document(qapp):
+    canvas = _canvas()
+    _drag(canvas, [(10, 10), (20, 20)])
+
+    canvas.set_pixmap(QPixmap(50, 50))
+
+    assert canvas.document.strokes == []
+    assert not canvas.document.can_undo()
+
+
+def test_canvas_repaints_only_dirty_rect(qapp):
+    canvas = _canvas()
+    canvas.pen_width = 4
+    updates = []
+    canvas.update = lambda *args: updates.append(args)
+
+    canvas.mousePressEvent(_mouse(QEvent.MouseButtonPress, 10, 10))
+    canvas.mouseMoveEvent(_mouse(QEvent.MouseMove, 30, 12))
+    canvas._flush_stroke()
+    canvas.mouseMoveEvent(_mouse(QEvent.MouseMove, 32, 40))
+    canvas.mouseReleaseEvent(_mouse(QEvent.MouseButtonRelease, 32, 40, Qt.NoButton))
+
+    (first,), (second,) = updates
+    assert first.contains(10, 10) and first.contains(30, 12)
+    assert first.width() < 40 and first.height() < 20
+    # Só o segmento novo (30,12)->(32,40)
+    assert not second.contains(10, 10)
+    assert second.width() < 15
+
+
+def test_canvas_coalesces_points_until_next_frame(qapp):
+    canvas = _canvas()
+    canvas.mousePressEvent(_mouse(QEvent.MouseButtonPress, 10, 50))
+    for x in range(12, 90, 2):
+        canvas.mouseMoveEvent(_mouse(QEvent.MouseMove, x, 50))
+
+    assert len(canvas.document.strokes[0]) == 40
+    assert canvas.annotation_pixmap.toImage().pixelColor(50, 50).alpha() == 0
+
+    canvas._flush_stroke()
+    assert canvas.annotation_pixmap.toImage().pixelColor(50, 50) == canvas.pen_color
+    canvas.mouseReleaseEvent(_mouse(QEvent.MouseButtonRelease, 88, 50, Qt.NoButton))
+    assert not canvas._frame_timer.isActive()
+
+
+def test_one_euro_filter_reduces_jitter():
+    jitter = [(-1) ** i * 2.0 for i in range(200)]
+    smooth = OneEuroFilter()
+    filtered = [smooth(i / 500, i * 0.5, 50 + j)[1] for i, j in enumerate(jitter)]
+
+    assert max(abs(y - 50) for y in filtered[150:]) < 0.5
+    # Movimento rápido: pouco atraso
+    smooth.reset()
+    xs = [smooth(i / 500, i * 10.0, 0)[0] for i in range(100)]
+    assert xs[-1] > 990 - 40
+
+
+def test_canvas_smoothing_filters_points(qapp):
+    canvas = _canvas()
+    canvas.smoothing = True
+    _drag(canvas, [(10, 50), (20, 54), (30, 46), (40, 54), (50, 46)])
+
+    ys = canvas.document.strokes[0].points[1::2]
+    assert max(ys) - min(ys) < 8
+
+
+def test_canvas_paints_from_composite(qapp):
+    canvas = _canvas(Qt.blue)
+    _drag(canvas, [(10, 50), (90, 50)])
+
+    shown = canvas.grab().toImage()
+
+    assert shown.pixelColor(50, 50) == canvas.pen_color
+    assert shown.pixelColor(50, 90) == QColor(Qt.blue)
+    canvas.undo()
+    assert canvas.grab().toImage().pixelColor(50, 50) == QColor(Qt.blue)
+
+
+def test_result_image_reuses_composite_until_change(qapp):
+    canvas = _canvas(Qt.blue)
+    generation = canvas.result_generation
+    first = canvas.result_image()
+
+    assert canvas.result_image().cacheKey() == first.cacheKey()
+    assert canvas.get_result_pixmap().cacheKey() == canvas.get_result_pixmap().cacheKey()
+    assert canvas.result_generation == generation
+
+    _drag(canvas, [(10, 50), (90, 50)])
+
+    assert canvas.result_generation != generation
+    after = canvas.result_image()
+    assert after.pixelColor(50, 50) == canvas.pen_color
+    # O retrato anterior não muda com o traço novo
+    assert first.pixelColor(50, 50) == QColor(Qt.blue)
+    assert not after.hasAlphaChannel()
+
+
+def test_renderer_snapshot_ignores_later_strokes(qapp):
+    canvas = _canvas()
+    render = canvas.result_renderer()
+
+    _drag(canvas, [(10, 50), (90, 50)])
+
+    assert render().pixelColor(50, 50) == QColor(Qt.white)
+    assert canvas.result_renderer()().pixelColor(50, 50) == canvas.pen_color
+
+
+def test_external_layer_edits_invalidate_composite(qapp):
+    canvas = _canvas()
+    generation = canvas.result_generation
+
+    painter = QPainter(canvas.annotation_pixmap)
+    painter.fillRect(0, 0, 10, 10, Qt.red)
+    painter.end()
+
+    assert canvas.result_generation != generation
+    assert canvas.result_image().pixelColor(5, 5) == QColor(Qt.red)
+
+
+def test_undo_past_loaded_strokes_keeps_history_in_sync(qapp):
+    source = _canvas()
+    _drag(source, [(10, 20), (90, 20)])  # A
+    _drag(source, [(10, 50), (90, 50)])  # B
+    canvas = _canvas()
+    canvas.load_annotations(source.annotations_json())
+
+    _drag(canvas, [(10, 80), (90, 80)])  # C, com delta de tiles
+    canvas.undo()  # C (delta)
+    canvas.undo()  # B (sem delta: repinta)
+    canvas.redo()  # B de novo; não pode aplicar os tiles de C
+
+    result = canvas.result_image()
+    assert result.pixelColor(50, 20) == canvas.pen_color
+    assert result.pixelColor(50, 50) == canvas.pen_color
+    assert result.pixelColor(50, 80) == QColor(Qt.white)
+
+    canvas.redo()  # C
+    assert canvas.result_image().pixelColor(50, 80) == canvas.pen_color
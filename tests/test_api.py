@@ -0,0 +1,88 @@
+import gc
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QApplication
+
+import linsnipper
+from linsnipper.core.frame import VirtualDesktopFrame
+from linsnipper.core.interfaces import BaseCaptureBackend
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+class PatternBackend(BaseCaptureBackend):
+    """Tela 200x100 com bytes conhecidos; conta as capturas."""
+
+    name = "pattern"
+
+    def __init__(self):
+        data = bytes(i % 253 for i in range(200 * 100 * 4))
+        self.image = QImage(data, 200, 100, QImage.Format_RGB32).copy()
+        self.grabs = 0
+
+    def capture_fullscreen(self):
+        return QPixmap.fromImage(self.image)
+
+    def capture_frame(self):
+        self.grabs += 1
+        return VirtualDesktopFrame.from_image(self.image, self.name)
+
+    def capture_region(self, rect):
+        self.grabs += 1
+        return QPixmap.fromImage(self.image.copy(rect))
+
+    def capture_window(self, window_id=None):
+        raise NotImplementedError
+
+
+def _expected(backend, x, y, w, h):
+    full = np.frombuffer(backend.image.constBits(), np.uint8).reshape(100, 200, 4)
+    return full[y : y + h, x : x + w]
+
+
+def test_capture_returns_numpy_view_without_copy(qapp):
+    backend = PatternBackend()
+    result = linsnipper.capture((10, 20, 30, 40), backend=backend)
+
+    assert result.pixmap is None and result.backend_name == "pattern"
+    pixels = result.to_numpy()
+    assert pixels.shape == (40, 30, 4) and not pixels.flags.writeable and not pixels.flags.owndata
+    assert (pixels == _expected(backend, 10, 20, 30, 40)).all()
+    assert len(result.buffer()) == result.image.sizeInBytes()
+
+    # A view mantém a imagem viva mesmo sem o resultado
+    del result
+    gc.collect()
+    assert (pixels == _expected(backend, 10, 20, 30, 40)).all()
+
+
+def test_capture_regions_uses_a_single_grab(qapp):
+    backend = PatternBackend()
+    regions = [(0, 0, 10, 10), QRect(50, 25, 64, 32), (190, 90, 10, 10)]
+
+    results = linsnipper.capture_regions(regions, backend=backend)
+
+    assert backend.grabs == 1
+    for result, (x, y, w, h) in zip(results, [(0, 0, 10, 10), (50, 25, 64, 32), (190, 90, 10, 10)]):
+        assert (result.to_numpy() == _expected(backend, x, y, w, h)).all()
+
+
+def test_package_import_stays_lazy():
+    import subprocess
+    import sys
+
+    code = "import sys, linsnipper; print('PySide6.QtGui' in sys.modules, callable(linsnipper.capture))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert out.stdout.split() == ["False", "True"], out.stderr
@@ -0,0 +1,140 @@
+import dataclasses
+import os
+import threading
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from linsnipper import app as app_module
+from linsnipper import shm_frame
+from linsnipper.app import LinSnipperController
+from linsnipper.config import AppConfig
+from linsnipper.core.interfaces import BaseCaptureBackend
+from linsnipper.errors import IpcError
+from linsnipper.ipc_client import IpcClient
+
+from .test_ipc_client import _in_thread
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def controller(qapp):
+    config = dataclasses.replace(AppConfig.default(), capture_backend="qt")
+    controller = LinSnipperController(qapp, config, server_name=f"linsnipper_app_test_{os.getpid()}")
+    assert controller.ipc_server.start()
+    yield controller
+    controller.ipc_server.server.close()
+    controller.export_service.wait_for_done()
+
+
+def test_capture_to_file_replies_after_writing(controller, tmp_path):
+    target = tmp_path / "shot.jpg"
+
+    def _client():
+        with IpcClient(controller.ipc_server.server_name, timeout=10) as client:
+            status = client.send("status")
+            capture = client.send("capture-to-file", path=str(target), mode="region", geometry=[0, 0, 64, 48])
+            return client.receive(capture), client.receive(status)
+
+    capture, status = _in_thread(_client)
+    assert capture == {"path": str(target), "format": "jpeg"}
+    assert QImage(str(target)).size().toTuple() == (64, 48)
+    assert status["backend"] == "qt" and status["pid"] == os.getpid()
+
+
+def test_invalid_requests_get_error_replies(controller):
+    def _client():
+        errors = []
+        with IpcClient(controller.ipc_server.server_name, timeout=10) as client:
+            for cmd, args in [("snip", {"mode": "oval"}), ("teleport", {}), ("capture-to-file", {})]:
+                try:
+                    client.call(cmd, **args)
+                except IpcError as exc:
+                    errors.append(str(exc))
+            stats = client.call("stats")
+        return errors, stats
+
+    errors, stats = _in_thread(_client)
+    assert len(errors) == 3 and "oval" in errors[0] and "teleport" in errors[1]
+    assert set(stats) == {"enabled", "spans"}
+
+
+@pytest.mark.skipif(not shm_frame.is_available(), reason="memfd com selos requer Linux")
+def test_capture_raw_hands_over_pixels_without_copy(controller, monkeypatch):
+    # Padrão conhecido (a tela offscreen não tem conteúdo determinístico)
+    pattern = bytes(i % 251 for i in range(64 * 48 * 4))
+    expected = QImage(pattern, 64, 48, QImage.Format_RGB32).copy()
+    monkeypatch.setattr(controller.capture_service.backend, "capture_region", lambda rect: QPixmap.fromImage(expected))
+
+    def _client():
+        with IpcClient(controller.ipc_server.server_name, timeout=10) as client:
+            frame = client.capture_raw(mode="region", geometry=[0, 0, 64, 48])
+            pixels = frame.array()
+            return frame, pixels
+
+    frame, pixels = _in_thread(_client)
+    assert (frame.width, frame.height, frame.channels) == (64, 48, shm_frame.CHANNEL_ORDER)
+    assert pixels.shape == (48, 64, 4) and not pixels.flags.writeable
+    # View sobre o mapeamento: nenhum buffer próprio do NumPy
+    assert pixels.base is not None and not pixels.flags.owndata
+    assert bytes(frame.buffer) == bytes(expected.constBits())
+    del pixels
+    frame.close()
+
+
+class _FakeBackend(BaseCaptureBackend):
+    name = "fast"
+
+    def capture_fullscreen(self):
+        return QPixmap(4, 4)
+
+    def capture_region(self, rect):
+        return QPixmap(rect.size())
+
+    def capture_window(self, window_id=None):
+        return QPixmap(4, 4)
+
+
+def _wait_until(predicate, timeout_ms=5000):
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.timeout.connect(lambda: loop.quit() if predicate() else None)
+    timer.start(5)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    if not predicate():
+        loop.exec()
+    timer.stop()
+    return predicate()
+
+
+def test_new_monitor_layout_is_probed_off_the_gui_thread(controller, monkeypatch):
+    controller.config = dataclasses.replace(controller.config, capture_backend="auto")
+    probed = threading.Event()
+    calls = []
+
+    def _select(factories, *, layout, probe=True):
+        calls.append((probe, threading.current_thread() is threading.main_thread()))
+        if not probe:
+            return None  # arranjo sem vencedor em cache
+        probed.wait(5)
+        return "fast"
+
+    monkeypatch.setattr(app_module, "available_backends", lambda: {"qt": object, "fast": _FakeBackend})
+    monkeypatch.setattr(app_module, "select_fastest_backend", _select)
+
+    controller._on_screens_changed()
+    # O teste roda no pool: a GUI segue com o backend atual até o resultado
+    assert controller.capture_service.backend.name == "qt"
+    probed.set()
+    assert _wait_until(lambda: controller.capture_service.backend.name == "fast")
+    assert calls == [(False, True), (True, False)]
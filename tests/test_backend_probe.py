@@ -0,0 +1,122 @@
+import json
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.core.frame import VirtualDesktopFrame
+from linsnipper.core.interfaces import BaseCaptureBackend
+from linsnipper.infra.backend_probe import is_black_frame, layout_key, select_fastest_backend
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _factory(name, delay, color=Qt.white, fail=False, calls=None):
+    class _Backend(BaseCaptureBackend):
+        def capture_frame(self):
+            if calls is not None:
+                calls.append(name)
+            if fail:
+                raise RuntimeError("sem permissão")
+            time.sleep(delay)
+            image = QImage(40, 30, QImage.Format_RGB32)
+            image.fill(color)
+            return VirtualDesktopFrame.from_image(image)
+
+        def capture_fullscreen(self):
+            return QPixmap.fromImage(self.capture_frame().flatten())
+
+        def capture_region(self, rect):
+            return self.capture_fullscreen().copy(rect)
+
+        def capture_window(self, window_id=None):
+            raise NotImplementedError
+
+    _Backend.name = name
+    return _Backend
+
+
+def test_black_frame_detection(qapp):
+    black = QImage(100, 100, QImage.Format_RGB32)
+    black.fill(Qt.black)
+    assert is_black_frame(black)
+
+    assert is_black_frame(QImage())
+    assert not is_black_frame(_factory("x", 0)().capture_frame().flatten())
+
+
+def test_fastest_valid_backend_wins_and_is_cached(qapp, tmp_path):
+    cache_file = tmp_path / "probe.json"
+    calls = []
+    factories = {
+        "fast_black": _factory("fast_black", 0.0, color=Qt.black, calls=calls),
+        "broken": _factory("broken", 0.0, fail=True, calls=calls),
+        "slow": _factory("slow", 0.02, calls=calls),
+        "fast": _factory("fast", 0.001, calls=calls),
+    }
+    layout = ["A@0,0,1920x1080*1"]
+
+    assert select_fastest_backend(factories, cache_file=cache_file, layout=layout, runs=2) == "fast"
+
+    data = json.loads(cache_file.read_text())
+    entry = data[layout_key(layout)]
+    assert entry["backend"] == "fast"
+    assert {r["backend"] for r in entry["results"]} == set(factories)
+
+    # Mesmo arranjo: vem do cache, sem novas capturas
+    calls.clear()
+    assert select_fastest_backend(factories, cache_file=cache_file, layout=layout) == "fast"
+    assert calls == []
+
+    # Arranjo novo: testa de novo
+    select_fastest_backend(factories, cache_file=cache_file, layout=layout + ["B@1920,0,1280x1024*1"])
+    assert calls
+
+
+def test_no_usable_backend_returns_none(qapp, tmp_path):
+    factories = {"broken": _factory("broken", 0.0, fail=True)}
+    assert select_fastest_backend(factories, cache_file=tmp_path / "p.json", layout=[]) is None
+
+
+def test_probe_closes_backends_and_hotplug_only_reads_cache(qapp, tmp_path):
+    closed = []
+    factories = {}
+    for name, delay in (("slow", 0.02), ("fast", 0.001)):
+        backend_cls = _factory(name, delay)
+        backend_cls.close = lambda self, name=name: closed.append(name)
+        factories[name] = backend_cls
+    cache_file = tmp_path / "probe.json"
+
+    assert select_fastest_backend(factories, cache_file=cache_file, layout=["A"], runs=1) == "fast"
+    assert sorted(closed) == ["fast", "slow"]
+
+    # Arranjo ainda não testado: sem probe, nada de capturas
+    closed.clear()
+    assert select_fastest_backend(factories, cache_file=cache_file, layout=["B"], probe=False) is None
+    assert closed == []
+    assert select_fastest_backend(factories, cache_file=cache_file, layout=["A"], probe=False) == "fast"
+
+
+def test_available_backends_respects_session_type(qapp, monkeypatch):
+    from linsnipper.infra import backends
+    from linsnipper.infra.portal_capture_backend import PortalCaptureBackend
+
+    monkeypatch.setattr(backends.XShmCaptureBackend, "is_available", classmethod(lambda cls: True))
+    monkeypatch.setattr(PortalCaptureBackend, "is_available", classmethod(lambda cls: True))
+
+    monkeypatch.setenv("XDG_SESSION_TYPE", "x11")
+    assert set(backends.available_backends()) == {"xshm", "qt"}
+    monkeypatch.setenv("XDG_SESSION_TYPE", "wayland")
+    assert set(backends.available_backends()) == {"portal", "qt"}
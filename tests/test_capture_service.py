@@ -6,11 +6,12 @@ import unittest
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
 try:
-    from PySide6.QtCore import QEventLoop
+    from PySide6.QtCore import QEventLoop, QRect, QThread, QTimer
     from PySide6.QtWidgets import QApplication
-    from PySide6.QtGui import QPixmap
+    from PySide6.QtGui import QImage, QPixmap
 
     from linsnipper.core.capture_service import CaptureService
+    from linsnipper.core.frame import VirtualDesktopFrame
     from linsnipper.core.interfaces import BaseCaptureBackend
     from linsnipper.core.models import CaptureMode, CaptureRequest
     from linsnipper.errors import CaptureError
@@ -107,6 +108,112 @@ if QT_AVAILABLE:
             
             with self.assertRaises(CaptureError):
                 self.service.perform_capture(request)
+
+    class TestCaptureFromFrame(unittest.TestCase):
+        def setUp(self):
+            self.app = QApplication.instance() or QApplication([])
+            self.backend = _FakeBackend()
+            self.service = CaptureService(self.backend)
+            image = QImage(100, 80, QImage.Format_RGB32)
+            image.fill(0)
+            self.frame = VirtualDesktopFrame.from_image(image)
+
+        def test_region_is_cropped_without_backend_grab(self):
+            request = CaptureRequest(mode=CaptureMode.RECTANGLE)
+            result = self.service.capture_from_frame(
+                request, self.frame, selection_rect=QRect(90, 70, 30, 30)
+            )
+
+            self.assertEqual(self.backend.calls, [])
+            # Recorte limitado às bordas do quadro
+            self.assertEqual((result.pixmap.width(), result.pixmap.height()), (10, 10))
+            self.assertEqual(result.backend_name, "fake:frozen")
+
+        def test_selection_outside_frame_raises(self):
+            request = CaptureRequest(mode=CaptureMode.RECTANGLE, region=QRect(200, 200, 5, 5))
+            with self.assertRaises(CaptureError):
+                self.service.capture_from_frame(request, self.frame)
+
+        def test_null_frame_raises(self):
+            request = CaptureRequest(mode=CaptureMode.FULLSCREEN)
+            with self.assertRaises(CaptureError):
+                self.service.capture_from_frame(request, VirtualDesktopFrame([]))
+
+    class TestCaptureAsync(unittest.TestCase):
+        def setUp(self):
+            self.app = QApplication.instance() or QApplication([])
+            self.backend = _FakeBackend()
+            self.service = CaptureService(self.backend)
+
+        def _wait(self, future, timeout_ms=2000):
+            loop = QEventLoop()
+            future.add_done_callback(lambda _f: loop.quit())
+            QTimer.singleShot(timeout_ms, loop.quit)
+            if not future.done():
+                loop.exec()
+            self.assertTrue(future.done(), "future não foi resolvida a tempo")
+
+        def test_returns_future_without_blocking(self):
+            request = CaptureRequest(mode=CaptureMode.FULLSCREEN, delay_seconds=0.05)
+            future = self.service.capture_async(request)
+
+            # Nada capturado ainda: o delay roda no event loop
+            self.assertFalse(future.done())
+            self.assertEqual(self.backend.calls, [])
+
+            self._wait(future)
+            result = future.result()
+            self.assertEqual(result.backend_name, "fake")
+            self.assertFalse(result.image.isNull())
+
+        def test_processing_runs_off_gui_thread_and_resolves_on_it(self):
+            threads = {}
+            original = self.service._process
+
+            def _spy(*args):
+                threads["process"] = QThread.currentThread()
+                return original(*args)
+
+            self.service._process = _spy
+            future = self.service.capture_async(CaptureRequest(mode=CaptureMode.FULLSCREEN))
+            future.add_done_callback(lambda _f: threads.setdefault("done", QThread.currentThread()))
+            self._wait(future)
+
+            gui = self.app.thread()
+            self.assertIsNot(threads["process"], gui)
+            self.assertIs(threads["done"], gui)
+
+        def test_cancel_before_delay_skips_capture(self):
+            request = CaptureRequest(mode=CaptureMode.FULLSCREEN, delay_seconds=0.02)
+            future = self.service.capture_async(request)
+            self.assertTrue(future.cancel())
+
+            loop = QEventLoop()
+            QTimer.singleShot(60, loop.quit)
+            loop.exec()
+
+            self.assertEqual(self.backend.calls, [])
+
+        def test_errors_are_delivered_as_capture_error(self):
+            request = CaptureRequest(mode=CaptureMode.RECTANGLE)  # sem região
+            future = self.service.capture_async(request)
+            self._wait(future)
+            self.assertIsInstance(future.exception(), CaptureError)
+
+        def test_frozen_frame_crop_runs_in_pool(self):
+            image = QImage(100, 80, QImage.Format_RGB32)
+            image.fill(0)
+            frame = VirtualDesktopFrame.from_image(image)
+
+            request = CaptureRequest(mode=CaptureMode.RECTANGLE, region=QRect(10, 10, 20, 15))
+            future = self.service.capture_async(request, frame=frame)
+            self._wait(future)
+
+            result = future.result()
+            self.assertEqual(self.backend.calls, [])
+            self.assertEqual((result.image.width(), result.image.height()), (20, 15))
+            self.assertEqual(result.backend_name, "fake:frozen")
+
 else:
 
     class TestCaptureServiceTimer(unittest.TestCase):
@@ -0,0 +1,136 @@
+import os
+import stat
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QUrl, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.errors import ExportError
+from linsnipper.ui.clipboard import LazyImageMimeData
+from linsnipper.ui.drawing_canvas import DrawingCanvas
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+def _canvas():
+    pixmap = QPixmap(40, 30)
+    pixmap.fill(Qt.white)
+    return DrawingCanvas(pixmap=pixmap)
+
+
+def test_nothing_rendered_until_requested(qapp):
+    calls = []
+    image = QImage(4, 4, QImage.Format_ARGB32)
+    image.fill(Qt.red)
+
+    def render():
+        calls.append(1)
+        return image
+
+    mime = LazyImageMimeData(render)
+    assert mime.hasFormat("image/png")
+    assert mime.hasImage()
+    assert not calls
+
+    first = mime.retrieveData("image/png", None)
+    second = mime.retrieveData("image/png", None)
+    assert bytes(first.data()).startswith(b"\x89PNG")
+    assert first is second
+    assert len(calls) == 1
+
+    mime.retrieveData("image/jpeg", None)
+    assert len(calls) == 1  # composição reaproveitada entre formatos
+
+
+def test_snapshot_ignores_later_strokes(qapp):
+    canvas = _canvas()
+    mime = LazyImageMimeData(canvas.result_renderer())
+
+    painter = QPainter(canvas.annotation_pixmap)
+    painter.fillRect(0, 0, 40, 30, QColor(0, 0, 255))
+    painter.end()
+
+    image = QImage.fromData(mime.retrieveData("image/png", None))
+    assert image.pixelColor(5, 5) == QColor(Qt.white)
+    assert canvas.get_result_pixmap().toImage().pixelColor(5, 5) == QColor(0, 0, 255)
+
+
+def test_uri_list_points_to_png(qapp, tmp_path):
+    canvas = _canvas()
+    mime = LazyImageMimeData(canvas.result_renderer(), directory=tmp_path)
+
+    urls = mime.urls()
+    assert len(urls) == 1
+    path = urls[0].toLocalFile()
+    assert path.startswith(str(tmp_path))
+    assert QImage(path).size() == canvas.base_pixmap.size()
+    assert mime.urls()[0] == QUrl.fromLocalFile(path)
+
+
+def test_webp_offered_only_with_plugin(qapp, monkeypatch):
+    from linsnipper.ui import clipboard
+
+    monkeypatch.setattr(clipboard, "webp_available", lambda: False)
+    mime = LazyImageMimeData(_canvas().result_renderer())
+
+    assert "image/webp" not in mime.formats()
+    assert mime.retrieveData("image/webp", None) is None
+
+
+def test_encoding_failure_returns_empty_value(qapp, tmp_path):
+    def render():
+        raise RuntimeError("composição falhou")
+
+    mime = LazyImageMimeData(render, directory=tmp_path)
+
+    assert mime.retrieveData("image/png", None) is None
+    assert mime.retrieveData("text/uri-list", None) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_new_content_removes_previous_temp_png(qapp, tmp_path):
+    first = LazyImageMimeData(_canvas().result_renderer(), directory=tmp_path)
+    old = first.urls()[0].toLocalFile()
+    assert os.path.exists(old)
+
+    second = LazyImageMimeData(_canvas().result_renderer(), directory=tmp_path)
+
+    assert not os.path.exists(old)
+    new = second.urls()[0].toLocalFile()
+    assert [str(p) for p in tmp_path.iterdir()] == [new]
+
+
+def test_temp_png_dir_is_private(qapp, tmp_path):
+    directory = tmp_path / "clip"
+    mime = LazyImageMimeData(_canvas().result_renderer(), directory=directory)
+
+    assert mime.urls()
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+
+@pytest.mark.parametrize("problem", ["readable", "foreign"])
+def test_unsafe_temp_png_dir_is_rejected(qapp, tmp_path, monkeypatch, problem):
+    from linsnipper.ui import clipboard
+
+    directory = tmp_path / "clip"
+    directory.mkdir(mode=0o700)
+    planted = directory / "Screenshot_x_1.png"
+    planted.write_bytes(b"")
+    if problem == "readable":
+        directory.chmod(0o755)
+    else:
+        monkeypatch.setattr(clipboard.os, "getuid", lambda: directory.stat().st_uid + 1)
+
+    with pytest.raises(ExportError):
+        clipboard.ensure_private_dir(directory)
+    mime = LazyImageMimeData(_canvas().result_renderer(), directory=directory)
+    assert mime.retrieveData("text/uri-list", None) is None
+    assert planted.exists()  # nada é apagado num diretório que não é nosso
@@ -0,0 +1,144 @@
+import os
+import stat
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEventLoop, QTimer, Qt
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.core.export_service import ExportService, write_atomic
+from linsnipper.errors import ExportError
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _image(w=320, h=200):
+    image = QImage(w, h, QImage.Format_RGB32)
+    image.fill(Qt.darkGreen)
+    return image
+
+
+def _wait_until(predicate, timeout_ms=5000):
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.timeout.connect(lambda: loop.quit() if predicate() else None)
+    timer.start(5)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    if not predicate():
+        loop.exec()
+    timer.stop()
+    return predicate()
+
+
+def test_concurrent_saves_report_progress_and_finish(qapp, tmp_path):
+    service = ExportService(max_workers=4)
+    progress, finished = {}, {}
+    service.progress.connect(lambda job, pct: progress.setdefault(job, []).append(pct))
+    service.finished.connect(lambda job, path: finished.__setitem__(job, path))
+
+    jobs = [service.save(_image(), tmp_path / f"shot{i}.{ext}") for i, ext in enumerate(["png", "jpg", "png"])]
+
+    assert _wait_until(lambda: len(finished) == 3)
+    for job in jobs:
+        assert progress[job][0] == 0 and progress[job][-1] == 100
+        assert progress[job] == sorted(progress[job])
+        assert not QImage(finished[job]).isNull()
+
+    assert service.pending == 0
+    # Nenhum arquivo temporário sobra na pasta
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["shot0.png", "shot1.jpg", "shot2.png"]
+
+
+def test_failed_save_emits_failed(qapp, tmp_path):
+    service = ExportService()
+    failures = []
+    service.failed.connect(lambda job, msg: failures.append(msg))
+
+    service.save(_image(), tmp_path / "shot.formato-inexistente")
+
+    assert _wait_until(lambda: failures)
+    assert not list(tmp_path.iterdir())
+
+
+def test_unexpected_encoder_error_still_fails_the_job(qapp, tmp_path):
+    class _BrokenEncoder:
+        def encode(self, image):
+            raise RuntimeError("codificador quebrado")
+
+    service = ExportService(png_encoder=_BrokenEncoder())
+    failures = []
+    service.failed.connect(lambda job, msg: failures.append(msg))
+
+    service.save(_image(), tmp_path / "shot.png")
+
+    assert _wait_until(lambda: failures)
+    assert "codificador quebrado" in failures[0]
+    assert service.pending == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_null_image_is_rejected(qapp, tmp_path):
+    with pytest.raises(ExportError):
+        ExportService().save(QImage(), tmp_path / "x.png")
+
+
+def test_write_atomic_keeps_previous_file_on_error(tmp_path):
+    target = tmp_path / "out.bin"
+    target.write_bytes(b"antigo")
+
+    class _Boom(Exception):
+        pass
+
+    def _explode(written, total):
+        raise _Boom
+
+    with pytest.raises(_Boom):
+        write_atomic(target, b"x" * 10, _explode)
+
+    assert target.read_bytes() == b"antigo"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.bin"]
+
+
+def test_write_atomic_respects_umask_and_existing_mode(tmp_path):
+    new, existing = tmp_path / "novo.bin", tmp_path / "privado.bin"
+    existing.write_bytes(b"antigo")
+    existing.chmod(0o600)
+
+    previous = os.umask(0o027)
+    try:
+        write_atomic(new, b"x")
+        write_atomic(existing, b"y")
+    finally:
+        os.umask(previous)
+
+    assert stat.S_IMODE(new.stat().st_mode) == 0o640
+    assert stat.S_IMODE(existing.stat().st_mode) == 0o600
+    assert existing.read_bytes() == b"y"
+
+
+def test_png_goes_through_parallel_encoder(qapp, tmp_path):
+    pytest.importorskip("numpy")
+    from linsnipper.core.png_encoder import ParallelPngEncoder
+
+    encoder = ParallelPngEncoder(workers=2)
+    calls = []
+    original = encoder.encode
+    encoder.encode = lambda image: calls.append(image) or original(image)
+
+    service = ExportService(png_encoder=encoder)
+    done = []
+    service.finished.connect(lambda job, path: done.append(path))
+    service.save(_image(), tmp_path / "shot.png")
+
+    assert _wait_until(lambda: done)
+    assert len(calls) == 1
+    assert QImage(done[0]) == _image().convertToFormat(QImage(done[0]).format())
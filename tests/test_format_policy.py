@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QImage, QPainter
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.core import format_policy
+from linsnipper.core.format_policy import choose_format
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _ui(w=800, h=600):
+    image = QImage(w, h, QImage.Format_RGB32)
+    image.fill(QColor("#eeeeee"))
+    painter = QPainter(image)
+    painter.fillRect(QRect(0, 0, w, 40), QColor("#3465a4"))
+    painter.setPen(Qt.black)
+    for line in range(25):
+        painter.drawText(20, 70 + line * 20, f"Linha {line} de texto da interface")
+    painter.end()
+    return image
+
+
+def _photo(w=400, h=300):
+    # Gradiente com ruído pseudoaleatório: muitas cores, entropia alta
+    data = bytearray()
+    for y in range(h):
+        for x in range(w):
+            n = (x * 7919 + y * 104729 + x * y) % 61 - 30
+            data += bytes(((x + y + n) % 256, (y * 255 // h + n) % 256, (x * 255 // w + n) % 256, 255))
+    return QImage(bytes(data), w, h, QImage.Format_RGB32).copy()
+
+
+@pytest.fixture(scope="module")
+def photo(qapp):
+    return _photo()
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_ui_and_photo_are_classified(qapp, photo, monkeypatch, use_numpy):
+    if use_numpy and format_policy.np is None:
+        pytest.skip("NumPy indisponível")
+    if not use_numpy:
+        monkeypatch.setattr(format_policy, "np", None)
+
+    assert format_policy.analyze(_ui()).is_ui
+    assert not format_policy.analyze(photo).is_ui
+
+
+def test_auto_picks_png_for_ui_and_lossy_for_photo(qapp, photo):
+    assert choose_format(_ui(), "auto").format == "png"
+
+    choice = choose_format(photo, "auto")
+    assert choice.format in ("webp", "jpeg")
+    assert choice.quality > 0
+
+
+def test_large_photo_falls_back_to_jpeg(qapp, photo, monkeypatch):
+    monkeypatch.setattr(format_policy, "ENCODE_BUDGET_S", 0.0)
+    choice = choose_format(photo, "auto")
+    assert (choice.format, choice.extension) == ("jpeg", "jpg")
+
+
+def test_explicit_policy_is_respected(qapp, photo):
+    assert choose_format(photo, "png").format == "png"
+    assert choose_format(_ui(), "jpeg").format == "jpeg"
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPoint, QRect, Qt
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.core.frame import ScreenTile, VirtualDesktopFrame
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _image(w, h, color):
+    img = QImage(w, h, QImage.Format_RGB32)
+    img.fill(color)
+    return img
+
+
+@pytest.fixture
+def staggered_frame(qapp):
+    # Tela da esquerda mais baixa e menor; tela HiDPI (dpr 2) à direita
+    left = ScreenTile("left", QRect(-100, 50, 100, 50), 1.0, _image(100, 50, Qt.red))
+    right = ScreenTile("right", QRect(0, 0, 200, 150), 2.0, _image(400, 300, Qt.blue))
+    return VirtualDesktopFrame([left, right])
+
+
+def test_geometry_and_hit_testing(staggered_frame):
+    frame = staggered_frame
+    assert frame.geometry == QRect(-100, 0, 300, 150)
+    assert frame.tile_at(QPoint(10, 60)).name == "left"
+    assert frame.tile_at(QPoint(150, 10)).name == "right"
+    # Buraco acima da tela da esquerda
+    assert frame.tile_at(QPoint(10, 10)) is None
+    assert [t.name for t in frame.tiles_in(QRect(120, 0, 10, 10))] == ["right"]
+
+
+def test_crop_across_tiles_in_logical_pixels(staggered_frame):
+    crop = staggered_frame.crop(QRect(90, 40, 20, 20))
+
+    assert (crop.width(), crop.height()) == (20, 20)
+    assert crop.pixelColor(5, 5) == QColor(Qt.black)  # buraco entre telas
+    assert crop.pixelColor(5, 15) == QColor(Qt.red)
+    assert crop.pixelColor(15, 5) == QColor(Qt.blue)
+
+
+def test_crop_single_tile_is_direct_copy(qapp):
+    img = _image(50, 50, Qt.green)
+    img.setPixelColor(10, 20, QColor(Qt.white))
+    frame = VirtualDesktopFrame.from_image(img)
+
+    crop = frame.crop(QRect(10, 20, 5, 5))
+    assert crop.pixelColor(0, 0) == QColor(Qt.white)
+    assert crop.pixelColor(1, 1) == QColor(Qt.green)
+
+
+def test_flatten_is_lazy_and_cached(staggered_frame):
+    frame = staggered_frame
+    assert frame._flattened is None
+
+    flat = frame.flatten()
+    assert (flat.width(), flat.height()) == (300, 150)
+    assert frame.flatten() is flat
+
+
+def test_empty_frame(qapp):
+    frame = VirtualDesktopFrame([])
+    assert frame.isNull()
+    assert frame.flatten().isNull()
+    assert frame.crop(QRect(0, 0, 10, 10)).isNull()
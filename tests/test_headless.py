@@ -0,0 +1,69 @@
+import argparse
+import os
+import subprocess
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QImage
+
+from linsnipper.cli import parse_args, parse_geometry
+
+
+def _run(tmp_path, *argv, script=None):
+    env = dict(
+        os.environ,
+        QT_QPA_PLATFORM="offscreen",
+        XDG_CONFIG_HOME=str(tmp_path / "config"),
+        XDG_CACHE_HOME=str(tmp_path / "cache"),
+    )
+    cmd = [sys.executable, "-c", script] if script else [sys.executable, "-m", "linsnipper", *argv]
+    return subprocess.run(cmd, env=env, capture_output=True, timeout=60)
+
+
+def test_parse_geometry():
+    assert parse_geometry("10,-20,300,200") == (10, -20, 300, 200)
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_geometry("10,20,0,5")
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_geometry("10,20")
+
+
+def test_capture_subcommand_keeps_legacy_flags():
+    args = parse_args(["--snip", "--mode", "freeform"])
+    assert args.command is None and args.snip and args.mode == "freeform"
+
+    args = parse_args(["capture", "--mode", "region", "--geometry", "0,0,8,6", "-o", "-"])
+    assert args.command == "capture" and args.geometry == (0, 0, 8, 6)
+
+
+def test_region_to_stdout(tmp_path):
+    proc = _run(tmp_path, "capture", "--mode", "region", "--geometry", "0,0,50,40", "-o", "-")
+    assert proc.returncode == 0, proc.stderr
+    image = QImage.fromData(proc.stdout, "PNG")
+    assert (image.width(), image.height()) == (50, 40)
+
+
+def test_headless_path_never_imports_widgets(tmp_path):
+    out = tmp_path / "shot.png"
+    script = (
+        "import os, sys\n"
+        "os.environ['XDG_SESSION_TYPE'] = 'x11'\n"
+        "from linsnipper.cli import parse_args\n"
+        "from linsnipper.headless import run_capture\n"
+        "assert 'PySide6.QtDBus' not in sys.modules\n"
+        f"assert run_capture(parse_args(['capture', '-o', {str(out)!r}])) == 0\n"
+        "assert 'PySide6.QtWidgets' not in sys.modules\n"
+        "assert 'PySide6.QtDBus' not in sys.modules\n"
+    )
+    proc = _run(tmp_path, script=script)
+    assert proc.returncode == 0, proc.stderr
+    assert out.read_bytes().startswith(b"\x89PNG")
+
+
+def test_region_without_geometry_fails(tmp_path):
+    proc = _run(tmp_path, "capture", "--mode", "region")
+    assert proc.returncode == 1
+    assert b"geometria" in proc.stderr
@@ -0,0 +1,165 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.core.single_instance import SingleInstance
+from linsnipper.errors import IpcError
+from linsnipper.ipc_client import IpcClient, send_command, send_message, socket_path
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture
+def server(qapp):
+    instance = SingleInstance(f"linsnipper_test_{os.getpid()}")
+    assert instance.start()
+    yield instance
+    instance.server.close()
+
+
+def _wait_for(signal, count=1, timeout_ms=2000):
+    received = []
+    loop = QEventLoop()
+
+    def _on_signal(*args):
+        received.append(args)
+        if len(received) >= count:
+            loop.quit()
+
+    signal.connect(_on_signal)
+    timer = QTimer(singleShot=True)
+    timer.timeout.connect(loop.quit)
+    timer.start(timeout_ms)
+    loop.exec()
+    timer.stop()
+    return received
+
+
+def _in_thread(func):
+    """Roda ``func`` (cliente bloqueante) numa thread enquanto o loop Qt gira."""
+    outcome = {}
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.timeout.connect(lambda: loop.quit() if "done" in outcome else None)
+    timer.start(5)
+
+    def _run():
+        try:
+            outcome["value"] = func()
+        except Exception as exc:  # noqa: BLE001 - repassado ao teste
+            outcome["error"] = exc
+        outcome["done"] = True
+
+    thread = threading.Thread(target=_run)
+    thread.start()
+    loop.exec()
+    timer.stop()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+def test_socket_path_matches_qlocalserver(server):
+    assert socket_path(server.server_name) == server.server.fullServerName()
+
+
+def test_stdlib_client_reaches_qt_server(server, qapp):
+    assert send_command(server.server_name, "snip", {"mode": "freeform", "delay": 3})
+    (request,), = _wait_for(server.request_received)
+    assert (request.cmd, request.args, request.wants_reply) == ("snip", {"mode": "freeform", "delay": 3}, False)
+
+
+def test_legacy_text_messages_still_work(server, qapp):
+    assert send_message(server.server_name, "SNIP:window:5")
+    (request,), = _wait_for(server.request_received)
+    assert (request.cmd, request.args) == ("snip", {"mode": "window", "delay": 5})
+
+
+def test_pipelined_requests_get_replies_by_id(server, qapp):
+    def _echo(request):
+        server.reply(request, {"cmd": request.cmd, **request.args})
+
+    server.request_received.connect(_echo)
+
+    def _client():
+        with IpcClient(server.server_name, timeout=5) as client:
+            ids = [client.send("status", n=n) for n in range(5)]
+            # Respostas consumidas fora da ordem de envio
+            return [client.receive(i) for i in reversed(ids)]
+
+    replies = _in_thread(_client)
+    assert [r["n"] for r in replies] == [4, 3, 2, 1, 0]
+
+
+def test_error_replies_raise(server, qapp):
+    server.request_received.connect(lambda request: server.reply(request, error="nope"))
+
+    def _client():
+        with IpcClient(server.server_name, timeout=5) as client:
+            client.call("status")
+
+    with pytest.raises(IpcError, match="nope"):
+        _in_thread(_client)
+
+
+def test_fd_reply_does_not_wait_for_a_stalled_client(server, qapp):
+    # Resposta bem maior que o buffer do socket: o cliente só lê depois
+    payload = "x" * (4 << 20)
+    reply_s = []
+
+    def _reply(request):
+        if request.cmd != "frame":
+            # Resposta sem fd atrás da que leva um: mesma fila, mesma ordem
+            server.reply(request, "depois")
+            return
+        with tempfile.TemporaryFile() as f:
+            f.write(b"quadro")
+            f.flush()
+            start = time.perf_counter()
+            server.reply(request, payload, fds=[f.fileno()])
+            reply_s.append(time.perf_counter() - start)
+
+    server.request_received.connect(_reply)
+
+    def _client():
+        with IpcClient(server.server_name, timeout=10) as client:
+            frame_id, status_id = client.send("frame"), client.send("status")
+            time.sleep(0.5)
+            result, fds = client._receive(frame_id)
+            try:
+                os.lseek(fds[0], 0, os.SEEK_SET)
+                return result, os.read(fds[0], 16), client.receive(status_id)
+            finally:
+                for fd in fds:
+                    os.close(fd)
+
+    result, content, status = _in_thread(_client)
+    assert result == payload and content == b"quadro" and status == "depois"
+    assert reply_s[0] < 0.25
+
+
+def test_no_server_means_no_instance(tmp_path):
+    assert not send_command(str(tmp_path / "ninguem"), "snip")
+    with pytest.raises(IpcError):
+        IpcClient(str(tmp_path / "ninguem"))
+
+
+def test_cli_fast_path_imports_no_qt():
+    code = "import sys, linsnipper.__main__; print(any(m.startswith('PySide6') for m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert out.stdout.strip() == "False", out.stderr
@@ -0,0 +1,52 @@
+import pytest
+
+from linsnipper.errors import IpcError
+from linsnipper.ipc_protocol import HEADER, MAGIC, FrameDecoder, encode_reply, encode_request, parse_legacy, parse_request
+
+
+def test_fragmented_and_coalesced_frames():
+    stream = encode_request("snip", {"mode": "freeform", "delay": 3}, id=1) + encode_request("status", id=2)
+    decoder = FrameDecoder()
+
+    frames = []
+    for byte in stream[:-1]:
+        frames += decoder.feed(bytes([byte]))
+    assert [f["id"] for f in frames] == [1]
+    frames += decoder.feed(stream[-1:])
+
+    assert [parse_request(f) for f in frames][1].cmd == "status"
+    assert frames[0]["args"] == {"mode": "freeform", "delay": 3}
+    assert decoder.finish() is None
+
+
+def test_legacy_text_is_read_until_disconnect():
+    decoder = FrameDecoder()
+    assert decoder.feed(b"SN") == []
+    assert decoder.feed(b"IP:window:5") == []
+    assert decoder.legacy
+
+    message = parse_legacy(decoder.finish())
+    assert (message.cmd, message.args, message.id) == ("snip", {"mode": "window", "delay": 5}, None)
+    assert parse_legacy("EDITOR").cmd == "editor"
+    assert parse_legacy("bobagem") is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        HEADER.pack(MAGIC, 99, 2) + b"{}",  # versão desconhecida
+        HEADER.pack(MAGIC, 1, 1 << 30),  # grande demais
+        HEADER.pack(MAGIC, 1, 5) + b"nope!",  # JSON inválido
+        encode_request("x") + b"LX\x01\x00\x00\x00\x00",  # assinatura corrompida
+    ],
+)
+def test_protocol_violations_raise(data):
+    with pytest.raises(IpcError):
+        FrameDecoder().feed(data)
+
+
+def test_reply_roundtrip():
+    decoder = FrameDecoder()
+    ok, err = decoder.feed(encode_reply(3, {"a": 1}) + encode_reply(4, error="falhou"))
+    assert ok == {"id": 3, "ok": True, "result": {"a": 1}}
+    assert err == {"id": 4, "ok": False, "error": "falhou"}
@@ -0,0 +1,101 @@
+import logging
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPoint, QRectF, Qt
+from PySide6.QtGui import QImage, QPainterPath
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.core import masking
+from linsnipper.core.capture_service import CaptureService
+from linsnipper.core.frame import VirtualDesktopFrame
+from linsnipper.core.masking import apply_mask, validate_masked_image
+from linsnipper.core.models import CaptureMode, CaptureRequest
+from linsnipper.infra.qt_capture_backend import QtCaptureBackend
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _triangle(offset=QPoint(0, 0)):
+    path = QPainterPath()
+    path.moveTo(offset.x() + 0, offset.y() + 0)
+    path.lineTo(offset.x() + 40, offset.y() + 0)
+    path.lineTo(offset.x() + 0, offset.y() + 40)
+    path.closeSubpath()
+    return path
+
+
+def _opaque(w, h):
+    image = QImage(w, h, QImage.Format_RGB32)
+    image.fill(Qt.red)
+    return image
+
+
+def test_mask_is_translated_to_image_origin(qapp):
+    origin = QPoint(100, 50)
+    masked = apply_mask(_opaque(40, 40), _triangle(origin), origin)
+
+    assert masked.pixelColor(2, 2).alpha() == 255
+    assert masked.pixelColor(38, 38).alpha() == 0
+    assert validate_masked_image(masked, _triangle(origin), origin)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_validation_detects_leaks(qapp, monkeypatch, use_numpy):
+    if use_numpy and masking.np is None:
+        pytest.skip("NumPy indisponível")
+    if not use_numpy:
+        monkeypatch.setattr(masking, "np", None)
+
+    path = _triangle()
+    masked = apply_mask(_opaque(40, 40), path)
+    assert validate_masked_image(masked, path)
+
+    # Um pixel opaco fora do traçado
+    masked.setPixelColor(39, 39, Qt.blue)
+    assert not validate_masked_image(masked, path)
+
+
+def test_freeform_capture_from_frame_is_transparent_outside(qapp):
+    frame = VirtualDesktopFrame.from_image(_opaque(200, 100))
+    path = QPainterPath()
+    path.addEllipse(QRectF(20, 10, 60, 60))
+
+    request = CaptureRequest(mode=CaptureMode.FREEFORM, mask_path=path)
+    service = CaptureService(QtCaptureBackend())
+    result = service.capture_from_frame(request, frame, path.boundingRect().toAlignedRect())
+
+    image = result.image
+    assert (image.width(), image.height()) == (60, 60)
+    assert image.hasAlphaChannel()
+    assert image.pixelColor(30, 30).alpha() == 255  # centro da elipse
+    assert image.pixelColor(0, 0).alpha() == 0  # canto fora do traçado
+
+
+def test_freeform_validation_only_runs_with_debug_log(qapp, monkeypatch, caplog):
+    calls = []
+    monkeypatch.setattr(
+        "linsnipper.core.capture_service.validate_masked_image", lambda *args: calls.append(args)
+    )
+    frame = VirtualDesktopFrame.from_image(_opaque(100, 100))
+    path = _triangle(QPoint(10, 10))
+    request = CaptureRequest(mode=CaptureMode.FREEFORM, mask_path=path)
+    service = CaptureService(QtCaptureBackend())
+    rect = path.boundingRect().toAlignedRect()
+
+    with caplog.at_level(logging.INFO, logger="linsnipper.core.capture_service"):
+        service.capture_from_frame(request, frame, rect)
+    assert calls == []
+
+    with caplog.at_level(logging.DEBUG, logger="linsnipper.core.capture_service"):
+        service.capture_from_frame(request, frame, rect)
+    assert len(calls) == 1
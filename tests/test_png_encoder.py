@@ -0,0 +1,159 @@
+import os
+import struct
+import zlib
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+np = pytest.importorskip("numpy")
+
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.core import png_encoder
+from linsnipper.core.export_service import encode_image
+from linsnipper.core.png_encoder import ParallelPngEncoder, adler32_combine
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture
+def small_bands(monkeypatch):
+    # Força muitas faixas mesmo em imagens pequenas
+    monkeypatch.setattr(png_encoder, "_BAND_BYTES", 4096)
+
+
+def _random_image(w, h, alpha):
+    image = QImage(w, h, QImage.Format_ARGB32 if alpha else QImage.Format_RGB32)
+    buf = np.frombuffer(image.bits(), dtype=np.uint8).reshape(h, image.bytesPerLine())
+    rng = np.random.default_rng(7)
+    # Poucos níveis: dá trabalho real para filtros e dicionário
+    buf[:] = rng.integers(0, 4, buf.shape, dtype=np.uint8) * 85
+    return image
+
+
+def _chunks(data):
+    pos = len(png_encoder.PNG_SIGNATURE)
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos : pos + 4])
+        kind = data[pos + 4 : pos + 8]
+        body = data[pos + 8 : pos + 8 + length]
+        (crc,) = struct.unpack(">I", data[pos + 8 + length : pos + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        yield kind, body
+        pos += 12 + length
+
+
+def test_adler32_combine_matches_zlib():
+    a, b = b"captura" * 5000, bytes(range(256)) * 300
+    assert adler32_combine(zlib.adler32(a), zlib.adler32(b), len(b)) == zlib.adler32(a + b)
+
+
+@pytest.mark.parametrize("filter_name", ["none", "sub", "up", "avg", "paeth", "adaptive"])
+@pytest.mark.parametrize("alpha", [False, True])
+def test_round_trip_is_lossless(qapp, small_bands, filter_name, alpha):
+    image = _random_image(97, 211, alpha)
+    data = ParallelPngEncoder(level=6, filter=filter_name, workers=3).encode(image)
+
+    decoded = QImage.fromData(data)
+    assert decoded == image.convertToFormat(decoded.format())
+
+
+def test_bands_form_one_zlib_stream(qapp, small_bands):
+    image = _random_image(64, 300, alpha=False)
+    data = ParallelPngEncoder(level=9, filter="none", workers=2).encode(image)
+
+    idat = [body for kind, body in _chunks(data) if kind == b"IDAT"]
+    assert len(idat) > 3  # uma por faixa + trailer adler32
+    raw = zlib.decompress(b"".join(idat))  # valida cabeçalho, deflate e adler32
+
+    rgb = image.convertToFormat(QImage.Format_RGB888)
+    expected = b"".join(
+        b"\0" + bytes(rgb.constScanLine(y))[: 64 * 3] for y in range(rgb.height())
+    )
+    assert raw == expected
+
+
+def test_invalid_options_are_rejected():
+    with pytest.raises(ValueError):
+        ParallelPngEncoder(level=11)
+    with pytest.raises(ValueError):
+        ParallelPngEncoder(filter="zigzag")
+
+
+def _ui_image(w=120, h=80, colors=5, alpha=False):
+    image = QImage(w, h, QImage.Format_ARGB32 if alpha else QImage.Format_RGB32)
+    buf = np.frombuffer(image.bits(), dtype=np.uint32).reshape(h, image.bytesPerLine() // 4)
+    palette = np.array([0xFF000000 | (i * 0x0F1E2D) for i in range(colors)], dtype=np.uint32)
+    rng = np.random.default_rng(3)
+    buf[:, :w] = palette[rng.integers(0, colors, (h, w))]
+    if alpha:
+        buf[: h // 2, : w // 2] = 0  # área transparente (ex.: fora da máscara livre)
+    return image
+
+
+def _encode_png(image, engine):
+    """PNG pelo caminho compartilhado, com paleta, no codificador pedido."""
+    if engine == "qt-no-numpy":
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(png_encoder, "np", None)
+            return encode_image(image, "png", palette=True)
+    encoder = ParallelPngEncoder(workers=2) if engine == "parallel" else None
+    return encode_image(image, "png", png_encoder=encoder, palette=True)
+
+
+ENGINES = ["parallel", "qt", "qt-no-numpy"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("colors", [2, 4, 16, 200])
+def test_few_colors_become_indexed_png(qapp, small_bands, colors, engine):
+    image = _ui_image(colors=colors)
+    data = _encode_png(image, engine)
+
+    kinds = [kind for kind, _ in _chunks(data)]
+    assert b"PLTE" in kinds and b"tRNS" not in kinds
+    (ihdr,) = [body for kind, body in _chunks(data) if kind == b"IHDR"]
+    assert ihdr[9] == 3  # tipo de cor: paleta
+    decoded = QImage.fromData(data).convertToFormat(QImage.Format_RGB32)
+    assert decoded == image
+
+
+@pytest.mark.parametrize("engine", ["parallel", "qt"])
+def test_transparent_pixels_use_trns(qapp, engine):
+    image = _ui_image(colors=6, alpha=True)
+    data = _encode_png(image, engine)
+
+    assert b"tRNS" in [kind for kind, _ in _chunks(data)]
+    decoded = QImage.fromData(data).convertToFormat(QImage.Format_ARGB32)
+    assert decoded == image.convertToFormat(QImage.Format_ARGB32)
+
+
+def test_transparency_without_numpy_stays_lossless(qapp):
+    image = _ui_image(colors=6, alpha=True)
+    data = _encode_png(image, "qt-no-numpy")
+
+    assert b"PLTE" not in [kind for kind, _ in _chunks(data)]
+    decoded = QImage.fromData(data).convertToFormat(QImage.Format_ARGB32)
+    assert decoded == image.convertToFormat(QImage.Format_ARGB32)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_many_colors_fall_back_to_truecolor(qapp, caplog, engine):
+    image = QImage(64, 64, QImage.Format_RGB32)
+    buf = np.frombuffer(image.bits(), dtype=np.uint32).reshape(64, -1)
+    buf[:] = np.arange(64 * 64, dtype=np.uint32).reshape(64, 64) | 0xFF000000
+
+    with caplog.at_level("INFO", logger="linsnipper.core.png_encoder"):
+        data = _encode_png(image, engine)
+
+    assert b"PLTE" not in [kind for kind, _ in _chunks(data)]
+    assert "truecolor" in caplog.text
+    assert QImage.fromData(data).convertToFormat(QImage.Format_RGB32) == image
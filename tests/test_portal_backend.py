@@ -0,0 +1,173 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import ClassInfo, QObject, QRect, QTimer, Qt, Signal, Slot
+from PySide6.QtDBus import QDBusConnection, QDBusMessage, QDBusObjectPath
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.errors import CaptureError
+from linsnipper.infra.portal_capture_backend import (
+    PORTAL_PATH,
+    PORTAL_SERVICE,
+    PortalCaptureBackend,
+)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture(scope="module")
+def bus_address():
+    """Barramento de sessão privado (dbus-daemon), isolado do desktop do usuário."""
+    daemon = shutil.which("dbus-daemon")
+    if daemon is None:
+        pytest.skip("dbus-daemon indisponível")
+
+    tmpdir = tempfile.mkdtemp(prefix="linsnipper-bus-")
+    socket_path = os.path.join(tmpdir, "bus")
+    address = f"unix:path={socket_path}"
+    proc = subprocess.Popen(
+        [daemon, "--session", f"--address={address}", "--nofork"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 5
+    while not os.path.exists(socket_path):
+        if time.monotonic() > deadline:
+            proc.kill()
+            pytest.skip("dbus-daemon não subiu")
+        time.sleep(0.01)
+    try:
+        yield address
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+@ClassInfo({"D-Bus Interface": "org.freedesktop.portal.Request"})
+class _MockRequest(QObject):
+    Response = Signal("uint", "QVariantMap")
+
+
+@ClassInfo({"D-Bus Interface": "org.freedesktop.portal.Screenshot"})
+class _MockPortal(QObject):
+    """Implementação mínima de org.freedesktop.portal.Screenshot."""
+
+    def __init__(self, connection, shots_dir: Path):
+        super().__init__()
+        self.connection = connection
+        self.shots_dir = shots_dir
+        self.calls = []
+        self.response_code = 0
+        self.payload = None  # PNG -> bytes gravados no lugar (arquivo vazio, truncado...)
+        self._requests = []
+
+    @Slot(str, "QVariantMap", QDBusMessage, result=QDBusObjectPath)
+    def Screenshot(self, parent_window, options, message):
+        self.calls.append(dict(options))
+        sender = message.service().lstrip(":").replace(".", "_")
+        path = f"{PORTAL_PATH}/request/{sender}/{options['handle_token']}"
+
+        request = _MockRequest()
+        self.connection.registerObject(path, request, QDBusConnection.ExportAllSignals)
+        self._requests.append(request)
+
+        shot = self.shots_dir / f"shot{len(self.calls)}.png"
+        image = QImage(64, 48, QImage.Format_RGB32)
+        image.fill(Qt.green)
+        for x in range(32, 64):  # metade direita vermelha
+            for y in range(48):
+                image.setPixelColor(x, y, QColor(Qt.red))
+        image.save(str(shot))
+        if self.payload is not None:
+            shot.write_bytes(self.payload(shot.read_bytes()))
+
+        results = {"uri": shot.as_uri()}
+
+        def _respond():
+            # O objeto fica registrado até o fim do teste: o QtDBus repassa o
+            # sinal de forma assíncrona e descartá-lo logo após o emit
+            # poderia perder a resposta.
+            request.Response.emit(self.response_code, results)
+
+        QTimer.singleShot(0, _respond)
+        return QDBusObjectPath(path)
+
+
+@pytest.fixture
+def portal(qapp, bus_address, tmp_path):
+    server = QDBusConnection.connectToBus(bus_address, f"mock-portal-{tmp_path.name}")
+    mock = _MockPortal(server, tmp_path)
+    assert server.registerObject(PORTAL_PATH, mock, QDBusConnection.ExportAllSlots)
+    assert server.registerService(PORTAL_SERVICE)
+
+    client = QDBusConnection.connectToBus(bus_address, f"client-{tmp_path.name}")
+    backend = PortalCaptureBackend(bus=client, timeout_ms=3000)
+    yield mock, backend
+
+    server.unregisterService(PORTAL_SERVICE)
+    server.unregisterObject(PORTAL_PATH)
+    QDBusConnection.disconnectFromBus(server.name())
+    QDBusConnection.disconnectFromBus(client.name())
+
+
+def test_portal_available_on_private_bus(portal):
+    _, backend = portal
+    assert PortalCaptureBackend.is_available(backend.bus)
+
+
+def test_capture_is_non_interactive_and_removes_file(portal):
+    mock, backend = portal
+
+    pix = backend.capture_fullscreen()
+
+    assert (pix.width(), pix.height()) == (64, 48)
+    assert mock.calls[0]["interactive"] is False
+    assert not list(mock.shots_dir.glob("shot*.png"))
+
+
+def test_region_is_scaled_from_logical_to_image_pixels(portal, monkeypatch):
+    mock, backend = portal
+    # Desktop lógico com metade do tamanho da imagem do portal (escala 2)
+    monkeypatch.setattr(PortalCaptureBackend, "_desktop_geometry", staticmethod(lambda: QRect(0, 0, 32, 24)))
+
+    right = backend.capture_region(QRect(16, 0, 16, 24)).toImage()
+    left = backend.capture_region(QRect(0, 12, 16, 12)).toImage()
+
+    assert (right.width(), right.height()) == (16, 24)
+    assert right.pixelColor(1, 1) == QColor(Qt.red)
+    assert right.pixelColor(14, 22) == QColor(Qt.red)
+    assert left.pixelColor(8, 6) == QColor(Qt.green)
+    assert all(set(call) == {"handle_token", "interactive", "modal"} for call in mock.calls)
+
+
+def test_cancelled_capture_raises(portal):
+    mock, backend = portal
+    mock.response_code = 1
+
+    with pytest.raises(CaptureError):
+        backend.capture_fullscreen()
+
+
+@pytest.mark.parametrize("payload", [lambda png: b"", lambda png: png[:40]], ids=["empty", "truncated"])
+def test_bad_portal_file_raises_capture_error(portal, payload):
+    mock, backend = portal
+    mock.payload = payload
+
+    with pytest.raises(CaptureError):
+        backend.capture_frame()
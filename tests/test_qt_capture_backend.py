@@ -0,0 +1,130 @@
+import logging
+import os
+import threading
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.errors import CaptureError
+from linsnipper.infra.grab_engine import ScreenGrabEngine
+from linsnipper.infra.qt_capture_backend import QtCaptureBackend
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+class _FakeScreen:
+    def __init__(self, name, geometry, color):
+        self._name = name
+        self._geometry = geometry
+        self._color = color
+        self.grabs = []
+
+    def name(self):
+        return self._name
+
+    def geometry(self):
+        return self._geometry
+
+    def grabWindow(self, window=0, x=0, y=0, w=-1, h=-1):
+        self.grabs.append((x, y, w, h))
+        if w < 0:
+            w = self._geometry.width()
+        if h < 0:
+            h = self._geometry.height()
+        pix = QPixmap(w, h)
+        pix.fill(self._color)
+        return pix
+
+
+@pytest.fixture
+def two_screens(monkeypatch):
+    # Tela secundária à esquerda (coordenadas negativas) e menor que a primária
+    left = _FakeScreen("left", QRect(-200, 50, 200, 100), Qt.red)
+    right = _FakeScreen("right", QRect(0, 0, 300, 200), Qt.blue)
+    monkeypatch.setattr(QtCaptureBackend, "_screens", lambda self: [left, right])
+    return left, right
+
+
+def test_region_grabs_only_intersecting_screen(qapp, two_screens):
+    left, right = two_screens
+    backend = QtCaptureBackend()
+
+    # Região inteiramente dentro da tela da direita (origem do desktop virtual em -200,0)
+    pix = backend.capture_region(QRect(210, 10, 50, 40))
+
+    assert pix.size().width() == 50 and pix.size().height() == 40
+    assert left.grabs == []
+    assert right.grabs == [(10, 10, 50, 40)]
+    assert pix.toImage().pixelColor(25, 20) == QColor(Qt.blue)
+
+
+def test_region_spanning_screens_matches_fullscreen_crop(qapp, two_screens):
+    left, right = two_screens
+    backend = QtCaptureBackend()
+    rect = QRect(150, 20, 100, 150)
+
+    pix = backend.capture_region(rect)
+    expected = backend.capture_fullscreen().copy(rect)
+
+    assert pix.toImage() == expected.toImage()
+    # Tela da esquerda: apenas a faixa x=150..199, y=50..149 em coordenadas locais
+    assert left.grabs[0] == (150, 0, 50, 100)
+    assert right.grabs[0] == (0, 20, 50, 150)
+
+
+def test_region_outside_desktop_raises(qapp, two_screens):
+    backend = QtCaptureBackend()
+    with pytest.raises(CaptureError):
+        backend.capture_region(QRect(1000, 1000, 10, 10))
+
+
+class _BarrierScreen(_FakeScreen):
+    """Só termina a captura quando todas as telas estão capturando ao mesmo tempo."""
+
+    def __init__(self, name, geometry, color, barrier):
+        super().__init__(name, geometry, color)
+        self._barrier = barrier
+
+    def grabWindow(self, window=0, x=0, y=0, w=-1, h=-1):
+        self._barrier.wait()  # em sequência, estoura o timeout (BrokenBarrierError)
+        return super().grabWindow(window, x, y, w, h)
+
+
+def test_engine_grabs_screens_in_parallel(qapp, caplog):
+    barrier = threading.Barrier(3, timeout=5)
+    screens = [
+        _BarrierScreen(f"s{i}", QRect(i * 50, 0, 50, 40), Qt.green, barrier) for i in range(3)
+    ]
+    engine = ScreenGrabEngine(parallel=True)
+
+    with caplog.at_level(logging.DEBUG, logger="linsnipper.infra.grab_engine"):
+        frame = engine.grab_frame(screens)
+
+    assert [t.name for t in frame.tiles] == ["s0", "s1", "s2"]
+    assert all(len(s.grabs) == 1 for s in screens)
+    assert "s2: grab" in caplog.text
+
+    flat = engine.compose(frame)
+    assert (flat.width(), flat.height()) == (150, 40)
+    engine.shutdown()
+
+
+def test_engine_sequential_fallback(qapp):
+    screens = [_FakeScreen(f"s{i}", QRect(0, i * 10, 20, 10), Qt.red) for i in range(2)]
+    engine = ScreenGrabEngine(parallel=False)
+
+    frame = engine.grab_frame(screens)
+
+    assert frame.geometry == QRect(0, 0, 20, 20)
+    engine.shutdown()
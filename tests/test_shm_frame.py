@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from linsnipper import shm_frame
+from linsnipper.shm_frame import RawFrame, sealed_memfd
+
+pytestmark = pytest.mark.skipif(not shm_frame.is_available(), reason="memfd com selos requer Linux")
+
+
+def test_memfd_is_sealed_against_writes():
+    fd = sealed_memfd(bytes(range(16)))
+    try:
+        with pytest.raises(PermissionError):
+            os.pwrite(fd, b"x", 0)
+        with pytest.raises(PermissionError):
+            os.ftruncate(fd, 4)
+        assert os.pread(fd, 16, 0) == bytes(range(16))
+    finally:
+        os.close(fd)
+
+
+def test_raw_frame_view_respects_stride():
+    np = pytest.importorskip("numpy")
+    # 3x2 pixels, linhas de 16 bytes (4 de preenchimento)
+    rows = np.arange(32, dtype=np.uint8).reshape(2, 16)
+    fd = sealed_memfd(rows.tobytes())
+    header = {"width": 3, "height": 2, "stride": 16, "format": "RGB32", "channels": "BGRA"}
+    with RawFrame.from_fd(fd, header) as frame:
+        pixels = frame.array()
+        assert pixels.shape == (2, 3, 4)
+        assert (pixels == rows[:, :12].reshape(2, 3, 4)).all()
+        del pixels
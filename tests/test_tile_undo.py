@@ -0,0 +1,128 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.core.tile_undo import TileUndoStack
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+def _layer(w=300, h=200):
+    image = QImage(w, h, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    return image
+
+
+def _paint(history, layer, rect, color):
+    history.begin_step()
+    history.touch(layer, rect)
+    painter = QPainter(layer)
+    painter.fillRect(rect, color)
+    painter.end()
+    return history.end_step(layer)
+
+
+def test_records_only_changed_tiles(qapp):
+    history = TileUndoStack()
+    layer = _layer()
+
+    # 10x10 dentro de um tile, mas "tocando" uma área maior
+    history.begin_step()
+    history.touch(layer, QRect(0, 0, 200, 100))
+    painter = QPainter(layer)
+    painter.fillRect(QRect(70, 70, 10, 10), Qt.red)
+    painter.end()
+
+    assert history.end_step(layer) == 1
+    assert history.resident_bytes == 64 * 64 * 4
+
+
+def test_undo_redo_swap_tiles(qapp):
+    history = TileUndoStack()
+    layer = _layer()
+    _paint(history, layer, QRect(10, 10, 100, 50), Qt.red)
+    _paint(history, layer, QRect(50, 20, 200, 150), Qt.blue)
+    second = layer.copy()
+
+    assert history.undo(layer)
+    assert layer.pixelColor(60, 30) == QColor(Qt.red)
+    assert layer.pixelColor(200, 150).alpha() == 0
+    assert history.undo(layer)
+    assert layer.pixelColor(60, 30).alpha() == 0
+    assert not history.undo(layer)
+
+    assert history.redo(layer) and history.redo(layer)
+    assert layer == second
+    assert not history.redo(layer)
+
+
+def test_edge_tiles_and_pixmap_layers(qapp):
+    history = TileUndoStack()
+    layer = QPixmap(130, 70)  # tiles de borda com 2 e 6 pixels
+    layer.fill(Qt.transparent)
+
+    assert _paint(history, layer, QRect(120, 60, 50, 50), Qt.green) == 4
+    assert history.undo(layer)
+    assert layer.toImage().pixelColor(129, 69).alpha() == 0
+    assert history.redo(layer)
+    assert layer.toImage().pixelColor(129, 69) == QColor(Qt.green)
+
+
+def test_budget_compresses_then_spills(qapp):
+    history = TileUndoStack(budget_bytes=64 * 64 * 4, hot_steps=2)
+    layer = _layer(640, 64)
+    snapshots = [layer.copy()]
+    for step in range(10):
+        _paint(history, layer, QRect(step * 64, 0, 64, 64), QColor(step * 20, 0, 255 - step * 20))
+        snapshots.append(layer.copy())
+
+    assert history.resident_bytes <= history.budget_bytes
+    assert history.spilled_bytes > 0
+    assert len(history) == 10
+
+    for expected in reversed(snapshots[:-1]):
+        assert history.undo(layer)
+        assert layer == expected
+    for expected in snapshots[1:]:
+        assert history.redo(layer)
+        assert layer == expected
+
+    history.clear()
+    assert history.spilled_bytes == 0 and not history.can_undo()
+
+
+def test_empty_step_keeps_history_in_lockstep(qapp):
+    history = TileUndoStack()
+    layer = _layer()
+
+    history.begin_step()
+    history.touch(layer, QRect(0, 0, 50, 50))
+    assert history.end_step(layer) == 0
+
+    assert history.can_undo()
+    assert history.undo(layer)
+
+
+def test_keyed_steps_only_apply_to_their_owner(qapp):
+    history = TileUndoStack()
+    layer = _layer()
+    owner, other = object(), object()
+    history.begin_step()
+    history.touch(layer, QRect(0, 0, 10, 10))
+    layer.fill(Qt.red)
+    history.end_step(layer, key=owner)
+
+    assert not history.undo(layer, key=other)
+    assert history.undo(layer, key=owner)
+    assert not history.redo(layer, key=other)
+    assert history.redo(layer, key=owner)
@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import QApplication
+
+from linsnipper import tracing
+from linsnipper.core.capture_service import CaptureService
+from linsnipper.core.interfaces import BaseCaptureBackend
+from linsnipper.core.models import CaptureMode, CaptureRequest
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture(autouse=True)
+def clean_histograms():
+    tracing.reset()
+    yield
+    tracing.reset()
+
+
+class _Backend(BaseCaptureBackend):
+    name = "fake"
+
+    def capture_fullscreen(self):
+        pix = QPixmap(8, 8)
+        pix.fill()
+        return pix
+
+    def capture_region(self, rect):
+        return self.capture_fullscreen().copy(rect)
+
+    def capture_window(self, window_id=None):
+        raise NotImplementedError
+
+
+def test_disabled_span_is_shared_noop():
+    if tracing.is_enabled():
+        pytest.skip("LINSNIPPER_TRACE ligado no ambiente")
+
+    with tracing.span("a", x=1) as first, tracing.span("b") as second:
+        first.set(y=2)
+    assert first is second
+    assert tracing.stats() == {}
+
+
+def test_spans_go_to_jsonl_and_histogram(tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+
+    with tracing.recording(trace_file):
+        for _ in range(3):
+            with tracing.span("stage", backend="qt") as span:
+                span.set(ok=True)
+        with pytest.raises(ValueError):
+            with tracing.span("stage"):
+                raise ValueError("x")
+
+    lines = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    assert [entry["name"] for entry in lines] == ["stage"] * 4
+    assert lines[0]["attrs"] == {"backend": "qt", "ok": True}
+    assert lines[-1]["attrs"] == {"error": "ValueError"}
+
+    summary = tracing.stats()["stage"]
+    assert summary["count"] == 4
+    assert summary["min_ms"] <= summary["p50_ms"] <= summary["max_ms"]
+
+
+def test_histogram_percentiles():
+    hist = tracing.Histogram()
+    for ms in [1.0] * 90 + [100.0] * 10:
+        hist.add(ms)
+
+    assert hist.percentile(50) == 1.0
+    assert 64 < hist.percentile(95) <= 100.0
+    assert hist.summary()["max_ms"] == 100.0
+
+
+def test_capture_pipeline_stages_are_traced(qapp):
+    service = CaptureService(_Backend())
+
+    with tracing.recording(None):
+        service.perform_capture(CaptureRequest(mode=CaptureMode.FULLSCREEN))
+
+    assert {"capture.execute", "capture.grab", "capture.process", "capture.to_pixmap"} <= set(
+        tracing.stats()
+    )
@@ -0,0 +1,95 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRect
+from PySide6.QtWidgets import QApplication
+
+from linsnipper.infra.backends import create_capture_backend
+from linsnipper.infra.qt_capture_backend import QtCaptureBackend
+from linsnipper.infra.xshm_capture_backend import XShmCaptureBackend
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture(scope="module")
+def x_display():
+    """Display X headless: sobe um Xvfb próprio ou usa o do xvfb-run (CI)."""
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        if os.environ.get("DISPLAY"):
+            yield os.environ["DISPLAY"]
+            return
+        pytest.skip("Xvfb indisponível")
+
+    read_fd, write_fd = os.pipe()
+    proc = subprocess.Popen(
+        [xvfb, "-displayfd", str(write_fd), "-screen", "0", "320x240x24", "-nolisten", "tcp"],
+        pass_fds=(write_fd,),
+        stderr=subprocess.DEVNULL,
+    )
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    try:
+        yield f":{number}"
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+
+
+@pytest.fixture
+def xshm_backend(qapp, x_display):
+    if not XShmCaptureBackend.is_available(x_display):
+        pytest.skip("MIT-SHM indisponível neste display")
+    backend = XShmCaptureBackend(x_display)
+    yield backend
+    backend.close()
+
+
+def test_fullscreen_matches_root_size(xshm_backend):
+    frame = xshm_backend.capture_frame()
+    root = xshm_backend._root_rect()
+
+    assert not frame.isNull()
+    flat = frame.flatten()
+    assert (flat.width(), flat.height()) == (root.width(), root.height())
+
+
+def test_segment_is_reused_across_captures(xshm_backend):
+    xshm_backend.capture_region(QRect(0, 0, 100, 80))
+    segment = xshm_backend._segment
+
+    pix = xshm_backend.capture_region(QRect(10, 10, 50, 40))
+
+    assert xshm_backend._segment is segment
+    assert (pix.width(), pix.height()) == (50, 40)
+
+
+def test_factory_falls_back_to_qt_without_xshm(qapp, monkeypatch):
+    monkeypatch.setattr(XShmCaptureBackend, "is_available", classmethod(lambda cls, d=None: False))
+
+    assert isinstance(create_capture_backend("xshm"), QtCaptureBackend)
+    assert isinstance(create_capture_backend("qt"), QtCaptureBackend)
+
+
+def test_physical_rect_uses_each_screens_origin_and_scale():
+    # Tela 1 (dpr 1) em 0,0 e tela 2 (dpr 2, 2560x1440 nativos) à direita, em x=1920
+    left = QRect(0, 0, 1920, 1080)
+    right = QRect(1920, 0, 1280, 720)
+
+    assert XShmCaptureBackend._physical(left, 1.0) == QRect(0, 0, 1920, 1080)
+    assert XShmCaptureBackend._physical(right, 2.0) == QRect(1920, 0, 2560, 1440)
+    # Região dentro da tela 2: só o deslocamento interno escala
+    region = QRect(2020, 50, 100, 40)
+    assert XShmCaptureBackend._physical(right, 2.0, region) == QRect(2120, 100, 200, 80)